@@ -0,0 +1,7 @@
+"""Supervision core of MNGserver (no GUI dependencies)."""
+
+from .output import LineSplitter, RotatingLogFile, OutputStream, OutputPump, default_pump
+from .signals import Signal, MonitorSignals
+from .supervisor import Supervisor, default_supervisor
+from .monitor import ScriptMonitor, shutdown_monitors
+from .fleet import Fleet
@@ -0,0 +1,436 @@
+"""Benchmarks of the supervisor itself, with synthetic workload scripts.
+
+Usage: python -m mngcore.bench [--children 10,100,1000] [--duration 20] [--output results.json]
+
+Each fleet size runs in a fresh interpreter. The fleet is a mix of generated
+scripts, supervised by ScriptMonitors on one Supervisor exactly as the daemon
+does, without Qt:
+
+    crasher   exits with code 1 after a random 1-3 s, and is restarted at once
+    flooder   prints lines of output at a fixed rate (or as fast as it can)
+    burner    keeps a share of one core busy
+    hung      ignores SIGTERM, so shutdown has to kill it
+
+Measured per fleet size:
+
+    crash_detection_ms   from a crasher's exit to the monitor seeing it
+    restart_ms           from that exit to the next instance running
+    supervisor CPU       of this process, total and per supervised child
+    supervisor RSS       growth over the empty supervisor, total and per child
+    log throughput       output lines and bytes taken in per second
+    startup / shutdown   to get every child running, and to stop them all
+
+Results are JSON (stdout or --output); a summary table goes to stderr. With
+--baseline the run is compared against an earlier result file and the exit
+status is 1 when a metric got worse by more than --tolerance percent.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import signal
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import psutil
+
+from .monitor import ScriptMonitor, shutdown_monitors
+from .store import default_script_config
+from .supervisor import Supervisor
+
+try:
+    import resource
+except ImportError:
+    # Windows
+    resource = None
+
+RESULTS_VERSION = 1
+DEFAULT_CHILDREN = (10, 100, 1000)
+DEFAULT_MIX = 'crasher=1,flooder=1,burner=1,hung=1'
+# How long every child may take to start, per child
+STARTUP_TIMEOUT_PER_CHILD = 0.5
+
+# Generated scripts; the crasher prints its exit time so latencies are
+# measured from the moment the process really ends
+WORKLOADS = {
+    'crasher': '''import os, random, time
+time.sleep(random.uniform({crash_min}, {crash_max}))
+print("exit", os.getpid(), repr(time.time()))
+os._exit(1)
+''',
+    'flooder': '''import sys, time
+rate = {flood_rate}
+batch = max(1, rate // 100) if rate else 100
+chunk = ("x" * {line_bytes} + "\\n") * batch
+write = sys.stdout.write
+start = time.monotonic()
+sent = 0
+while True:
+    write(chunk)
+    sent += batch
+    if rate:
+        delay = start + sent / rate - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+''',
+    'burner': '''import time
+busy = {burn_duty} * 0.1
+while True:
+    end = time.monotonic() + busy
+    while time.monotonic() < end:
+        pass
+    time.sleep(0.1 - busy)
+''',
+    'hung': '''import signal, time
+signal.signal(signal.SIGTERM, signal.SIG_IGN)
+while True:
+    time.sleep(3600)
+''',
+}
+
+# (metric path, higher is better) checked against a baseline
+COMPARED_METRICS = (
+    ('startup_seconds', False),
+    ('crash_detection_ms.p95', False),
+    ('restart_ms.p95', False),
+    ('cpu_percent_per_child', False),
+    ('rss_kb_per_child', False),
+    ('log_lines_per_second', True),
+    ('shutdown_seconds', False),
+)
+
+
+class Recorder:
+    """Timestamps collected from the monitors, on the supervisor loop."""
+
+    def __init__(self, expected):
+        self.expected = expected
+        self.started_names = set()
+        self.all_started = asyncio.Event()
+        self.exit_times = {}      # pid -> time the crasher printed before exiting
+        self.detected = {}        # pid -> time the monitor saw the exit
+        self.restarted = {}       # pid of the crashed instance -> time its successor ran
+        self.errors = 0
+        self.counting = False
+        self.lines = 0
+        self.bytes = 0
+
+    def started(self, name):
+        self.started_names.add(name)
+        if len(self.started_names) >= self.expected:
+            self.all_started.set()
+
+
+class BenchMonitor(ScriptMonitor):
+    """ScriptMonitor that reports what the benchmark measures."""
+
+    def __init__(self, script_info, supervisor, recorder, workload):
+        super().__init__(script_info, supervisor)
+        self.recorder = recorder
+        self.workload = workload
+        self.crashed_pid = None
+        self.signals.status_signal.connect(self.on_status)
+
+    def on_status(self, script_name, status):
+        if status == 'error':
+            self.recorder.errors += 1
+
+    def on_exit(self, process):
+        if process is self.process and not self.stopping:
+            self.recorder.detected[process.pid] = time.time()
+            self.crashed_pid = process.pid
+        super().on_exit(process)
+
+    def started(self, message, start_time=None):
+        super().started(message, start_time)
+        if self.crashed_pid is not None:
+            self.recorder.restarted[self.crashed_pid] = time.time()
+            self.crashed_pid = None
+        self.recorder.started(self.script_name)
+
+    def on_output(self, stream, lines):
+        recorder = self.recorder
+        if recorder.counting:
+            recorder.lines += len(lines)
+            recorder.bytes += sum(map(len, lines))
+        if self.workload == 'crasher':
+            for line in lines:
+                if line.startswith('exit '):
+                    _, pid, exit_time = line.split()
+                    recorder.exit_times[int(pid)] = float(exit_time)
+        super().on_output(stream, lines)
+
+
+def parse_mix(text):
+    """'crasher=1,hung=3' -> {'crasher': 1, 'hung': 3}"""
+    mix = {}
+    for part in filter(None, (part.strip() for part in text.split(','))):
+        name, _, weight = part.partition('=')
+        if name not in WORKLOADS:
+            raise ValueError(f"unknown workload '{name}' (one of {', '.join(WORKLOADS)})")
+        mix[name] = int(weight or 1)
+        if mix[name] < 0:
+            raise ValueError(f"negative weight for '{name}'")
+    if not any(mix.values()):
+        raise ValueError("the mix has no workload")
+    return mix
+
+
+def assign_workloads(count, mix):
+    """Workload of each of count children, interleaved by weight."""
+    cycle = [name for name, weight in mix.items() for _ in range(weight)]
+    return [cycle[i % len(cycle)] for i in range(count)]
+
+
+def write_workloads(directory, options):
+    paths = {}
+    for name, source in WORKLOADS.items():
+        path = os.path.join(directory, f"bench_{name}.py")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(source.format(**options))
+        paths[name] = path
+    return paths
+
+
+def latency_summary(values):
+    """count, mean and percentiles (nearest rank) of latencies in seconds, in ms."""
+    if not values:
+        return {'count': 0}
+    values = sorted(values)
+
+    def percentile(p):
+        return round(values[min(len(values) - 1, int(p / 100 * len(values)))] * 1000, 3)
+
+    return {
+        'count': len(values),
+        'mean': round(sum(values) / len(values) * 1000, 3),
+        'p50': percentile(50),
+        'p95': percentile(95),
+        'p99': percentile(99),
+        'max': round(values[-1] * 1000, 3),
+    }
+
+
+def raise_open_files(needed):
+    """Pipes and pidfds take about three descriptors per child."""
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+async def measure(supervisor, count, options, directory):
+    # Interrupted runs still stop their children, which have their own sessions
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            supervisor.loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+    paths = write_workloads(directory, options)
+    workloads = assign_workloads(count, options['mix'])
+    recorder = Recorder(count)
+    me = psutil.Process()
+    rss_before = me.memory_info().rss
+
+    monitors = []
+    for index, workload in enumerate(workloads):
+        script_info = default_script_config(paths[workload], f"{workload}-{index}")
+        script_info.update({
+            'log_dir': os.path.join(directory, 'logs'),
+            'check_interval': options['check_interval'],
+            # Crashers restart at once, forever
+            'max_restarts': -1,
+            'backoff_initial': 0,
+            'crash_loop_count': 10 ** 9,
+        })
+        monitors.append(BenchMonitor(script_info, supervisor, recorder, workload))
+
+    began = time.monotonic()
+    for monitor in monitors:
+        monitor.start()
+    waiters = [asyncio.ensure_future(recorder.all_started.wait()), asyncio.ensure_future(stop.wait())]
+    await asyncio.wait(waiters, timeout=30 + count * STARTUP_TIMEOUT_PER_CHILD,
+                       return_when=asyncio.FIRST_COMPLETED)
+    for waiter in waiters:
+        waiter.cancel()
+    startup = time.monotonic() - began
+
+    # Steady state: crashers cycle, flooders flood, burners burn
+    cpu_before = sum(me.cpu_times()[:2])
+    steady_began = time.monotonic()
+    recorder.counting = True
+    try:
+        await asyncio.wait_for(stop.wait(), options['duration'])
+    except asyncio.TimeoutError:
+        pass
+    recorder.counting = False
+    elapsed = time.monotonic() - steady_began
+    cpu = sum(me.cpu_times()[:2]) - cpu_before
+    rss = me.memory_info().rss - rss_before
+    internals = supervisor.stats()
+
+    began = time.monotonic()
+    await shutdown_monitors(monitors)
+    shutdown = time.monotonic() - began
+
+    exit_times = recorder.exit_times
+    detection = [recorder.detected[pid] - exit_times[pid] for pid in recorder.detected if pid in exit_times]
+    restart = [recorder.restarted[pid] - exit_times[pid] for pid in recorder.restarted if pid in exit_times]
+    return {
+        'children': count,
+        'interrupted': stop.is_set(),
+        'workloads': {name: workloads.count(name) for name in options['mix']},
+        'started': len(recorder.started_names),
+        'errors': recorder.errors,
+        'startup_seconds': round(startup, 3),
+        'steady_seconds': round(elapsed, 3),
+        'crash_detection_ms': latency_summary(detection),
+        'restart_ms': latency_summary(restart),
+        'supervisor_cpu_percent': round(cpu / elapsed * 100, 2),
+        'cpu_percent_per_child': round(cpu / elapsed * 100 / count, 4),
+        'rss_mb': round(rss / 1024 / 1024, 2),
+        'rss_kb_per_child': round(rss / 1024 / count, 1),
+        'log_lines_per_second': round(recorder.lines / elapsed),
+        'log_bytes_per_second': round(recorder.bytes / elapsed),
+        'sampler_tick_ms': round(internals['sampler_tick'] * 1000, 3),
+        'shutdown_seconds': round(shutdown, 3),
+    }
+
+
+def run_fleet(count, options):
+    """One benchmark run with count children; returns its results."""
+    raise_open_files(count * 4 + 256)
+    supervisor = Supervisor()
+    with tempfile.TemporaryDirectory(prefix='mngbench-') as directory:
+        try:
+            return supervisor.run(measure(supervisor, count, options, directory))
+        finally:
+            supervisor.metrics.close()
+
+
+def lookup(result, path):
+    for key in path.split('.'):
+        if not isinstance(result, dict) or key not in result:
+            return None
+        result = result[key]
+    return result
+
+
+def compare(runs, baseline, tolerance):
+    """Regressions of runs against baseline runs of the same size, as messages."""
+    previous = {run['children']: run for run in baseline.get('runs', [])}
+    regressions = []
+    for run in runs:
+        old_run = previous.get(run['children'])
+        if old_run is None:
+            continue
+        for path, higher_is_better in COMPARED_METRICS:
+            new, old = lookup(run, path), lookup(old_run, path)
+            if not new or not old:
+                continue
+            change = (new - old) / old * 100
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f"{run['children']} children: {path} {old} -> {new} ({change:+.0f}%)")
+    return regressions
+
+
+def print_table(runs, file):
+    columns = (
+        ('children', 'children'), ('started', 'started'), ('startup s', 'startup_seconds'),
+        ('detect p95 ms', 'crash_detection_ms.p95'), ('restart p95 ms', 'restart_ms.p95'),
+        ('cpu %', 'supervisor_cpu_percent'), ('rss KB/child', 'rss_kb_per_child'),
+        ('lines/s', 'log_lines_per_second'), ('shutdown s', 'shutdown_seconds'),
+    )
+    print('  '.join(f"{title:>14}" for title, _ in columns), file=file)
+    for run in runs:
+        print('  '.join(f"{lookup(run, path) if lookup(run, path) is not None else '-':>14}"
+                        for _, path in columns), file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m mngcore.bench', description='Benchmark the MNGserver supervisor')
+    parser.add_argument('--children', default=','.join(map(str, DEFAULT_CHILDREN)),
+                        help='comma-separated fleet sizes (default %(default)s)')
+    parser.add_argument('--duration', type=float, default=20, help='seconds of steady state measured per size')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='workload weights (default %(default)s)')
+    parser.add_argument('--check-interval', type=float, default=1, help='stats sampling interval of every script')
+    parser.add_argument('--flood-rate', type=int, default=200, help='lines per second per flooder (0: unlimited)')
+    parser.add_argument('--line-bytes', type=int, default=80, help='length of a flooder line')
+    parser.add_argument('--burn-duty', type=float, default=0.05, help='share of a core each burner uses')
+    parser.add_argument('--output', default='-', help='JSON results file (default stdout)')
+    parser.add_argument('--baseline', help='earlier results file to compare with')
+    parser.add_argument('--tolerance', type=float, default=25, help='allowed change against the baseline, percent')
+    args = parser.parse_args(argv)
+
+    try:
+        sizes = [int(size) for size in args.children.split(',') if size.strip()]
+        if not sizes or min(sizes) < 1:
+            raise ValueError("fleet sizes must be positive")
+        options = {
+            'mix': parse_mix(args.mix),
+            'duration': args.duration,
+            'check_interval': args.check_interval,
+            'crash_min': 1.0,
+            'crash_max': 3.0,
+            'flood_rate': max(0, args.flood_rate),
+            'line_bytes': max(1, args.line_bytes),
+            'burn_duty': min(max(args.burn_duty, 0.0), 0.9),
+        }
+        baseline = None
+        if args.baseline:
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    runs = []
+    for count in sizes:
+        print(f"Benchmarking {count} children...", file=sys.stderr, flush=True)
+        # A fresh interpreter per size, so memory from a previous run does not skew RSS
+        with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('spawn')) as pool:
+            future = pool.submit(run_fleet, count, options)
+            try:
+                runs.append(future.result())
+            except KeyboardInterrupt:
+                # The worker got the signal too and is stopping its children
+                runs.append(future.result())
+        if runs[-1]['interrupted']:
+            break
+    results = {
+        'version': RESULTS_VERSION,
+        'time': round(time.time(), 3),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'options': options,
+        'runs': runs,
+    }
+
+    text = json.dumps(results, indent=2)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    print_table(runs, sys.stderr)
+
+    if baseline is not None:
+        regressions = compare(runs, baseline, args.tolerance)
+        for message in regressions:
+            print(f"⚠️ Regression: {message}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 130 if runs[-1]['interrupted'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""Coalescing bus between the monitors and a front end.
+
+Monitors emit from the supervisor thread; the bus only records the events.
+The front end drains it once per frame and gets a single diff: the new log
+entries per script plus the latest status and stats of every script that
+changed since the previous frame. Log backlog per frame is bounded.
+"""
+
+import threading
+from datetime import datetime
+
+MAX_PENDING_LINES = 5000
+
+
+class UpdateDiff:
+    __slots__ = ('logs', 'statuses', 'stats', 'dropped')
+
+    def __init__(self, logs, statuses, stats, dropped):
+        self.logs = logs
+        self.statuses = statuses
+        self.stats = stats
+        self.dropped = dropped
+
+    def __bool__(self):
+        return bool(self.logs or self.statuses or self.stats)
+
+
+class UpdateBus:
+    def __init__(self, max_pending_lines=MAX_PENDING_LINES):
+        self.max_pending_lines = max_pending_lines
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        # name -> list of (timestamp, stream or None, lines)
+        self._logs = {}
+        self._line_counts = {}
+        self._dropped = {}
+        self._statuses = {}
+        self._stats = {}
+
+    def attach(self, signals):
+        signals.log_signal.connect(self.log)
+        signals.output_signal.connect(self.output)
+        signals.status_signal.connect(self.status)
+        signals.stats_signal.connect(self.stats)
+
+    def log(self, script_name, message):
+        self._add(script_name, None, [message])
+
+    def output(self, script_name, stream, lines):
+        self._add(script_name, stream, lines)
+
+    def _add(self, script_name, stream, lines):
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock:
+            entries = self._logs.setdefault(script_name, [])
+            entries.append((timestamp, stream, lines))
+            count = self._line_counts.get(script_name, 0) + len(lines)
+            # A flooding script must not grow the backlog between frames
+            while count > self.max_pending_lines and len(entries) > 1:
+                dropped = entries.pop(0)
+                count -= len(dropped[2])
+                self._dropped[script_name] = self._dropped.get(script_name, 0) + len(dropped[2])
+            self._line_counts[script_name] = count
+
+    def status(self, script_name, status):
+        with self._lock:
+            self._statuses[script_name] = status
+
+    def stats(self, script_name, stats):
+        with self._lock:
+            self._stats[script_name] = stats
+
+    def drain(self):
+        with self._lock:
+            diff = UpdateDiff(self._logs, self._statuses, self._stats, self._dropped)
+            self._reset()
+        return diff
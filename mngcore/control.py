@@ -0,0 +1,365 @@
+"""Local control API: JSON over a Unix domain socket, plus a CLI client.
+
+Each request is one JSON object per line and gets one JSON line back:
+
+    {"op": "restart", "select": ["web-*", "tag:prod"]}
+    {"ok": true, "results": [{"name": "web-1", "ok": true}, ...]}
+
+Operations: status, start, stop, restart, add and remove. "select" takes
+name globs and "tag:<glob>" selectors ("*" by default for status); "names"
+takes exact names instead. add takes "paths", optional "name", "tags" and
+"start". stop/remove take an optional "timeout". All selected scripts are
+handled concurrently, so stopping or restarting hundreds of them costs about
+as long as one.
+
+Front ends attached to a supervisor process also use: hello (pid, config
+path and the shared-memory stats channel, see mngcore.shm), scripts (the
+script settings), configure ("name" and "settings"; a running script
+restarts with them) and subscribe. After subscribe the connection carries
+one event per line: log and output lines, and added/removed scripts.
+
+CLI: python -m mngcore.control restart 'web-*' tag:prod
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+from collections import deque
+
+from .monitor import shutdown_monitors
+from .store import script_config
+
+DEFAULT_CONTROL_SOCKET = os.path.join(os.path.expanduser('~'), '.mngserver', 'control.sock')
+MAX_REQUEST = 1024 * 1024
+# Events buffered per subscriber before older ones are dropped
+MAX_PENDING_EVENTS = 10000
+
+
+class _Subscriber:
+    __slots__ = ('events', 'wakeup', 'dropped', 'writer')
+
+    def __init__(self, writer):
+        self.events = deque()
+        self.wakeup = asyncio.Event()
+        self.dropped = 0
+        self.writer = writer
+
+
+class ControlServer:
+    def __init__(self, fleet, channel=None):
+        self.fleet = fleet
+        # StatsChannel the monitors publish to, for attached front ends
+        self.channel = channel
+        self.server = None
+        self.path = None
+        self.subscribers = set()
+        fleet.monitor_created.connect(self.on_monitor_created)
+        fleet.script_added.connect(
+            lambda name: self.publish({'event': 'added', 'script': script_config(self.fleet.store.scripts[name])}))
+        fleet.script_removed.connect(self.on_script_removed)
+
+    def on_monitor_created(self, monitor):
+        signals = monitor.signals
+        signals.log_signal.connect(
+            lambda name, message: self.publish({'event': 'log', 'name': name, 'message': message}))
+        signals.output_signal.connect(
+            lambda name, stream, lines: self.publish({'event': 'output', 'name': name, 'stream': stream, 'lines': lines}))
+        if self.channel is not None:
+            signals.stats_signal.connect(self.channel.publish_stats)
+            signals.status_signal.connect(self.channel.publish_status)
+
+    def on_script_removed(self, name):
+        self.publish({'event': 'removed', 'name': name})
+        if self.channel is not None:
+            self.in_loop(self.channel.release, name)
+
+    def in_loop(self, callback, *args):
+        if self.fleet.supervisor.in_loop():
+            callback(*args)
+        else:
+            self.fleet.supervisor.call_soon(callback, *args)
+
+    def publish(self, event):
+        if self.subscribers:
+            self.in_loop(self._queue_event, event)
+
+    def _queue_event(self, event):
+        for subscriber in self.subscribers:
+            if len(subscriber.events) < MAX_PENDING_EVENTS:
+                subscriber.events.append(event)
+            else:
+                subscriber.dropped += 1
+            subscriber.wakeup.set()
+
+    async def start(self, path=DEFAULT_CONTROL_SOCKET):
+        if not hasattr(socket, 'AF_UNIX'):
+            raise OSError("Unix domain sockets are not available on this platform")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        if os.path.exists(path):
+            if socket_alive(path):
+                raise OSError(f"another MNGserver is listening on {path}")
+            os.remove(path)
+        # Owner only from the moment it exists: anyone who can connect may
+        # start and stop scripts
+        umask = os.umask(0o177)
+        try:
+            self.server = await asyncio.start_unix_server(self.handle, path, limit=MAX_REQUEST)
+        finally:
+            os.umask(umask)
+        self.path = path
+        return self.server
+
+    async def close(self):
+        for subscriber in list(self.subscribers):
+            subscriber.writer.close()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if isinstance(request, dict) and request.get('op') == 'subscribe':
+                        await self.stream_events(reader, writer)
+                        break
+                    response = await self.dispatch(request)
+                except (ValueError, KeyError, TypeError) as e:
+                    response = {'ok': False, 'error': str(e)}
+                except Exception as e:
+                    # A failing operation must not drop the connection without an answer
+                    response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+                writer.write(json.dumps(response).encode('utf-8') + b'\n')
+                await writer.drain()
+        except (OSError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def stream_events(self, reader, writer):
+        subscriber = _Subscriber(writer)
+        self.subscribers.add(subscriber)
+        # The client sends nothing more; EOF means it went away
+        gone = asyncio.ensure_future(reader.read())
+        try:
+            writer.write(b'{"ok": true}\n')
+            while not gone.done():
+                wakeup = asyncio.ensure_future(subscriber.wakeup.wait())
+                await asyncio.wait({wakeup, gone}, return_when=asyncio.FIRST_COMPLETED)
+                wakeup.cancel()
+                subscriber.wakeup.clear()
+                lines = []
+                if subscriber.dropped:
+                    lines.append(json.dumps({'event': 'dropped', 'count': subscriber.dropped}))
+                    subscriber.dropped = 0
+                while subscriber.events:
+                    lines.append(json.dumps(subscriber.events.popleft()))
+                if lines:
+                    writer.write(('\n'.join(lines) + '\n').encode('utf-8'))
+                    await writer.drain()
+        finally:
+            gone.cancel()
+            self.subscribers.discard(subscriber)
+
+    async def dispatch(self, request):
+        if not isinstance(request, dict):
+            raise ValueError("request must be a JSON object")
+        handler = getattr(self, f"op_{request.get('op')}", None)
+        if handler is None:
+            raise ValueError(f"unknown op '{request.get('op')}'")
+        return {'ok': True, 'results': await handler(request)}
+
+    async def selected(self, request, default=None):
+        if request.get('names') is not None:
+            names = request['names']
+            return await self.fleet.call(lambda: [name for name in names if name in self.fleet.store.scripts])
+        selectors = request.get('select') or default
+        if not selectors:
+            raise ValueError("select is required, e.g. [\"*\"]")
+        if isinstance(selectors, str):
+            selectors = [selectors]
+        return await self.fleet.call(self.fleet.select, selectors)
+
+    async def op_hello(self, request):
+        return {
+            'pid': os.getpid(),
+            'config': self.fleet.store.path,
+            'settings': self.fleet.store.settings,
+            'channel': self.channel.path if self.channel is not None else None,
+        }
+
+    async def op_scripts(self, request):
+        names = await self.selected(request, ['*'])
+        return await self.fleet.call(lambda: [script_config(self.fleet.store.scripts[name]) for name in names])
+
+    async def op_configure(self, request):
+        name = request['name']
+        await self.fleet.call(self.fleet.configure, name, request.get('settings') or {})
+        return [{'name': name, 'ok': True}]
+
+    async def op_status(self, request):
+        names = await self.selected(request, ['*'])
+        return await self.fleet.call(lambda: [self.fleet.status(name) for name in names])
+
+    async def op_start(self, request):
+        names = await self.selected(request)
+
+        def start_all():
+            results = []
+            for name in names:
+                if self.fleet.monitor(name):
+                    results.append({'name': name, 'ok': True, 'detail': 'already running'})
+                else:
+                    self.fleet.start(name)
+                    results.append({'name': name, 'ok': True})
+            return results
+        return await self.fleet.call(start_all)
+
+    async def op_stop(self, request):
+        timeout = stop_timeout(request)
+        names = await self.selected(request)
+        await self._stop(names, timeout)
+        return [{'name': name, 'ok': True} for name in names]
+
+    async def _stop(self, names, timeout):
+        monitors = await self.fleet.call(lambda: [self.fleet.monitor(name) for name in names])
+        await shutdown_monitors([monitor for monitor in monitors if monitor], timeout)
+        await self.fleet.call(lambda: [self.fleet.stopped(name) for name in names])
+
+    async def op_restart(self, request):
+        names = await self.selected(request)
+        monitors = await self.fleet.call(lambda: {name: self.fleet.monitor(name) for name in names})
+        stopped = [name for name, monitor in monitors.items() if monitor is None]
+        if stopped:
+            await self.fleet.call(lambda: [self.fleet.start(name) for name in stopped])
+        running = [monitor for monitor in monitors.values() if monitor is not None]
+        outcomes = await asyncio.gather(*(monitor.restart() for monitor in running), return_exceptions=True)
+        errors = {monitor.script_name: outcome for monitor, outcome in zip(running, outcomes)
+                  if isinstance(outcome, Exception)}
+        return [{'name': name, 'ok': name not in errors, **({'error': str(errors[name])} if name in errors else {})}
+                for name in names]
+
+    async def op_add(self, request):
+        paths = request.get('paths') or []
+        if isinstance(paths, str):
+            paths = [paths]
+
+        def add_all():
+            results = []
+            for path in paths:
+                try:
+                    script_info = self.fleet.add(path, request.get('name') if len(paths) == 1 else None,
+                                                 request.get('tags'))
+                except ValueError as e:
+                    results.append({'path': path, 'ok': False, 'error': str(e)})
+                    continue
+                if request.get('start'):
+                    self.fleet.start(script_info['name'])
+                results.append({'name': script_info['name'], 'ok': True, 'script': script_config(script_info)})
+            return results
+        return await self.fleet.call(add_all)
+
+    async def op_remove(self, request):
+        timeout = stop_timeout(request)
+        names = await self.selected(request)
+        await self._stop(names, timeout)
+        await self.fleet.call(lambda: [self.fleet.remove(name) for name in names])
+        return [{'name': name, 'ok': True} for name in names]
+
+
+def stop_timeout(request, default=3):
+    timeout = request.get('timeout', default)
+    if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or not timeout >= 0:
+        raise ValueError("timeout must be a number of seconds >= 0")
+    return timeout
+
+
+def socket_alive(path):
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def request(message, path=DEFAULT_CONTROL_SOCKET, timeout=120):
+    """Sends one request and returns the decoded response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(path)
+        client.sendall(json.dumps(message).encode('utf-8') + b'\n')
+        data = b''
+        while not data.endswith(b'\n'):
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    return json.loads(data)
+
+
+def print_status(results):
+    print(f"{'NAME':<30} {'STATUS':<8} {'PID':>7} {'REPL':>4} {'CPU%':>6} {'MEM MB':>8} {'UPTIME':>9} {'RESTARTS':>8}  TAGS")
+    for row in results:
+        hours, rest = divmod(int(row['uptime']), 3600)
+        uptime = f"{hours:02d}:{rest // 60:02d}:{rest % 60:02d}"
+        print(f"{row['name']:<30} {row['status']:<8} {row['pid'] or '-':>7} {row['replicas']:>4} {row['cpu']:>6.1f} "
+              f"{row['memory']:>8.1f} {uptime:>9} {row['restarts']:>8}  {','.join(row['tags'])}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m mngcore.control', description='Control a running MNGserver')
+    parser.add_argument('op', choices=('status', 'start', 'stop', 'restart', 'add', 'remove'))
+    parser.add_argument('targets', nargs='*',
+                        help='name globs or tag:<glob> selectors; script paths for add')
+    parser.add_argument('--socket', default=DEFAULT_CONTROL_SOCKET, help='control socket path')
+    parser.add_argument('--tag', action='append', help='tag for added scripts (repeatable)')
+    parser.add_argument('--start', action='store_true', help='start added scripts')
+    parser.add_argument('--timeout', type=float, default=3, help='seconds before stop escalates to SIGKILL')
+    parser.add_argument('--json', action='store_true', help='print the raw JSON response')
+    args = parser.parse_args(argv)
+
+    message = {'op': args.op, 'timeout': args.timeout}
+    if args.op == 'add':
+        message.update(paths=args.targets, tags=args.tag, start=args.start)
+    else:
+        message['select'] = args.targets
+    try:
+        response = request(message, args.socket)
+    except OSError as e:
+        print(f"❌ Cannot reach MNGserver at {args.socket}: {e}", file=sys.stderr)
+        return 2
+
+    if args.json:
+        print(json.dumps(response, indent=2))
+    elif not response.get('ok'):
+        print(f"❌ {response.get('error')}", file=sys.stderr)
+    elif args.op == 'status':
+        print_status(response['results'])
+    else:
+        for row in response['results']:
+            mark = '✅' if row.get('ok') else '❌'
+            print(f"{mark} {row.get('name') or row.get('path')} {row.get('error') or row.get('detail') or ''}".rstrip())
+    if not response.get('ok') or not all(row.get('ok', True) for row in response.get('results', [])):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
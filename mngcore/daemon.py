@@ -0,0 +1,147 @@
+"""Headless supervision: runs ScriptMonitors without importing Qt.
+
+Usage: python MNGserver.py --daemon config.json
+
+The config is the same JSON file the GUI persists (see mngcore.store): a
+"scripts" list whose entries take the per-script settings keys, with only
+"path" required. Scripts run unless they say "enabled": false, and restart
+counters are written back to the file.
+
+While it runs, scripts can be added, started, stopped and restarted through
+the control socket (see mngcore.control). The GUI can attach to it as well
+(MNGserver.py --attach): stats reach it through shared memory (mngcore.shm),
+so the daemon is the supervisor process and the GUI only a viewer.
+
+With "keep_children": true in the settings, stopping the daemon leaves the
+scripts running and the next daemon adopts them (see mngcore.state). Stop
+them first ("python -m mngcore.control stop '*'") to end everything.
+"""
+
+import asyncio
+import os
+import signal
+import sys
+from datetime import datetime
+
+from .control import ControlServer, DEFAULT_CONTROL_SOCKET
+from .fleet import Fleet
+from .logindex import log_index_from_settings
+from .monitor import shutdown_monitors
+from .notify import close_default_dispatcher
+from .shm import StatsChannel
+from .state import ChildState, default_run_dir
+from .store import ConfigStore, loop_owner
+from .exporter import MetricsExporter
+from .supervisor import Supervisor
+from .timeseries import MetricsStore
+
+
+def log(script_name, message):
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{timestamp}] [{script_name}] {message}", flush=True)
+
+
+async def serve(fleet, exporter=None, metrics_listen=None, control_socket=None, channel_path=None):
+    loop = asyncio.get_running_loop()
+    # The fleet changes the scripts on this loop; saves snapshot them here
+    fleet.store.owner = loop_owner(loop)
+    stop_requested = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_requested.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    if exporter is not None:
+        try:
+            await exporter.start(metrics_listen)
+            log("SYSTEM", f"Metrics on http://{metrics_listen}/metrics")
+        except (OSError, ValueError) as e:
+            log("SYSTEM", f"❌ Cannot serve metrics on {metrics_listen}: {e}")
+
+    control = None
+    channel = None
+    if control_socket:
+        try:
+            channel = StatsChannel(channel_path)
+        except OSError as e:
+            log("SYSTEM", f"⚠️ No shared-memory stats channel: {e}")
+        control = ControlServer(fleet, channel)
+        try:
+            await control.start(control_socket)
+            log("SYSTEM", f"Control socket at {control_socket}")
+        except OSError as e:
+            log("SYSTEM", f"❌ Cannot open control socket {control_socket}: {e}")
+            control = None
+
+    enabled = [name for name, script_info in fleet.store.scripts.items() if script_info.get('enabled', True)]
+    for name in enabled:
+        fleet.start(name)
+    log("SYSTEM", f"Supervising {len(enabled)} script(s)")
+    state = fleet.supervisor.state
+    if state is not None:
+        loop.call_later(1, report_left_running, state)
+
+    await stop_requested.wait()
+    log("SYSTEM", "Shutting down")
+    if control is not None:
+        await control.close()
+    monitors = [monitor for monitor in map(fleet.monitor, fleet.store.scripts) if monitor]
+    if state is not None:
+        for monitor in monitors:
+            monitor.detach()
+        state.save()
+        running = sum(1 for monitor in monitors if monitor.is_running())
+        log("SYSTEM", f"Left {running} script(s) running for the next supervisor")
+    else:
+        await shutdown_monitors(monitors)
+    if channel is not None:
+        channel.close()
+    if exporter is not None:
+        await exporter.close()
+
+
+def report_left_running(state):
+    # Claimed by their monitors by now; the rest are no longer configured
+    for name, entry in state.orphans.items():
+        log("SYSTEM", f"⚠️ {name} (pid {entry['pid']}) is still running but no longer configured")
+
+
+def main(config_path):
+    store = ConfigStore(config_path)
+    try:
+        if not os.path.exists(config_path):
+            raise FileNotFoundError(f"No such file: '{config_path}'")
+        store.load(enabled_default=True)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Cannot load config {config_path}: {e}", file=sys.stderr)
+        return 1
+
+    settings = store.settings
+    metrics = MetricsStore(settings.get('metrics_dir'), settings.get('metrics_retention'))
+    log_index = log_index_from_settings(settings)
+    supervisor = Supervisor(metrics, log_index)
+    fleet = Fleet(store, supervisor)
+    fleet.monitor_created.connect(lambda monitor: monitor.signals.log_signal.connect(log))
+    if settings.get('keep_children') and os.name != 'nt':
+        state = ChildState(settings.get('run_dir') or default_run_dir(config_path), supervisor)
+        try:
+            state.load()
+            supervisor.state = state
+        except OSError as e:
+            log("SYSTEM", f"⚠️ Scripts stop with the supervisor, no run directory: {e}")
+
+    try:
+        metrics_listen = settings.get('metrics_listen')
+        exporter = MetricsExporter(supervisor) if metrics_listen else None
+        control_socket = settings.get('control_socket', DEFAULT_CONTROL_SOCKET)
+        supervisor.run(serve(fleet, exporter, metrics_listen, control_socket, settings.get('stats_channel')))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.flush()
+        metrics.close()
+        if log_index is not None:
+            log_index.close()
+        close_default_dispatcher()
+    return 0
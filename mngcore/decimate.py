@@ -0,0 +1,46 @@
+"""Downsampling of time series for display.
+
+LTTB (Largest-Triangle-Three-Buckets, Steinarsson 2013) keeps the points
+that shape the line: the first and last point, and from each bucket in
+between the one spanning the largest triangle with its neighbours. Spikes
+survive where plain averaging or every-nth sampling would flatten them.
+"""
+
+
+def lttb(points, threshold, x=0, y=1):
+    """At most threshold of points (sequences sorted by x), chosen by LTTB on (x, y)."""
+    count = len(points)
+    if threshold >= count:
+        return list(points)
+    if threshold < 3:
+        return [points[0], points[-1]][:max(threshold, 0)]
+
+    xs = [point[x] for point in points]
+    ys = [point[y] for point in points]
+    selected = [points[0]]
+    bucket_size = (count - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+
+        # Average of the next bucket: the third corner of the triangle
+        next_start = end
+        next_end = min(int((i + 2) * bucket_size) + 1, count)
+        if next_start >= next_end:
+            next_start, next_end = count - 1, count
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        ax, ay = xs[a], ys[a]
+        dx, dy = ax - avg_x, avg_y - ay
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs(dx * (ys[j] - ay) - (ax - xs[j]) * dy)
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(points[best])
+        a = best
+    selected.append(points[-1])
+    return selected
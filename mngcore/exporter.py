@@ -0,0 +1,162 @@
+"""Prometheus /metrics endpoint.
+
+Serves per-script and supervisor metrics in the Prometheus text format from
+the supervisor loop. The page is rendered at most once per min_interval and
+kept as bytes, so any number of scrapers in between only get the cached
+response; rendering reads monitor state on the loop and never blocks it.
+
+Enable it with "metrics_listen": "127.0.0.1:9108" in the config settings.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+from .notify import running_dispatcher
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+MB = 1024 * 1024
+MAX_REQUEST = 8192
+
+# name, type, help, (stats key, scale) or None for values computed below
+SCRIPT_METRICS = (
+    ('mng_script_up', 'gauge', 'Whether the script process is running', None),
+    ('mng_script_ready', 'gauge', 'Whether all readiness probes pass', None),
+    ('mng_script_cpu_percent', 'gauge', 'CPU usage of the process tree in percent of one core', ('cpu', 1)),
+    ('mng_script_memory_bytes', 'gauge', 'RSS of the process tree', ('memory', MB)),
+    ('mng_script_processes', 'gauge', 'Processes in the tree', ('processes', 1)),
+    ('mng_script_threads', 'gauge', 'Threads in the tree', ('threads', 1)),
+    ('mng_script_open_fds', 'gauge', 'Open files or handles in the tree', ('fds', 1)),
+    ('mng_script_read_bytes', 'gauge', 'Bytes read by the live processes', ('read_bytes', 1)),
+    ('mng_script_write_bytes', 'gauge', 'Bytes written by the live processes', ('write_bytes', 1)),
+    ('mng_script_uptime_seconds', 'gauge', 'Seconds since the current instance started', None),
+    ('mng_script_restarts_total', 'counter', 'Automatic restarts', None),
+    ('mng_script_last_exit_code', 'gauge', 'Exit code of the last crash (-N: killed by signal N)', None),
+)
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricsExporter:
+    def __init__(self, supervisor, min_interval=1.0):
+        self.supervisor = supervisor
+        self.min_interval = min_interval
+        self.server = None
+        self.scrapes = 0
+        self.render_duration = 0.0
+        self._cache = None
+        self._cache_time = 0.0
+
+    async def start(self, address):
+        host, _, port = str(address).rpartition(':')
+        self.server = await asyncio.start_server(self.handle, host.strip('[]') or None, int(port))
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    def snapshot(self):
+        """Rendered page, re-rendered only when older than min_interval."""
+        now = time.monotonic()
+        if self._cache is None or now - self._cache_time >= self.min_interval:
+            self._cache = self.render().encode('utf-8')
+            self._cache_time = now
+            self.render_duration = time.monotonic() - now
+        return self._cache
+
+    async def handle(self, reader, writer):
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), 5)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, OSError):
+            writer.close()
+            return
+        parts = request[:MAX_REQUEST].split(b' ', 2)
+        if len(parts) < 2 or parts[0] not in (b'GET', b'HEAD'):
+            status, body = '405 Method Not Allowed', b'Method not allowed\n'
+        elif parts[1].split(b'?')[0] == b'/metrics':
+            self.scrapes += 1
+            status, body = '200 OK', self.snapshot()
+        else:
+            status, body = '404 Not Found', b'See /metrics\n'
+        header = (f"HTTP/1.0 {status}\r\nContent-Type: {CONTENT_TYPE}\r\n"
+                  f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode('ascii')
+        try:
+            writer.write(header if parts[0] == b'HEAD' else header + body)
+            await writer.drain()
+        except OSError:
+            pass
+        finally:
+            writer.close()
+
+    def render(self):
+        lines = []
+        monitors = list(self.supervisor.monitors.items())
+
+        script_rows = {name: [] for name, _, _, _ in SCRIPT_METRICS}
+        probe_up = []
+        probe_failures = []
+        for script_name, monitor in monitors:
+            label = f'script="{escape_label(script_name)}"'
+            running = bool(monitor.is_running())
+            stats = monitor.last_stats if running else {}
+            uptime = (datetime.now() - monitor.start_time).total_seconds() if running and monitor.start_time else 0
+            values = {
+                'mng_script_up': int(running),
+                'mng_script_ready': int(running and monitor.ready),
+                'mng_script_uptime_seconds': round(uptime, 1),
+                'mng_script_restarts_total': monitor.restart_count,
+                'mng_script_last_exit_code': monitor.last_exit_code,
+            }
+            for name, _, _, source in SCRIPT_METRICS:
+                if source is None:
+                    value = values.get(name)
+                elif source[1] == 1:
+                    value = stats.get(source[0], 0)
+                else:
+                    value = round(stats.get(source[0], 0) * source[1])
+                if value is not None:
+                    script_rows[name].append(f"{name}{{{label}}} {value}")
+            for probe in monitor.probes:
+                probe_label = f'{label},probe="{escape_label(probe)}",kind="{probe.kind}"'
+                probe_up.append(f"mng_probe_up{{{probe_label}}} {int(running and probe.failures == 0)}")
+                probe_failures.append(f"mng_probe_consecutive_failures{{{probe_label}}} {probe.failures}")
+
+        for name, metric_type, help_text, _ in SCRIPT_METRICS:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(script_rows[name])
+        lines += ["# HELP mng_probe_up Whether the probe's last check passed",
+                  "# TYPE mng_probe_up gauge"] + probe_up
+        lines += ["# HELP mng_probe_consecutive_failures Failed checks in a row",
+                  "# TYPE mng_probe_consecutive_failures gauge"] + probe_failures
+
+        supervisor_stats = self.supervisor.stats()
+        internals = [
+            ('mng_supervisor_children', 'gauge', 'Child processes being watched', supervisor_stats['children']),
+            ('mng_supervisor_polled_children', 'gauge', 'Children watched by polling instead of pidfd',
+             supervisor_stats['polled']),
+            ('mng_sampler_targets', 'gauge', 'Scripts sampled for resource usage', supervisor_stats['sampled']),
+            ('mng_sampler_tick_seconds', 'gauge', 'Duration of the last sampling pass',
+             round(supervisor_stats['sampler_tick'], 6)),
+            ('mng_probe_watches', 'gauge', 'Scripts with active probes', supervisor_stats['probed']),
+            ('mng_exporter_scrapes_total', 'counter', 'Requests for /metrics', self.scrapes),
+            ('mng_exporter_render_seconds', 'gauge', 'Time spent rendering the last page',
+             round(self.render_duration, 6)),
+        ]
+        dispatcher = running_dispatcher()
+        if dispatcher is not None:
+            internals += [
+                ('mng_notifications_sent_total', 'counter', 'Telegram messages delivered', dispatcher.sent),
+                ('mng_notifications_dropped_total', 'counter', 'Notifications dropped on a full queue',
+                 dispatcher.dropped),
+                ('mng_notifications_failed_total', 'counter', 'Telegram messages given up on', dispatcher.failed),
+            ]
+        for name, metric_type, help_text, value in internals:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}", f"{name} {value}"]
+        lines.append('')
+        return '\n'.join(lines)
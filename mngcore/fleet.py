@@ -0,0 +1,130 @@
+"""The set of configured scripts and their running monitors.
+
+Shared by the daemon, the GUI and the control API. Methods that change the
+store run in the thread that owns it: the supervisor loop for the daemon,
+the Qt thread for the GUI. Code on the loop goes through call(), which
+forwards to that thread when an owner is set.
+"""
+
+import asyncio
+import os
+from datetime import datetime
+from fnmatch import fnmatchcase
+
+from .monitor import ScriptMonitor
+from .pool import ReplicaPool, uses_pool
+from .signals import Signal
+from .store import RUNTIME_KEYS, default_script_config
+
+
+class Fleet:
+    def __init__(self, store, supervisor, notifier=None, owner=None):
+        self.store = store
+        self.supervisor = supervisor
+        self.notifier = notifier
+        # owner(fn) runs fn in the owning thread and returns a concurrent future
+        self.owner = owner
+        self.monitor_created = Signal()  # (monitor)
+        self.script_added = Signal()     # (name)
+        self.script_removed = Signal()   # (name)
+
+    async def call(self, fn, *args):
+        if self.owner is None:
+            return fn(*args)
+        return await asyncio.wrap_future(self.owner(lambda: fn(*args)))
+
+    def select(self, selectors):
+        """Names matching any selector: a name glob or "tag:<glob>"."""
+        names = []
+        for name, script_info in list(self.store.scripts.items()):
+            for selector in selectors:
+                if selector.startswith('tag:'):
+                    matched = any(fnmatchcase(tag, selector[4:]) for tag in script_info.get('tags') or ())
+                else:
+                    matched = fnmatchcase(name, selector)
+                if matched:
+                    names.append(name)
+                    break
+        return names
+
+    def monitor(self, name):
+        """The live monitor (or replica pool) of a script, or None when it is not monitored."""
+        monitor = self.store.scripts[name].get('monitor')
+        return monitor if monitor is not None and monitor.is_alive() else None
+
+    def add(self, path, name=None, tags=None):
+        path = os.path.abspath(path)
+        if not os.path.isfile(path):
+            raise ValueError(f"script '{path}' does not exist")
+        name = name or os.path.basename(path)
+        if name in self.store.scripts:
+            raise ValueError(f"script '{name}' already exists")
+        script_info = default_script_config(path, name)
+        if tags:
+            script_info['tags'] = list(tags)
+        self.store.add(script_info)
+        self.script_added.emit(name)
+        return script_info
+
+    def remove(self, name):
+        """Forgets a script; the caller stops its monitor first."""
+        self.store.remove(name)
+        # Replicas are kept as "<name>#<index>"
+        for key in [name] + [key for key in self.supervisor.monitors if key.startswith(f"{name}#")]:
+            self.supervisor.metrics.remove(key)
+            self.supervisor.monitors.pop(key, None)
+        self.script_removed.emit(name)
+
+    def start(self, name, after=None):
+        script_info = self.store.scripts[name]
+        monitor_class = ReplicaPool if uses_pool(script_info) else ScriptMonitor
+        monitor = monitor_class(script_info, self.supervisor, self.notifier)
+        monitor.signals.restart_signal.connect(self.store.mark_dirty)
+        self.monitor_created.emit(monitor)
+        script_info['monitor'] = monitor
+        if not script_info.get('enabled'):
+            script_info['enabled'] = True
+            self.store.mark_dirty()
+        monitor.start(after)
+        return monitor
+
+    def configure(self, name, settings=None):
+        """Applies changed settings; a running script restarts with them."""
+        script_info = self.store.scripts[name]
+        if settings:
+            script_info.update({key: value for key, value in settings.items()
+                                if key not in RUNTIME_KEYS and key != 'name'})
+        self.store.mark_dirty()
+        monitor = self.monitor(name)
+        if monitor is not None:
+            # The new instance starts once the old one is down; nothing waits here
+            script_info['monitor'] = None
+            self.start(name, after=monitor.stop())
+
+    def stopped(self, name):
+        script_info = self.store.scripts.get(name)
+        if script_info is not None and script_info.get('enabled'):
+            script_info['enabled'] = False
+            self.store.mark_dirty()
+
+    def status(self, name):
+        script_info = self.store.scripts[name]
+        monitor = self.monitor(name)
+        running = bool(monitor and monitor.is_running())
+        state = 'running' if running else 'waiting' if monitor else 'stopped'
+        stats = monitor.last_stats if running else {}
+        uptime = (datetime.now() - monitor.start_time).total_seconds() if running and monitor.start_time else 0
+        return {
+            'name': name,
+            'path': script_info['path'],
+            'tags': script_info.get('tags') or [],
+            'enabled': script_info.get('enabled', False),
+            'status': state,
+            'pid': monitor.process.pid if running else None,
+            'replicas': stats.get('replicas', int(running)),
+            'ready': running and monitor.ready,
+            'uptime': round(uptime, 1),
+            'restarts': script_info.get('restarts', 0),
+            'cpu': stats.get('cpu', 0.0),
+            'memory': stats.get('memory', 0.0),
+        }
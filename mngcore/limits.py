@@ -0,0 +1,215 @@
+"""Per-script resource limits.
+
+Limits come from these script settings (0 or '' turns one off):
+
+    memory_limit_mb    RSS of the whole process tree; going over it restarts
+                       the script gracefully
+    cpu_limit_percent  CPU quota in percent of one core; enforced through
+                       cgroup v2 cpu.max when a cgroup is set, otherwise only
+                       reported when exceeded
+    max_open_files     RLIMIT_NOFILE of the script, inherited by its workers
+    nice               scheduling priority (-20..19; below 0 needs root)
+    ionice_class       'idle', 'best-effort' or 'realtime', with ionice_level
+    cgroup             cgroup v2 directory the supervisor may write to; each
+                       script then runs in its own child group there, with
+                       cpu.max set from cpu_limit_percent and memory.high at
+                       MEMORY_HIGH_FACTOR times memory_limit_mb
+    cpu_affinity       list of CPU numbers the script may run on (Linux);
+                       replica pools use it to spread instances over cores
+
+The monitor enforces memory_limit_mb by restarting the script. memory.high
+sits above it on purpose: at memory.high the kernel throttles and reclaims
+the group, which would hold the RSS at the limit so the restart never
+triggers. It only reins in a tree that grows faster than the monitor checks.
+
+prepare() runs before a child is spawned and apply() right after, from the
+supervisor: nothing runs in the child between fork and exec, which would not
+be safe with the supervisor's threads.
+"""
+
+import os
+
+import psutil
+
+try:
+    import resource
+except ImportError:
+    # Windows
+    resource = None
+
+DEFAULT_LIMITS = {
+    'memory_limit_mb': 0,
+    'cpu_limit_percent': 0,
+    'max_open_files': 0,
+    'nice': 0,
+    'ionice_class': '',
+    'ionice_level': 4,
+    'cgroup': '',
+    'cpu_affinity': [],
+}
+
+CPU_PERIOD = 100000  # cgroup cpu.max period in microseconds
+# memory.high relative to memory_limit_mb, see above
+MEMORY_HIGH_FACTOR = 1.25
+
+IONICE_CLASSES = {
+    'realtime': 'IOPRIO_CLASS_RT',
+    'best-effort': 'IOPRIO_CLASS_BE',
+    'idle': 'IOPRIO_CLASS_IDLE',
+}
+
+
+def thread_ids(pid):
+    """Threads of a process (just pid where /proc is not available)."""
+    try:
+        return [int(tid) for tid in os.listdir(f'/proc/{pid}/task')]
+    except (OSError, ValueError):
+        return [pid]
+
+
+class ResourceLimits:
+    """The limits of one script, applied to each new child by the supervisor.
+
+    apply() runs once the child is already executing, so there is a short
+    window, usually while its interpreter starts up, in which the limits do
+    not hold yet: workers it forks before then keep the default nice and
+    affinity and stay outside the cgroup, and files it opens count against
+    the old open-files limit. The cgroup move and RLIMIT_NOFILE still cover
+    the child itself once applied. Limits that must hold from the first
+    instruction belong in the script's own environment (a wrapper or a
+    systemd unit).
+    """
+
+    def __init__(self, **settings):
+        for key, default in DEFAULT_LIMITS.items():
+            value = settings.get(key)
+            setattr(self, key, default if value is None else value)
+        self.cgroup_path = None
+        # Set by prepare() for apply()
+        self._cgroup_procs = None
+        self._nofile = None
+        self._nice = 0
+        self._cores = None
+
+    @classmethod
+    def from_script_info(cls, script_info):
+        return cls(**{key: script_info[key] for key in DEFAULT_LIMITS if key in script_info})
+
+    def prepare(self, name):
+        """Checks the limits before a child of script `name` starts; returns warnings.
+
+        Sets up the script's cgroup, and drops what cannot be applied here.
+        """
+        warnings = []
+        self._cgroup_procs = None
+        if self.cgroup:
+            try:
+                self._cgroup_procs = os.path.join(self.setup_cgroup(name), 'cgroup.procs')
+            except OSError as e:
+                warnings.append(f"cgroup limits not applied: {e}")
+
+        self._nofile = None
+        if self.max_open_files:
+            if not hasattr(resource, 'prlimit'):
+                warnings.append("max open files can only be set on Linux")
+            else:
+                _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+                self._nofile = self.max_open_files
+                if hard != resource.RLIM_INFINITY and self._nofile > hard:
+                    warnings.append(f"max open files lowered to the hard limit {hard}")
+                    self._nofile = hard
+
+        self._nice = 0 if os.name == 'nt' else self.nice
+        if self._nice < 0 and hasattr(os, 'geteuid') and os.geteuid() != 0:
+            warnings.append("negative nice needs root, keeping the default priority")
+            self._nice = 0
+
+        self._cores = None
+        if self.cpu_affinity:
+            if hasattr(os, 'sched_setaffinity'):
+                self._cores = set(self.cpu_affinity)
+            else:
+                warnings.append("CPU affinity is not supported on this platform")
+        return warnings
+
+    def apply(self, pid):
+        """Applies the prepared limits to a new child from the supervisor; returns warnings.
+
+        Nothing runs in the child between fork and exec (preexec_fn is not
+        safe in a threaded supervisor), so this happens right after spawn,
+        while the interpreter of the script is still starting up.
+        """
+        warnings = []
+        if self._cgroup_procs:
+            try:
+                # Moves every thread of the process
+                self._write(os.path.dirname(self._cgroup_procs), 'cgroup.procs', str(pid))
+            except OSError as e:
+                warnings.append(f"cgroup limits not applied: {e}")
+        if self._nofile:
+            try:
+                resource.prlimit(pid, resource.RLIMIT_NOFILE, (self._nofile, self._nofile))
+            except OSError as e:
+                warnings.append(f"max open files not applied: {e}")
+        if self._nice or self._cores:
+            # Priority and affinity are per thread on Linux
+            for tid in thread_ids(pid):
+                try:
+                    if self._nice:
+                        os.setpriority(os.PRIO_PROCESS, tid, self._nice)
+                    if self._cores:
+                        os.sched_setaffinity(tid, self._cores)
+                except OSError as e:
+                    warnings.append(f"nice/CPU affinity not applied: {e}")
+                    break
+        if self.ionice_class:
+            ioclass = getattr(psutil, IONICE_CLASSES.get(self.ionice_class, ''), None)
+            try:
+                if ioclass is None:
+                    raise OSError(f"ionice class '{self.ionice_class}' is not supported here")
+                value = None if self.ionice_class == 'idle' else self.ionice_level
+                psutil.Process(pid).ionice(ioclass, value)
+            except (OSError, psutil.Error) as e:
+                warnings.append(f"ionice not applied: {e}")
+        return warnings
+
+    def setup_cgroup(self, name):
+        if not os.path.exists(os.path.join(self.cgroup, 'cgroup.controllers')):
+            raise OSError(f"{self.cgroup} is not a cgroup v2 directory")
+        # Controllers must be enabled for children; already-enabled ones are fine
+        for controller in ('+cpu', '+memory'):
+            try:
+                with open(os.path.join(self.cgroup, 'cgroup.subtree_control'), 'w') as f:
+                    f.write(controller)
+            except OSError:
+                pass
+
+        safe_name = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in name)
+        path = os.path.join(self.cgroup, f"mng-{safe_name}")
+        os.makedirs(path, exist_ok=True)
+        self.cgroup_path = path
+        quota = int(CPU_PERIOD * self.cpu_limit_percent / 100)
+        self._write(path, 'cpu.max', f"{quota} {CPU_PERIOD}" if quota else f"max {CPU_PERIOD}")
+        memory = int(self.memory_limit_mb * MEMORY_HIGH_FACTOR * 1024 * 1024)
+        # memory.high throttles and reclaims instead of OOM-killing; the
+        # monitor does the graceful restart before the group gets there
+        self._write(path, 'memory.high', str(memory) if memory else 'max')
+        return path
+
+    def _write(self, path, name, value):
+        with open(os.path.join(path, name), 'w') as f:
+            f.write(value)
+
+    def remove_cgroup(self):
+        if self.cgroup_path:
+            try:
+                os.rmdir(self.cgroup_path)
+            except OSError:
+                pass
+            self.cgroup_path = None
+
+    def memory_exceeded(self, stats):
+        return bool(self.memory_limit_mb) and stats.get('memory', 0) > self.memory_limit_mb
+
+    def cpu_exceeded(self, stats):
+        return bool(self.cpu_limit_percent) and stats.get('cpu', 0) > self.cpu_limit_percent
@@ -0,0 +1,317 @@
+"""Full-text index of the log lines of every script.
+
+Lines are indexed in SQLite next to the plain log files, one database per
+day (index-YYYY-MM-DD.sqlite), so old days go by deleting a file. Each
+database has an entries table (time, script, stream, text) with an index on
+time, and an FTS5 table over the text. A search visits the days that
+overlap its time range, newest first: the time index turns the range into a
+rowid range and FTS5 walks its matches backwards from there, so "Traceback
+in the last 6 h across all scripts" reads only what it returns.
+
+Lines are queued and committed in batches by one writer thread; the
+supervisor loop never waits on SQLite. Readers (the GUI, possibly in another
+process) open the databases read-only; WAL mode keeps them out of the
+writer's way. Each batch takes the write lock up front (BEGIN IMMEDIATE), so
+another process writing the same day waits for the busy timeout instead of
+failing the batch; a batch that still cannot be written is retried a few
+times and then counted in `dropped` and reported on stderr.
+
+Indexing is off unless the settings turn it on ("log_index": true).
+
+CLI: python -m mngcore.logindex Traceback --since 6h
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque, namedtuple
+from datetime import date, datetime, timedelta
+
+DEFAULT_INDEX_DIR = os.path.join(os.path.expanduser('~'), '.mngserver', 'index')
+DEFAULT_RETENTION_DAYS = 7
+COMMIT_INTERVAL = 0.5
+# Queued lines that start a commit right away instead of at the next interval
+BATCH_LINES = 10000
+# Lines waiting for the writer before new ones are dropped
+MAX_QUEUED_LINES = 100000
+# Attempts to write one day's batch, with a doubling pause starting here
+WRITE_ATTEMPTS = 4
+RETRY_DELAY = 0.2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    time REAL NOT NULL,
+    script TEXT NOT NULL,
+    stream TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_time ON entries (time);
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5 (text, content='entries', content_rowid='id');
+"""
+
+LogHit = namedtuple('LogHit', 'time script stream text')
+
+
+def log_index_from_settings(settings):
+    """The LogIndex configured by the settings, or None unless turned on."""
+    if not settings.get('log_index', False):
+        return None
+    return LogIndex(settings.get('log_index_dir') or DEFAULT_INDEX_DIR,
+                    settings.get('log_index_days', DEFAULT_RETENTION_DAYS))
+
+
+def fts_query(text):
+    """FTS5 query for plain search text: every word must match.
+
+    "quoted phrases" stay together and a trailing * matches a prefix;
+    anything else FTS5 would parse as syntax is taken literally.
+    """
+    terms = []
+    for phrase, word in re.findall(r'"([^"]*)"|(\S+)', text):
+        term = phrase if phrase else word
+        prefix = not phrase and term.endswith('*') and len(term) > 1
+        term = term.rstrip('*') if prefix else term
+        if term:
+            terms.append('"' + term.replace('"', '""') + '"' + ('*' if prefix else ''))
+    return ' '.join(terms)
+
+
+def parse_duration(text):
+    """Seconds in "90s", "30m", "6h" or "7d" (plain numbers are seconds)."""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*', str(text))
+    if not match:
+        raise ValueError(f"invalid duration '{text}', expected e.g. 30m, 6h or 7d")
+    return float(match.group(1)) * {'': 1, 's': 1, 'm': 60, 'h': 3600, 'd': 86400}[match.group(2)]
+
+
+class LogIndex:
+    def __init__(self, directory=DEFAULT_INDEX_DIR, retention_days=DEFAULT_RETENTION_DAYS):
+        self.directory = directory
+        self.retention_days = retention_days
+        self.dropped = 0
+        self._queue = deque()
+        self._queued = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._closed = False
+        # Writer thread only: day -> connection
+        self._writers = {}
+
+    # Writing
+
+    def add(self, script, stream, lines, timestamp=None):
+        """Queues lines for indexing; safe from any thread."""
+        with self._lock:
+            if self._closed:
+                return
+            if self._queued >= MAX_QUEUED_LINES:
+                self.dropped += len(lines)
+                return
+            self._queue.append((timestamp or time.time(), script, stream, lines))
+            self._queued += len(lines)
+            if self._queued >= BATCH_LINES:
+                self._wakeup.set()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='mng-log-index', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(COMMIT_INTERVAL)
+            self._wakeup.clear()
+            closed = self._closed
+            self._write_pending()
+            if closed:
+                break
+        for connection in self._writers.values():
+            connection.close()
+        self._writers.clear()
+
+    def _write_pending(self):
+        with self._lock:
+            batch, self._queue = self._queue, deque()
+            self._queued = 0
+        rows_by_day = {}
+        for timestamp, script, stream, lines in batch:
+            rows = rows_by_day.setdefault(date.fromtimestamp(timestamp), [])
+            rows.extend((timestamp, script, stream, line) for line in lines)
+        for day, rows in rows_by_day.items():
+            for attempt in range(WRITE_ATTEMPTS):
+                try:
+                    self._write_rows(day, rows)
+                    break
+                except (sqlite3.Error, OSError) as e:
+                    error = e
+                    if attempt + 1 < WRITE_ATTEMPTS:
+                        time.sleep(RETRY_DELAY * 2 ** attempt)
+            else:
+                with self._lock:
+                    self.dropped += len(rows)
+                print(f"⚠️ Log index: {len(rows)} line(s) of {day} not indexed: {error}",
+                      file=sys.stderr, flush=True)
+
+    def _write_rows(self, day, rows):
+        connection = self._writer(day)
+        # Write lock first: max(id) must not change until the FTS rows are in
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            last_id = connection.execute("SELECT coalesce(max(id), 0) FROM entries").fetchone()[0]
+            connection.executemany("INSERT INTO entries (time, script, stream, text) VALUES (?, ?, ?, ?)", rows)
+            connection.execute("INSERT INTO entries_fts (rowid, text) SELECT id, text FROM entries WHERE id > ?",
+                               (last_id,))
+            connection.execute("COMMIT")
+        except BaseException:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            raise
+
+    def _writer(self, day):
+        connection = self._writers.get(day)
+        if connection is None:
+            os.makedirs(self.directory, exist_ok=True)
+            # Transactions are begun explicitly in _write_rows
+            connection = sqlite3.connect(self.segment_path(day), timeout=10, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._writers[day] = connection
+            # A new day: yesterday's writer is done, the oldest days expire
+            for old_day in [d for d in self._writers if d < day]:
+                self._writers.pop(old_day).close()
+            self.prune(day)
+        return connection
+
+    def prune(self, today=None):
+        oldest = (today or date.today()) - timedelta(days=self.retention_days - 1)
+        for day, path in self.segments():
+            if day < oldest:
+                for suffix in ('', '-wal', '-shm'):
+                    try:
+                        os.remove(path + suffix)
+                    except OSError:
+                        pass
+
+    def close(self):
+        """Writes what is still queued and stops the writer."""
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._wakeup.set()
+            thread.join(timeout=10)
+
+    # Reading
+
+    def segment_path(self, day):
+        return os.path.join(self.directory, f"index-{day.isoformat()}.sqlite")
+
+    def segments(self, since=None, until=None):
+        """(day, path) of the day databases overlapping [since, until], newest first."""
+        try:
+            filenames = os.listdir(self.directory)
+        except OSError:
+            return []
+        first = date.fromtimestamp(since) if since is not None else date.min
+        last = date.fromtimestamp(until) if until is not None else date.max
+        found = []
+        for filename in filenames:
+            match = re.fullmatch(r'index-(\d{4}-\d{2}-\d{2})\.sqlite', filename)
+            if match:
+                day = date.fromisoformat(match.group(1))
+                if first <= day <= last:
+                    found.append((day, os.path.join(self.directory, filename)))
+        found.sort(reverse=True)
+        return found
+
+    def search(self, query='', since=None, until=None, scripts=None, limit=500):
+        """LogHits newest first: lines matching every word of query (all lines
+        if it is empty) logged in [since, until] by any of scripts (all if None).
+
+        Raises ValueError for a query FTS5 cannot run.
+        """
+        if scripts is not None and not scripts:
+            return []
+        match = fts_query(query)
+        hits = []
+        for _, path in self.segments(since, until):
+            if len(hits) >= limit:
+                break
+            try:
+                connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=5)
+            except sqlite3.Error:
+                continue
+            try:
+                hits.extend(self._search_segment(connection, match, since, until, scripts, limit - len(hits)))
+            except sqlite3.OperationalError as e:
+                if 'fts5' in str(e) or 'syntax' in str(e):
+                    raise ValueError(f"invalid search: {e}")
+            except sqlite3.Error:
+                pass
+            finally:
+                connection.close()
+        return hits
+
+    def _search_segment(self, connection, match, since, until, scripts, limit):
+        # Lines are appended in time order, so a time range is a rowid range
+        low, high = 0, sys.maxsize
+        if since is not None:
+            row = connection.execute("SELECT id FROM entries WHERE time >= ? ORDER BY time LIMIT 1", (since,)).fetchone()
+            if row is None:
+                return []
+            low = row[0]
+        if until is not None:
+            row = connection.execute("SELECT id FROM entries WHERE time <= ? ORDER BY time DESC LIMIT 1",
+                                     (until,)).fetchone()
+            if row is None:
+                return []
+            high = row[0]
+
+        parameters = [low, high]
+        script_filter = ''
+        if scripts is not None:
+            script_filter = f" AND e.script IN ({', '.join('?' * len(scripts))})"
+            parameters.extend(scripts)
+        if match:
+            sql = ("SELECT e.time, e.script, e.stream, e.text FROM entries_fts f JOIN entries e ON e.id = f.rowid"
+                   f" WHERE entries_fts MATCH ? AND f.rowid BETWEEN ? AND ?{script_filter}"
+                   " ORDER BY f.rowid DESC LIMIT ?")
+            parameters.insert(0, match)
+        else:
+            sql = ("SELECT e.time, e.script, e.stream, e.text FROM entries e"
+                   f" WHERE e.id BETWEEN ? AND ?{script_filter} ORDER BY e.id DESC LIMIT ?")
+        parameters.append(limit)
+        return [LogHit(*row) for row in connection.execute(sql, parameters)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m mngcore.logindex', description='Search the logs of all scripts')
+    parser.add_argument('query', nargs='*', help='words every line must contain ("phrase", prefix*)')
+    parser.add_argument('--since', help='how far back, e.g. 30m, 6h or 7d')
+    parser.add_argument('--script', action='append', help='only this script (repeatable)')
+    parser.add_argument('--limit', type=int, default=100, help='maximum number of lines')
+    parser.add_argument('--dir', default=DEFAULT_INDEX_DIR, help='index directory')
+    args = parser.parse_args(argv)
+
+    try:
+        since = time.time() - parse_duration(args.since) if args.since else None
+        started = time.perf_counter()
+        hits = LogIndex(args.dir).search(' '.join(args.query), since=since, scripts=args.script, limit=args.limit)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    elapsed = (time.perf_counter() - started) * 1000
+    for hit in reversed(hits):
+        timestamp = datetime.fromtimestamp(hit.time).strftime("%Y-%m-%d %H:%M:%S")
+        print(f"[{timestamp}] [{hit.script}] [{hit.stream}] {hit.text}")
+    print(f"{len(hits)} line(s) in {elapsed:.1f} ms", file=sys.stderr)
+    return 0 if hits else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
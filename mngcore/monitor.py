@@ -0,0 +1,620 @@
+"""Per-script supervision logic, shared by the GUI and the headless daemon."""
+
+import asyncio
+import os
+import signal
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from .output import RotatingLogFile, script_log_path
+from .limits import ResourceLimits
+from .notify import default_dispatcher
+from .policy import RestartPolicy
+from .probes import HeartbeatProbe, TcpProbe, build_probe
+from .signals import MonitorSignals
+from .supervisor import default_supervisor, listen_socket
+
+
+class ScriptMonitor:
+    def __init__(self, script_info, supervisor=None, notifier=None):
+        self.script_info = script_info
+        self.script_path = script_info['path']
+        self.script_name = script_info['name']
+        self.max_restarts = script_info.get('max_restarts', 5)
+        self.check_interval = script_info.get('check_interval', 10)
+        
+        self.telegram_enabled = script_info.get('telegram_enabled', False)
+        self.telegram_token = script_info.get('telegram_token', '')
+        self.telegram_chat_id = script_info.get('telegram_chat_id', '')
+        
+        # Scheduled restart settings - УПРОЩЕННАЯ ВЕРСИЯ
+        self.scheduled_restart_enabled = script_info.get('scheduled_restart_enabled', False)
+        self.restart_interval_value = script_info.get('restart_interval_value', 1)
+        self.restart_interval_unit = script_info.get('restart_interval_unit', 'hours')
+        
+        # Total restarts, shown in the stats; the policy counts consecutive ones
+        self.restart_count = script_info.get('restarts', 0)
+        self.last_exit_code = None
+        self.policy = RestartPolicy.from_script_info(script_info)
+        self.limits = ResourceLimits.from_script_info(script_info)
+        self.cpu_over_limit = False
+        self.probes = []
+        self.ready = False
+        self.last_output = time.monotonic()
+        self.process = None
+        
+        # Overlap restarts: the next instance starts next to the running one
+        # and takes over once ready; both share the supervisor's socket
+        self.listen = script_info.get('listen', '')
+        self.restart_mode = script_info.get('restart_mode', 'restart')
+        self.overlap_grace = script_info.get('overlap_grace', 5)
+        self.ready_timeout = script_info.get('ready_timeout', 60)
+        self.drain_timeout = script_info.get('drain_timeout', 10)
+        self.listen_socket = None
+        self.replacing = False
+        self.candidate = None
+        self.candidate_ready = None
+        self.ready_files = 0
+        
+        # All monitors share one supervisor loop; every method below except
+        # start() and stop() runs on that loop.
+        self.supervisor = supervisor or default_supervisor()
+        self.log_file = RotatingLogFile(
+            script_log_path(script_info),
+            script_info.get('log_max_bytes', 10 * 1024 * 1024),
+            script_info.get('log_backups', 5),
+            self.supervisor.log_index,
+            self.script_name
+        )
+        self.notifier = notifier
+        self.signals = MonitorSignals()
+        self.signals.log_signal.connect(self.record_event)
+        self.active = False
+        self.stopping = False
+        self.restart_timer = None
+        self.backoff_timer = None
+        self.recovery = None
+        self.last_stats = {'cpu': 0.0, 'memory': 0.0, 'restarts': 0, 'uptime': '00:00:00'}
+        self.start_time = None
+        self.next_restart_time = self.calculate_next_restart_time()
+
+    def calculate_next_restart_time(self):
+        if not self.scheduled_restart_enabled or not self.start_time:
+            return None
+            
+        # Конвертируем в секунды в зависимости от единицы измерения
+        unit_multipliers = {
+            'seconds': 1,
+            'minutes': 60,
+            'hours': 3600
+        }
+        
+        interval_seconds = self.restart_interval_value * unit_multipliers.get(self.restart_interval_unit, 3600)
+        return self.start_time + timedelta(seconds=interval_seconds)
+
+    def start(self, after=None):
+        """Starts monitoring; with `after` (a future), once it has completed."""
+        self.supervisor.monitors[self.script_name] = self
+        self.active = True
+        self.stopping = False
+        if after is None:
+            self.supervisor.call_soon(self.run)
+        else:
+            after.add_done_callback(lambda _: self.supervisor.call_soon(self.run))
+
+    def is_alive(self):
+        return self.active
+
+    def run(self):
+        self.start_time = datetime.now()
+        self.signals.log_signal.emit(self.script_name, f"🚀 Starting monitoring: {self.script_name}")
+        self.probes = self.build_probes()
+        if self.adopt():
+            return
+        if self.listen and self.listen_socket is None:
+            try:
+                self.listen_socket = listen_socket(self.listen)
+            except (OSError, ValueError) as e:
+                self.signals.log_signal.emit(self.script_name, f"❌ Cannot listen on {self.listen}: {e}")
+                self.signals.status_signal.emit(self.script_name, "error")
+                self.active = False
+                return
+        
+        if not self.start_script():
+            self.signals.status_signal.emit(self.script_name, "error")
+            self.active = False
+
+    def schedule_restart(self):
+        if self.restart_timer:
+            self.restart_timer.cancel()
+            self.restart_timer = None
+        self.next_restart_time = self.calculate_next_restart_time()
+        if self.next_restart_time:
+            delay = max(0.0, (self.next_restart_time - datetime.now()).total_seconds())
+            self.restart_timer = self.supervisor.call_later(delay, self.scheduled_restart)
+
+    def scheduled_restart(self):
+        self.restart_timer = None
+        if self.stopping or not self.is_running():
+            return
+        message = f"⏰ Scheduled restart for {self.script_name}"
+        self.signals.log_signal.emit(self.script_name, message)
+        self.send_telegram_message(message)
+        self.supervisor.loop.create_task(self.replace_process())
+
+    async def replace_process(self):
+        if self.replacing:
+            # An overlap restart is already bringing up a new instance
+            return
+        # An adopted instance keeps the previous supervisor's socket, so the
+        # address is only free again once it is gone: restart it plainly
+        overlap = self.restart_mode == 'overlap' and (not self.listen or self.listen_socket is not None)
+        if overlap and self.is_running():
+            await self.overlap_restart()
+            return
+        # Detach the old process first so its exit is not treated as a crash
+        old_process, self.process = self.process, None
+        self.stop_checks()
+        if old_process:
+            await self.supervisor.terminate(old_process, timeout=5)
+        if self.stopping:
+            return
+        if not self.start_script():
+            self.signals.status_signal.emit(self.script_name, "error")
+            await self.shutdown()
+
+    async def overlap_restart(self):
+        """Starts the next instance beside the running one and swaps when it is ready.
+
+        The old instance keeps serving meanwhile and answers anything that
+        reaches both: the shared listen socket, the heartbeat file and the
+        merged output. So readiness is judged on channels of the new
+        instance alone: output probes watch its own output, and TCP/HTTP
+        probes on the listen port and heartbeat probes are replaced by
+        waiting for it to create the file named in $MNG_READY_FILE. Without
+        readiness probes it is ready once it survived overlap_grace seconds.
+        If it exits or is not ready within ready_timeout the running instance
+        is kept. The old instance then gets drain_timeout seconds to finish
+        in-flight work after SIGTERM.
+        """
+        old_process = self.process
+        ready = self.candidate_ready = self.supervisor.loop.create_future()
+        candidate_key = f"{self.script_name}#next"
+        ready_file = self.ready_file_path()
+        last_output = time.monotonic()
+
+        def on_exit(process):
+            if not ready.done():
+                ready.set_result(False)
+            self.on_exit(process)
+
+        def on_output(stream, lines):
+            nonlocal last_output
+            last_output = time.monotonic()
+            self.on_output(stream, lines)
+
+        def on_probe_event(probe, event, detail):
+            if event == 'ready' and all(p.ready for p in probes) and not ready.done():
+                ready.set_result(True)
+
+        self.replacing = True
+        try:
+            new_process = self.candidate = self.spawn_instance(on_exit, on_output, ready_file)
+        except Exception as e:
+            self.replacing = False
+            self.candidate_ready = None
+            error_msg = f"❌ Start error: {e}"
+            self.signals.log_signal.emit(self.script_name, error_msg)
+            self.send_telegram_message(error_msg)
+            return
+
+        # Fresh probe state for the new instance
+        probes, shared = [], []
+        for probe in self.probes:
+            if probe.kind != 'readiness':
+                continue
+            if self.reaches_both_instances(probe):
+                shared.append(probe)
+            else:
+                probes.append(build_probe(probe.spec, lambda: last_output))
+        if shared:
+            self.signals.log_signal.emit(
+                self.script_name,
+                f"⏳ Waiting for the new instance to create $MNG_READY_FILE: "
+                f"{', '.join(map(str, shared))} would also reach the running instance"
+            )
+            probes.append(build_probe({
+                'type': 'heartbeat',
+                'kind': 'readiness',
+                'path': ready_file,
+                'max_age': float('inf'),
+                'interval': min(probe.interval for probe in shared),
+            }, None))
+        if probes:
+            self.supervisor.probes.watch(candidate_key, probes, on_probe_event)
+        else:
+            self.supervisor.call_later(
+                self.overlap_grace,
+                lambda: ready.done() or ready.set_result(new_process.poll() is None)
+            )
+        try:
+            is_ready = await asyncio.wait_for(ready, self.ready_timeout)
+        except asyncio.TimeoutError:
+            is_ready = False
+        finally:
+            self.supervisor.probes.unwatch(candidate_key)
+            self.replacing = False
+            self.candidate_ready = None
+            try:
+                os.unlink(ready_file)
+            except OSError:
+                pass
+
+        if self.stopping:
+            # shutdown() terminates the candidate too
+            return
+        self.candidate = None
+        if not is_ready:
+            await self.supervisor.terminate(new_process, timeout=5)
+            message = f"⚠️ New instance of {self.script_name} did not become ready, keeping the running one"
+            self.signals.log_signal.emit(self.script_name, message)
+            self.send_telegram_message(message)
+            if old_process.poll() is not None:
+                # The old one died meanwhile: handle it as a crash now
+                self.on_exit(old_process)
+            else:
+                self.schedule_restart()
+            return
+
+        # Swap: the new instance is supervised from here on, the old one drains
+        self.stop_checks()
+        self.process = new_process
+        if new_process.poll() is not None:
+            self.on_exit(new_process)
+        else:
+            self.started(f"🔀 Switched {self.script_name} to the new instance, draining the old one")
+        await self.supervisor.terminate(old_process, timeout=self.drain_timeout)
+
+    def reaches_both_instances(self, probe):
+        """True if the running instance could answer a probe meant for the next one."""
+        if isinstance(probe, HeartbeatProbe):
+            return True
+        return (isinstance(probe, TcpProbe) and self.listen_socket is not None
+                and probe.port == self.listen_socket.getsockname()[1])
+
+    def ready_file_path(self):
+        """Not yet existing path an overlap candidate creates once it is ready."""
+        self.ready_files += 1
+        state = self.supervisor.state
+        directory = state.run_dir if state is not None else tempfile.gettempdir()
+        safe_name = ''.join(c if c.isalnum() or c in '-_.#' else '_' for c in self.script_name)
+        path = os.path.join(directory, f"{safe_name}-{os.getpid()}-{self.ready_files}.ready")
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        return path
+
+    def spawn_instance(self, on_exit, on_output=None, ready_file=None):
+        # Unbuffered child so lines show up as they are printed
+        env = dict(os.environ, PYTHONUNBUFFERED='1')
+        if ready_file:
+            env['MNG_READY_FILE'] = ready_file
+        options = {}
+        for warning in self.limits.prepare(self.script_name):
+            self.signals.log_signal.emit(self.script_name, f"⚠️ {warning}")
+        if self.listen and self.listen_socket is None:
+            # Not opened by run() when the script was adopted
+            self.listen_socket = listen_socket(self.listen)
+        if self.listen_socket is not None:
+            # Same fd number in the child: socket.socket(fileno=int(os.environ['MNG_LISTEN_FD']))
+            env['MNG_LISTEN_FD'] = str(self.listen_socket.fileno())
+            options['pass_fds'] = (self.listen_socket.fileno(),)
+        process = self.supervisor.spawn(
+            [sys.executable, self.script_path],
+            on_exit,
+            on_output or self.on_output,
+            self.log_file,
+            fifos=self.supervisor.state.fifo_paths(self.script_name) if self.supervisor.state else None,
+            env=env,
+            **options
+        )
+        for warning in self.limits.apply(process.pid):
+            self.signals.log_signal.emit(self.script_name, f"⚠️ {warning}")
+        return process
+
+    def start_script(self):
+        try:
+            self.process = self.spawn_instance(self.on_exit)
+            self.started(f"✅ Started: {self.script_name}")
+            return True
+        except Exception as e:
+            error_msg = f"❌ Start error: {e}"
+            self.signals.log_signal.emit(self.script_name, error_msg)
+            self.send_telegram_message(error_msg)
+            return False
+
+    def adopt(self):
+        """Takes over the process a previous supervisor left running, if any."""
+        state = self.supervisor.state
+        entry = state.claim(self.script_name) if state is not None else None
+        if entry is None:
+            return False
+        process = self.supervisor.adopt(entry, self.on_exit, self.on_output, self.log_file)
+        if process is None:
+            return False
+        self.process = process
+        self.restart_count = max(self.restart_count, entry.get('restarts', 0))
+        self.script_info['restarts'] = self.restart_count
+        self.started(f"♻️ Re-attached to {self.script_name} (pid {process.pid})",
+                     datetime.fromtimestamp(entry['started']))
+        return True
+
+    def started(self, message, start_time=None):
+        self.start_time = start_time or datetime.now()
+        if self.supervisor.state is not None:
+            self.supervisor.state.record(self.script_name, self.process, self.start_time.timestamp(),
+                                         self.restart_count)
+        self.policy.record_start()
+        self.schedule_restart()
+        # Stats come from the shared sampler every check_interval
+        self.supervisor.sampler.track(self.script_name, self.process.pid, self.check_interval, self.send_stats)
+        self.last_output = time.monotonic()
+        self.ready = not any(probe.kind == 'readiness' for probe in self.probes)
+        self.supervisor.probes.watch(self.script_name, self.probes, self.on_probe_event)
+        self.signals.status_signal.emit(self.script_name, "running")
+        self.signals.log_signal.emit(self.script_name, message)
+        self.send_telegram_message(message)
+
+    def record_event(self, script_name, message):
+        # Monitor events go to the log file too, next to the script output
+        try:
+            self.log_file.write_lines('mngserver', [message])
+        except OSError:
+            pass
+
+    def on_output(self, stream, lines):
+        self.last_output = time.monotonic()
+        self.signals.output_signal.emit(self.script_name, stream, lines)
+
+    def build_probes(self):
+        probes = []
+        for spec in self.script_info.get('probes') or []:
+            try:
+                probes.append(build_probe(spec, lambda: self.last_output))
+            except ValueError as e:
+                self.signals.log_signal.emit(self.script_name, f"⚠️ Probe ignored: {e}")
+        return probes
+
+    def on_probe_event(self, probe, event, detail):
+        if event == 'ready':
+            # Ready once every readiness probe passes
+            if not self.ready and all(p.ready for p in self.probes if p.kind == 'readiness'):
+                self.ready = True
+                self.signals.log_signal.emit(self.script_name, f"🟢 {self.script_name} is ready")
+            return
+        if event == 'unready':
+            self.ready = False
+            message = f"🟠 Not ready: {probe} failed {probe.failure_threshold} time(s) ({detail})"
+            self.signals.log_signal.emit(self.script_name, message)
+            self.send_telegram_message(message)
+            return
+
+        if self.replacing:
+            return
+        # A liveness probe gave up: the process runs but does not work
+        message = (f"💔 {self.script_name} is unhealthy: {probe} failed "
+                   f"{probe.failure_threshold} time(s) ({detail}), restarting")
+        self.signals.log_signal.emit(self.script_name, message)
+        self.send_telegram_message(message)
+        self.stop_checks()
+        self.supervisor.loop.create_task(self.replace_process())
+
+    def stop_checks(self):
+        self.supervisor.sampler.untrack(self.script_name)
+        self.supervisor.probes.unwatch(self.script_name)
+
+    def on_exit(self, process):
+        if process is not self.process or self.stopping or self.replacing:
+            return
+        self.last_exit_code = process.returncode
+        self.stop_checks()
+        self.recovery = self.supervisor.loop.create_task(self.recover(process))
+
+    async def recover(self, process, reason=None):
+        # Workers the crashed script left behind are stopped before the restart
+        await self.supervisor.terminate(process, timeout=5)
+        self.recovery = None
+        if not self.stopping:
+            self.handle_failure(reason or f"⚠️ Script {self.script_name} crashed")
+
+    def handle_failure(self, reason):
+        decision = self.policy.on_exit()
+        if not decision.restart:
+            message = f"{reason}. ⛔ Restart limit reached for {self.script_name}"
+            self.signals.log_signal.emit(self.script_name, message)
+            self.send_telegram_message(message)
+            self.signals.status_signal.emit(self.script_name, "error")
+            self.supervisor.loop.create_task(self.shutdown())
+            return
+
+        if decision.crash_loop:
+            message = (f"{reason}. 🔁 Crash loop detected ({self.policy.crash_loop_count} exits in "
+                       f"{self.policy.crash_loop_window}s), next restart in {decision.delay:.0f}s")
+        elif decision.delay:
+            message = f"{reason}, restarting in {decision.delay:.1f}s (attempt {decision.attempt})"
+        else:
+            message = f"{reason}, restarting..."
+        self.signals.log_signal.emit(self.script_name, message)
+        self.send_telegram_message(message)
+
+        if decision.delay:
+            self.signals.status_signal.emit(self.script_name, "waiting")
+            self.backoff_timer = self.supervisor.call_later(decision.delay, self.restart_script)
+        else:
+            self.restart_script()
+
+    def is_running(self):
+        return self.process and self.process.poll() is None
+
+    async def restart(self):
+        """Manual restart: skips any pending backoff and starts with a clean policy."""
+        if self.stopping:
+            return
+        if self.backoff_timer:
+            self.backoff_timer.cancel()
+            self.backoff_timer = None
+        if self.recovery:
+            self.recovery.cancel()
+            self.recovery = None
+        self.policy.reset()
+        message = f"🔄 Manual restart of {self.script_name}"
+        self.signals.log_signal.emit(self.script_name, message)
+        await self.replace_process()
+
+    def restart_script(self):
+        self.backoff_timer = None
+        if self.stopping:
+            return
+        self.restart_count += 1
+        self.script_info['restarts'] = self.restart_count
+        self.signals.restart_signal.emit(self.script_name)
+        if not self.start_script():
+            self.handle_failure(f"❌ Restart of {self.script_name} failed")
+
+    def send_stats(self, sample):
+        stats = {
+            'cpu': 0.0,
+            'memory': 0.0,
+            'restarts': self.restart_count,
+            'uptime': '00:00:00'
+        }
+        
+        if self.is_running() and self.start_time:
+            stats.update(sample)
+            if self.check_limits(stats):
+                return
+            stats.pop('pid', None)
+            
+            stats['uptime'] = format_uptime((datetime.now() - self.start_time).total_seconds())
+        
+        # Send only if data changed
+        if stats != self.last_stats:
+            self.last_stats = stats
+            self.signals.stats_signal.emit(self.script_name, stats)
+
+    def check_limits(self, stats):
+        """Reports limit breaches; True if the script is being restarted."""
+        if self.limits.memory_exceeded(stats):
+            reason = (f"📛 Memory limit exceeded by {self.script_name}: "
+                      f"{stats['memory']:.1f} MB > {self.limits.memory_limit_mb} MB")
+            # A failure like a crash: the restart policy decides on backoff and
+            # crash loops. Detached first so its exit is not handled twice.
+            process, self.process = self.process, None
+            self.stop_checks()
+            self.recovery = self.supervisor.loop.create_task(self.recover(process, reason))
+            return True
+
+        # CPU is reported once per episode; a cgroup quota does the throttling
+        cpu_over_limit = self.limits.cpu_exceeded(stats)
+        if cpu_over_limit and not self.cpu_over_limit:
+            message = (f"🔥 CPU quota exceeded by {self.script_name}: "
+                       f"{stats['cpu']:.1f}% > {self.limits.cpu_limit_percent}%")
+            self.signals.log_signal.emit(self.script_name, message)
+            self.send_telegram_message(message)
+        self.cpu_over_limit = cpu_over_limit
+        return False
+
+    def send_telegram_message(self, message):
+        if not self.telegram_enabled or not self.telegram_token or not self.telegram_chat_id:
+            return
+        # Only queued here; the dispatcher thread does the network I/O
+        notifier = self.notifier or default_dispatcher()
+        notifier.notify(self.telegram_token, self.telegram_chat_id, message)
+
+    def stop(self):
+        """Begins shutdown without waiting for it; returns its future."""
+        if self.supervisor.in_loop():
+            return self.supervisor.loop.create_task(self.shutdown())
+        return self.supervisor.submit(self.shutdown())
+
+    async def shutdown(self, timeout=3):
+        if not self.begin_shutdown():
+            return
+        await self.supervisor.terminate_many(self.processes(), timeout)
+        self.finish_shutdown()
+
+    def processes(self):
+        """The supervised instance plus the one an overlap restart is starting."""
+        return [process for process in (self.process, self.candidate) if process is not None]
+
+    def begin_shutdown(self):
+        """Cancels timers and sampling; False if already shutting down."""
+        if self.stopping:
+            return False
+        self.stopping = True
+        if self.restart_timer:
+            self.restart_timer.cancel()
+            self.restart_timer = None
+        if self.backoff_timer:
+            self.backoff_timer.cancel()
+            self.backoff_timer = None
+        if self.recovery:
+            # Shutdown stops the crashed script's group itself
+            self.recovery.cancel()
+            self.recovery = None
+        if self.candidate_ready is not None and not self.candidate_ready.done():
+            self.candidate_ready.set_result(False)
+        self.stop_checks()
+        return True
+
+    def finish_shutdown(self):
+        self.active = False
+        message = f"🛑 Stopped monitoring: {self.script_name}"
+        self.signals.log_signal.emit(self.script_name, message)
+        self.send_telegram_message(message)
+        self.signals.status_signal.emit(self.script_name, "stopped")
+        if self.supervisor.state is not None:
+            self.supervisor.state.forget(self.script_name)
+        self.close_resources()
+        self.limits.remove_cgroup()
+
+    def detach(self):
+        """Stops supervising but leaves the script running for the next supervisor."""
+        if not self.begin_shutdown():
+            return
+        if self.candidate is not None:
+            # A half-started overlap instance is not recorded anywhere
+            self.supervisor.signal_tree(self.candidate, signal.SIGTERM)
+        self.active = False
+        if self.is_running():
+            self.supervisor.release(self.process)
+            self.signals.log_signal.emit(
+                self.script_name, f"⏏️ Detached from {self.script_name}, left running (pid {self.process.pid})")
+        self.close_resources()
+
+    def close_resources(self):
+        self.log_file.close()
+        if self.listen_socket is not None:
+            self.listen_socket.close()
+            self.listen_socket = None
+
+
+def format_uptime(seconds):
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{int(seconds):02d}"
+
+
+async def shutdown_monitors(monitors, timeout=3):
+    """Stops many monitors together: one SIGTERM wave, one deadline, one SIGKILL wave."""
+    stopping = [monitor for monitor in monitors if monitor.begin_shutdown()]
+    by_supervisor = {}
+    for monitor in stopping:
+        by_supervisor.setdefault(monitor.supervisor, []).extend(monitor.processes())
+    await asyncio.gather(*(supervisor.terminate_many(processes, timeout)
+                           for supervisor, processes in by_supervisor.items()))
+    for monitor in stopping:
+        monitor.finish_shutdown()
@@ -0,0 +1,191 @@
+"""Background Telegram notifications.
+
+Monitors only enqueue messages; one dispatcher thread sends them through a
+single pooled HTTP session. Messages arriving within coalesce_window of each
+other are merged into one digest per chat (a steady stream is still sent at
+least every coalesce_max seconds), and rate limits (HTTP 429 with
+retry_after) and server errors are retried with exponential backoff.
+"""
+
+import html
+import queue
+import threading
+import time
+
+TELEGRAM_API_URL = 'https://api.telegram.org'
+MAX_MESSAGE_LENGTH = 4096
+
+
+class TelegramDispatcher(threading.Thread):
+    def __init__(self, api_url=TELEGRAM_API_URL, max_queue=1000, coalesce_window=1.0, coalesce_max=10.0,
+                 min_interval=1.0, max_retries=5, backoff_base=1.0, backoff_max=60.0, timeout=10):
+        super().__init__(name='mng-telegram', daemon=True)
+        self.api_url = api_url.rstrip('/')
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.coalesce_window = coalesce_window
+        self.coalesce_max = coalesce_max
+        self.min_interval = min_interval
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.session = None
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+        self._last_sent = {}
+        self._closing = threading.Event()
+        self._deadline = None
+
+    def notify(self, token, chat_id, message):
+        """Queues a message; never blocks. Drops it if the queue is full."""
+        if not token or not chat_id or self._closing.is_set():
+            return False
+        try:
+            self.queue.put_nowait((token, chat_id, message))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def close(self, timeout=5):
+        """Sends what is queued (within timeout) and stops the thread."""
+        self._closing.set()
+        self._deadline = time.monotonic() + timeout
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        if self.is_alive():
+            self.join(timeout)
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            batch = [item]
+            finished = self._collect(batch)
+            for (token, chat_id), messages in self._group(batch).items():
+                self.send(token, chat_id, self.format_digest(messages))
+            if finished:
+                return
+
+    def _collect(self, batch):
+        # Keep collecting until the burst has been quiet for coalesce_window,
+        # but no longer than coalesce_max after its first message
+        cap = time.monotonic() + self.coalesce_max
+        deadline = min(time.monotonic() + self.coalesce_window, cap)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._closing.is_set():
+                remaining = 0
+            try:
+                item = self.queue.get(timeout=remaining) if remaining else self.queue.get_nowait()
+            except queue.Empty:
+                return False
+            if item is None:
+                return True
+            batch.append(item)
+            deadline = min(time.monotonic() + self.coalesce_window, cap)
+
+    def _group(self, batch):
+        groups = {}
+        for token, chat_id, message in batch:
+            groups.setdefault((token, chat_id), []).append(message)
+        return groups
+
+    def format_digest(self, messages):
+        if len(messages) == 1:
+            header = "🤖 MNGserver:"
+        else:
+            header = f"🤖 MNGserver: {len(messages)} events"
+        text = header
+        for i, message in enumerate(messages):
+            line = '\n' + html.escape(message, quote=False)
+            more = f"\n… and {len(messages) - i} more"
+            if len(text) + len(line) + len(more) > MAX_MESSAGE_LENGTH:
+                return text + more
+            text += line
+        return text
+
+    def get_session(self):
+        if self.session is None:
+            # Imported lazily: requests alone costs more startup time than the daemon
+            import requests
+            from requests.adapters import HTTPAdapter
+            self.session = requests.Session()
+            self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+            self.session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        return self.session
+
+    def send(self, token, chat_id, text):
+        url = f"{self.api_url}/bot{token}/sendMessage"
+        payload = {'chat_id': chat_id, 'text': text, 'parse_mode': 'HTML'}
+
+        for attempt in range(self.max_retries + 1):
+            # Telegram allows about one message per second per chat
+            wait = self._last_sent.get(chat_id, 0) + self.min_interval - time.monotonic()
+            if wait > 0 and not self._sleep(wait):
+                break
+
+            retry_after = None
+            try:
+                response = self.get_session().post(url, data=payload, timeout=self.timeout)
+                self._last_sent[chat_id] = time.monotonic()
+                if response.status_code == 200:
+                    self.sent += 1
+                    return True
+                if response.status_code == 429:
+                    try:
+                        retry_after = response.json()['parameters']['retry_after']
+                    except (ValueError, KeyError, TypeError):
+                        retry_after = None
+                elif response.status_code < 500:
+                    # Bad token, unknown chat, malformed text: retrying won't help
+                    break
+            except Exception:
+                pass
+
+            if attempt == self.max_retries:
+                break
+            delay = retry_after if retry_after else min(self.backoff_base * 2 ** attempt, self.backoff_max)
+            if not self._sleep(delay):
+                break
+
+        self.failed += 1
+        return False
+
+    def _sleep(self, delay):
+        # While closing, only wait as long as the close() deadline allows
+        if self._deadline is not None and time.monotonic() + delay > self._deadline:
+            return False
+        time.sleep(delay)
+        return True
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def default_dispatcher():
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None or not _dispatcher.is_alive():
+            _dispatcher = TelegramDispatcher()
+            _dispatcher.start()
+        return _dispatcher
+
+
+def running_dispatcher():
+    """The shared dispatcher if one was started, without starting it."""
+    with _dispatcher_lock:
+        return _dispatcher
+
+
+def close_default_dispatcher(timeout=5):
+    """Flushes pending notifications at exit, if anything was ever sent."""
+    with _dispatcher_lock:
+        dispatcher = _dispatcher
+    if dispatcher is not None and dispatcher.is_alive():
+        dispatcher.close(timeout)
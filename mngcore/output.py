@@ -0,0 +1,295 @@
+"""Non-blocking capture of child stdout/stderr.
+
+Every pipe is drained as soon as data arrives, split into lines and handed to
+a sink callback and a size-rotated log file. Memory use per stream is bounded
+by READ_CHUNK plus MAX_LINE_LENGTH, regardless of how much the child writes.
+"""
+
+import os
+import selectors
+import threading
+from collections import deque
+from datetime import datetime
+
+READ_CHUNK = 64 * 1024
+MAX_LINE_LENGTH = 8 * 1024
+
+DEFAULT_LOG_DIR = os.path.join(os.path.expanduser('~'), '.mngserver', 'logs')
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUPS = 5
+
+
+def script_log_path(script_info):
+    return os.path.join(script_info.get('log_dir', DEFAULT_LOG_DIR), f"{script_info['name']}.log")
+
+
+def parse_log_line(line):
+    """Splits "[timestamp] [stream] text" into its parts, or returns None."""
+    if not line.startswith('[') or line[20:23] != '] [':
+        return None
+    end = line.find('] ', 23)
+    if end == -1:
+        return None
+    return line[1:20], line[23:end], line[end + 2:]
+
+
+def iter_lines_backwards(path, block_size=READ_CHUNK):
+    """Lines of one file from last to first, reading it backwards in blocks."""
+    try:
+        f = open(path, 'rb')
+    except OSError:
+        return
+    with f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        rest = b''
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            parts = (f.read(step) + rest).split(b'\n')
+            rest = parts.pop(0)
+            for part in reversed(parts):
+                if part:
+                    yield part.decode('utf-8', 'replace')
+        if rest:
+            yield rest.decode('utf-8', 'replace')
+
+
+def iter_log_backwards(path, backup_count=DEFAULT_BACKUPS):
+    """Lines of a rotated log (path, path.1 ... path.N), newest first."""
+    yield from iter_lines_backwards(path)
+    for i in range(1, backup_count + 1):
+        yield from iter_lines_backwards(f"{path}.{i}")
+
+
+def read_log_tail(path, max_lines=500):
+    """Last max_lines lines of a log file, oldest first."""
+    lines = []
+    for line in iter_lines_backwards(path):
+        if len(lines) >= max_lines:
+            break
+        lines.append(line)
+    lines.reverse()
+    return lines
+
+
+class LineSplitter:
+    """Turns a byte stream into decoded lines, capping partial line length."""
+
+    def __init__(self, max_line=MAX_LINE_LENGTH, encoding='utf-8'):
+        self.max_line = max_line
+        self.encoding = encoding
+        self._partial = bytearray()
+
+    def feed(self, data):
+        self._partial += data
+        parts = self._partial.split(b'\n')
+        tail = parts.pop()
+        lines = [self._decode(part) for part in parts]
+
+        # Flush over-long lines in fixed slices instead of growing forever
+        while len(tail) > self.max_line:
+            lines.append(self._decode(tail[:self.max_line]))
+            tail = tail[self.max_line:]
+
+        self._partial = bytearray(tail)
+        return lines
+
+    def flush(self):
+        if not self._partial:
+            return []
+        line = self._decode(self._partial)
+        self._partial = bytearray()
+        return [line]
+
+    def _decode(self, data):
+        return bytes(data).rstrip(b'\r').decode(self.encoding, 'replace')
+
+
+class RotatingLogFile:
+    """Append-only log file rotated by size (path, path.1 ... path.N).
+
+    With an index (mngcore.logindex.LogIndex) every line written is also
+    queued for full-text search under index_name.
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES, backup_count=DEFAULT_BACKUPS, index=None, index_name=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.index = index
+        self.index_name = index_name
+        self._file = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def write_lines(self, stream, lines):
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        data = ''.join(f"[{timestamp}] [{stream}] {line}\n" for line in lines)
+        data = data.encode('utf-8', 'replace')
+
+        with self._lock:
+            if self._file is None:
+                self._open()
+            if self.max_bytes and self._size and self._size + len(data) > self.max_bytes:
+                self._rotate()
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data)
+        if self.index is not None:
+            self.index.add(self.index_name, stream, lines)
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, 'ab')
+        self._size = self._file.tell()
+
+    def _rotate(self):
+        self._file.close()
+        for i in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class OutputStream:
+    """One child pipe: reads what is available and dispatches whole lines."""
+
+    def __init__(self, fileobj, name, on_lines, log_file=None):
+        self.fileobj = fileobj
+        self.fd = fileobj.fileno()
+        self.name = name
+        self.on_lines = on_lines
+        self.log_file = log_file
+        self.splitter = LineSplitter()
+        self.closed = False
+
+    def read(self):
+        """Reads once; returns False when the pipe reached EOF."""
+        try:
+            data = os.read(self.fd, READ_CHUNK)
+        except (BlockingIOError, InterruptedError):
+            return True
+        except OSError:
+            data = b''
+
+        if not data:
+            self.close()
+            return False
+
+        self.dispatch(self.splitter.feed(data))
+        return True
+
+    def dispatch(self, lines):
+        if not lines:
+            return
+        if self.log_file:
+            try:
+                self.log_file.write_lines(self.name, lines)
+            except OSError:
+                pass
+        try:
+            self.on_lines(self.name, lines)
+        except Exception:
+            pass
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.dispatch(self.splitter.flush())
+        try:
+            self.fileobj.close()
+        except OSError:
+            pass
+
+
+class OutputPump(threading.Thread):
+    """Drains the pipes of all children from a single selector thread.
+
+    Windows pipes cannot be used with select(), so there every stream gets a
+    blocking reader thread instead.
+    """
+
+    def __init__(self):
+        super().__init__(name='mng-output-pump', daemon=True)
+        self.use_selector = os.name != 'nt'
+        self._pending = deque()
+        if self.use_selector:
+            self._selector = selectors.DefaultSelector()
+            self._wake_r, self._wake_w = os.pipe()
+            os.set_blocking(self._wake_r, False)
+            os.set_blocking(self._wake_w, False)
+            self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+
+    def attach(self, process, on_lines, log_file=None):
+        streams = []
+        for name in ('stdout', 'stderr'):
+            fileobj = getattr(process, name)
+            if fileobj is not None:
+                streams.append(OutputStream(fileobj, name, on_lines, log_file))
+
+        for stream in streams:
+            if self.use_selector:
+                os.set_blocking(stream.fd, False)
+                self._pending.append(stream)
+            else:
+                threading.Thread(target=self._drain_blocking, args=(stream,), daemon=True).start()
+
+        if self.use_selector and streams:
+            try:
+                os.write(self._wake_w, b'\0')
+            except BlockingIOError:
+                pass
+        return streams
+
+    def run(self):
+        while True:
+            for key, _ in self._selector.select():
+                stream = key.data
+                if stream is None:
+                    self._register_pending()
+                elif not stream.read():
+                    self._selector.unregister(key.fd)
+
+    def _register_pending(self):
+        try:
+            while os.read(self._wake_r, 1024):
+                pass
+        except BlockingIOError:
+            pass
+        while self._pending:
+            stream = self._pending.popleft()
+            self._selector.register(stream.fd, selectors.EVENT_READ, stream)
+
+    def _drain_blocking(self, stream):
+        while stream.read():
+            pass
+
+
+_pump = None
+_pump_lock = threading.Lock()
+
+
+def default_pump():
+    global _pump
+    with _pump_lock:
+        if _pump is None:
+            _pump = OutputPump()
+            if _pump.use_selector:
+                _pump.start()
+        return _pump
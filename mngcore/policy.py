@@ -0,0 +1,86 @@
+"""Restart policy: exponential backoff, stable-uptime reset, crash loops.
+
+The first crash after a stable run restarts immediately. Each further crash
+without a stable run waits backoff_initial * backoff_factor ** n (with
+jitter, capped at backoff_max). A run longer than stable_uptime resets the
+count, so a script that crashes once a day is never abandoned. If
+crash_loop_count exits happen within crash_loop_window seconds the script is
+in a crash loop and waits crash_loop_pause before the next attempt.
+
+max_restarts caps the consecutive restarts: 0 means a crash is never
+restarted (as it always has), a negative value means no limit.
+"""
+
+import random
+import time
+from collections import deque
+
+DEFAULT_POLICY = {
+    'max_restarts': 5,
+    'backoff_initial': 1.0,
+    'backoff_max': 300.0,
+    'backoff_factor': 2.0,
+    'backoff_jitter': 0.1,
+    'stable_uptime': 300,
+    'crash_loop_count': 5,
+    'crash_loop_window': 60,
+    'crash_loop_pause': 600,
+}
+
+
+class RestartDecision:
+    __slots__ = ('restart', 'delay', 'attempt', 'crash_loop')
+
+    def __init__(self, restart, delay=0.0, attempt=0, crash_loop=False):
+        self.restart = restart
+        self.delay = delay
+        self.attempt = attempt
+        self.crash_loop = crash_loop
+
+
+class RestartPolicy:
+    def __init__(self, **settings):
+        for key, default in DEFAULT_POLICY.items():
+            setattr(self, key, settings.get(key, default))
+        # Consecutive restarts since the last stable run
+        self.failures = 0
+        self.started_at = None
+        self.exits = deque()
+
+    @classmethod
+    def from_script_info(cls, script_info):
+        return cls(**{key: script_info[key] for key in DEFAULT_POLICY if key in script_info})
+
+    def record_start(self, now=None):
+        self.started_at = time.monotonic() if now is None else now
+
+    def on_exit(self, now=None):
+        now = time.monotonic() if now is None else now
+        if self.started_at is not None and now - self.started_at >= self.stable_uptime:
+            self.failures = 0
+        self.started_at = None
+
+        self.exits.append(now)
+        while self.exits and now - self.exits[0] > self.crash_loop_window:
+            self.exits.popleft()
+
+        if self.max_restarts >= 0 and self.failures >= self.max_restarts:
+            return RestartDecision(False, attempt=self.failures)
+
+        if self.failures == 0:
+            delay = 0.0
+        else:
+            delay = min(self.backoff_max, self.backoff_initial * self.backoff_factor ** (self.failures - 1))
+            delay *= 1 + random.uniform(-self.backoff_jitter, self.backoff_jitter)
+
+        crash_loop = len(self.exits) >= self.crash_loop_count
+        if crash_loop:
+            delay = max(delay, self.crash_loop_pause)
+            self.exits.clear()
+
+        self.failures += 1
+        return RestartDecision(True, delay, self.failures, crash_loop)
+
+    def reset(self):
+        self.failures = 0
+        self.exits.clear()
@@ -0,0 +1,392 @@
+"""Replica pools: several instances of one script.
+
+A script with "replicas" above 1, or with autoscaling on, runs as a
+ReplicaPool of ScriptMonitors named "<name>#1" ... "<name>#N". Each replica
+restarts, is sampled and is probed on its own. The pool rolls their stats up
+under the script's name and writes their output to the script's log file
+with the stream tagged by replica ("stdout#2"). With pin_replicas (off by
+default), each replica is pinned to the allowed core with the fewest pinned
+scripts of the whole supervisor, so pools do not all pile up on core 0.
+With a listen address, all replicas accept on one shared socket.
+
+Autoscaling adds a replica when the average CPU per replica (percent of one
+core) stayed above scale_up_cpu for scale_cooldown seconds, and removes one
+when it stayed below scale_down_cpu, within replicas_min..replicas_max.
+"""
+
+import os
+import time
+from collections import deque
+from datetime import datetime
+
+from .monitor import ScriptMonitor, format_uptime
+from .output import RotatingLogFile, script_log_path
+from .sampler import TREE_FIELDS
+from .signals import MonitorSignals
+from .store import script_config
+from .supervisor import default_supervisor, listen_socket
+
+DEFAULT_POOL = {
+    'replicas': 1,
+    'autoscale': False,
+    'replicas_min': 1,
+    'replicas_max': 4,
+    'scale_up_cpu': 80,
+    'scale_down_cpu': 20,
+    'scale_cooldown': 60,
+    'pin_replicas': False,
+}
+
+SUMMED_FIELDS = TREE_FIELDS + ('processes',)
+
+
+def uses_pool(script_info):
+    return script_info.get('replicas', 1) > 1 or bool(script_info.get('autoscale'))
+
+
+def allowed_cores():
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+class _ReplicaLog:
+    """The pool's log file as seen by one replica; the pool closes it."""
+
+    __slots__ = ('log_file', 'index')
+
+    def __init__(self, log_file, index):
+        self.log_file = log_file
+        self.index = index
+
+    def write_lines(self, stream, lines):
+        self.log_file.write_lines(f"{stream}#{self.index}", lines)
+
+    def close(self):
+        pass
+
+
+class ReplicaPool:
+    def __init__(self, script_info, supervisor=None, notifier=None):
+        self.script_info = script_info
+        self.script_name = script_info['name']
+        settings = {key: script_info.get(key, default) for key, default in DEFAULT_POOL.items()}
+        self.autoscale = bool(settings['autoscale'])
+        self.replicas_min = max(1, int(settings['replicas_min']))
+        self.replicas_max = max(self.replicas_min, int(settings['replicas_max']))
+        self.target = max(1, int(settings['replicas']))
+        if self.autoscale:
+            self.target = min(max(self.target, self.replicas_min), self.replicas_max)
+        self.scale_up_cpu = settings['scale_up_cpu']
+        self.scale_down_cpu = settings['scale_down_cpu']
+        self.scale_cooldown = settings['scale_cooldown']
+        self.pin_replicas = bool(settings['pin_replicas'])
+        self.listen = script_info.get('listen', '')
+        self.listen_socket = None
+
+        self.supervisor = supervisor or default_supervisor()
+        self.log_file = RotatingLogFile(
+            script_log_path(script_info),
+            script_info.get('log_max_bytes', 10 * 1024 * 1024),
+            script_info.get('log_backups', 5),
+            self.supervisor.log_index,
+            self.script_name
+        )
+        self.notifier = notifier
+        self.signals = MonitorSignals()
+        self.replicas = {}        # index -> ScriptMonitor
+        self.replica_stats = {}   # index -> last stats
+        self.replica_status = {}  # index -> last status
+        self.status = None
+        self.active = False
+        self.stopping = False
+        self.start_time = None
+        self.last_exit_code = None
+        self.probes = []
+        self.last_stats = {'cpu': 0.0, 'memory': 0.0, 'restarts': 0, 'uptime': '00:00:00'}
+        self.rollup_pending = False
+        # (monotonic time, average CPU per replica) since the last scaling
+        self.cpu_window = deque()
+        self.last_scale = 0.0
+
+    # The parts of the ScriptMonitor interface the front ends use
+
+    @property
+    def process(self):
+        for replica in self.replicas.values():
+            if replica.is_running():
+                return replica.process
+        return None
+
+    @property
+    def ready(self):
+        return any(replica.is_running() and replica.ready for replica in self.replicas.values())
+
+    @property
+    def restart_count(self):
+        return self.script_info.get('restarts', 0)
+
+    def is_alive(self):
+        return self.active
+
+    def is_running(self):
+        return any(replica.is_running() for replica in self.replicas.values())
+
+    def start(self, after=None):
+        """Starts monitoring; with `after` (a future), once it has completed."""
+        self.active = True
+        self.stopping = False
+        if after is None:
+            self.supervisor.call_soon(self.run)
+        else:
+            after.add_done_callback(lambda _: self.supervisor.call_soon(self.run))
+
+    def run(self):
+        self.start_time = datetime.now()
+        self.last_scale = time.monotonic()
+        state = self.supervisor.state
+        left_running = state.claimable(f"{self.script_name}#") if state is not None else []
+        if left_running and self.listen and self.listen_socket is None:
+            self.supervisor.loop.create_task(self.replace_left_running(left_running))
+            return
+        if left_running:
+            # Replicas of an autoscaled pool the previous supervisor left running
+            indices = [int(name.rpartition('#')[2]) for name in left_running if name.rpartition('#')[2].isdigit()]
+            self.target = max([self.target] + indices)
+            self.start_time = datetime.fromtimestamp(min(state.orphans[name]['started'] for name in left_running))
+        if self.listen and self.listen_socket is None:
+            try:
+                self.listen_socket = listen_socket(self.listen)
+            except (OSError, ValueError) as e:
+                self.log(f"❌ Cannot listen on {self.listen}: {e}")
+                self.signals.status_signal.emit(self.script_name, "error")
+                self.active = False
+                return
+        self.log(f"🧩 Starting {self.target} replica(s) of {self.script_name}")
+        for index in range(1, self.target + 1):
+            self.add_replica(index)
+
+    async def replace_left_running(self, names):
+        """Stops replicas a previous supervisor left running, then starts the pool.
+
+        They hold that supervisor's listening socket, which cannot be shared
+        with new replicas, so they are replaced instead of adopted.
+        """
+        entries = [self.supervisor.state.claim(name) for name in names]
+        processes = [self.supervisor.adopt(entry, None) for entry in entries if entry is not None]
+        processes = [process for process in processes if process is not None]
+        self.log(f"♻️ Replacing {len(processes)} replica(s) of {self.script_name} left running")
+        await self.supervisor.terminate_many(processes, timeout=5)
+        if self.active and not self.stopping:
+            self.run()
+
+    def log(self, message):
+        self.signals.log_signal.emit(self.script_name, message)
+        try:
+            self.log_file.write_lines('mngserver', [message])
+        except OSError:
+            pass
+
+    # Replicas
+
+    def add_replica(self, index):
+        replica_info = script_config(self.script_info)
+        replica_info.update(name=f"{self.script_name}#{index}", restarts=0)
+        if self.pin_replicas:
+            replica_info['cpu_affinity'] = [self.free_core()]
+        replica = ScriptMonitor(replica_info, self.supervisor, self.notifier)
+        replica.log_file = _ReplicaLog(self.log_file, index)
+        if self.listen_socket is not None:
+            # Each replica closes its own descriptor; the pool keeps the socket
+            replica.listen_socket = self.listen_socket.dup()
+
+        signals = replica.signals
+        signals.log_signal.connect(lambda _, message: self.signals.log_signal.emit(self.script_name, message))
+        signals.output_signal.connect(
+            lambda _, stream, lines: self.signals.output_signal.emit(self.script_name, f"{stream}#{index}", lines))
+        signals.status_signal.connect(lambda _, status: self.on_replica_status(index, status))
+        signals.stats_signal.connect(lambda _, stats: self.on_replica_stats(index, stats))
+        signals.restart_signal.connect(self.on_replica_restart)
+
+        self.replicas[index] = replica
+        replica.start()
+        return replica
+
+    def free_core(self):
+        """The allowed core the fewest monitors of this supervisor are pinned to."""
+        cores = allowed_cores()
+        pinned = dict.fromkeys(cores, 0)
+        for monitor in list(self.supervisor.monitors.values()):
+            limits = getattr(monitor, 'limits', None)
+            if limits is not None and monitor.is_alive():
+                for core in limits.cpu_affinity:
+                    if core in pinned:
+                        pinned[core] += 1
+        return min(cores, key=pinned.get)
+
+    def remove_replica(self, index):
+        replica = self.replicas.pop(index)
+        self.replica_stats.pop(index, None)
+        self.replica_status.pop(index, None)
+
+        def forget(_):
+            if self.supervisor.monitors.get(replica.script_name) is replica:
+                del self.supervisor.monitors[replica.script_name]
+        replica.stop().add_done_callback(forget)
+
+    def on_replica_restart(self, _):
+        self.script_info['restarts'] = self.restart_count + 1
+        self.signals.restart_signal.emit(self.script_name)
+
+    def on_replica_status(self, index, status):
+        if index not in self.replicas or self.stopping:
+            return
+        self.replica_status[index] = status
+        statuses = [self.replica_status.get(i) for i in self.replicas]
+        if not any(replica.is_alive() for replica in self.replicas.values()):
+            # Every replica gave up, like a single script past its restart limit
+            self.log(f"⛔ All replicas of {self.script_name} stopped")
+            self.set_status("error")
+            self.supervisor.loop.create_task(self.shutdown())
+            return
+        for state in ('running', 'waiting', 'error'):
+            if state in statuses:
+                self.set_status(state)
+                return
+
+    def set_status(self, status):
+        if status != self.status:
+            self.status = status
+            self.signals.status_signal.emit(self.script_name, status)
+
+    def on_replica_stats(self, index, stats):
+        if index not in self.replicas:
+            return
+        self.replica_stats[index] = stats
+        # A sampler tick reports all replicas in a row; roll them up once
+        if not self.rollup_pending:
+            self.rollup_pending = True
+            self.supervisor.loop.call_soon(self.rollup)
+
+    def rollup(self):
+        self.rollup_pending = False
+        if self.stopping:
+            return
+        running = [index for index, replica in self.replicas.items() if replica.is_running()]
+        stats = {'cpu': 0.0, 'memory': 0.0, 'restarts': self.restart_count, 'uptime': '00:00:00'}
+        for index in running:
+            sample = self.replica_stats.get(index, {})
+            for field in SUMMED_FIELDS:
+                if field in sample:
+                    stats[field] = stats.get(field, 0) + sample[field]
+        stats['cpu'] = round(stats['cpu'], 1)
+        stats['memory'] = round(stats['memory'], 1)
+        if self.start_time:
+            stats['uptime'] = format_uptime((datetime.now() - self.start_time).total_seconds())
+        stats['replicas'] = len(running)
+        stats['replica_stats'] = {
+            index: {
+                'status': self.replica_status.get(index, 'starting'),
+                'cpu': self.replica_stats.get(index, {}).get('cpu', 0.0),
+                'memory': self.replica_stats.get(index, {}).get('memory', 0.0),
+                'uptime': self.replica_stats.get(index, {}).get('uptime', '00:00:00'),
+                'restarts': replica.restart_count,
+                'core': replica.limits.cpu_affinity[0] if replica.limits.cpu_affinity else None,
+            }
+            for index, replica in sorted(self.replicas.items())
+        }
+
+        # Pool-wide history next to the per-replica series the sampler keeps
+        self.supervisor.metrics.record(self.script_name, time.time(), stats['cpu'], stats['memory'])
+        self.last_stats = stats
+        self.signals.stats_signal.emit(self.script_name, stats)
+        if self.autoscale and running:
+            self.check_scaling(stats['cpu'] / len(running))
+
+    # Autoscaling
+
+    def check_scaling(self, cpu_per_replica):
+        now = time.monotonic()
+        self.cpu_window.append((now, cpu_per_replica))
+        while self.cpu_window[0][0] < now - self.scale_cooldown:
+            self.cpu_window.popleft()
+        if now - self.last_scale < self.scale_cooldown:
+            return
+        average = sum(cpu for _, cpu in self.cpu_window) / len(self.cpu_window)
+        count = len(self.replicas)
+        if average > self.scale_up_cpu and count < self.replicas_max:
+            self.scale(count + 1, f"📈 Scaling {self.script_name} up to {count + 1} replicas "
+                                  f"(average CPU {average:.0f}% per replica)")
+        elif average < self.scale_down_cpu and count > self.replicas_min:
+            self.scale(count - 1, f"📉 Scaling {self.script_name} down to {count - 1} replicas "
+                                  f"(average CPU {average:.0f}% per replica)")
+
+    def scale(self, count, message):
+        self.log(message)
+        self.last_scale = time.monotonic()
+        self.cpu_window.clear()
+        while len(self.replicas) < count:
+            self.add_replica(max(self.replicas, default=0) + 1)
+        while len(self.replicas) > count:
+            self.remove_replica(max(self.replicas))
+
+    # Restart and shutdown
+
+    async def restart(self):
+        """Rolling restart: one replica at a time, so the others keep serving."""
+        if self.stopping:
+            return
+        self.log(f"🔄 Rolling restart of {self.script_name}")
+        for index in sorted(self.replicas):
+            replica = self.replicas.get(index)
+            if replica is not None and not self.stopping:
+                await replica.restart()
+
+    def stop(self):
+        """Begins shutdown without waiting for it; returns its future."""
+        if self.supervisor.in_loop():
+            return self.supervisor.loop.create_task(self.shutdown())
+        return self.supervisor.submit(self.shutdown())
+
+    async def shutdown(self, timeout=3):
+        if not self.begin_shutdown():
+            return
+        await self.supervisor.terminate_many(self.processes(), timeout)
+        self.finish_shutdown()
+
+    def processes(self):
+        return [process for replica in self.replicas.values() for process in replica.processes()]
+
+    def begin_shutdown(self):
+        if self.stopping:
+            return False
+        self.stopping = True
+        for replica in self.replicas.values():
+            replica.begin_shutdown()
+        return True
+
+    def detach(self):
+        """Stops supervising but leaves the replicas running for the next supervisor."""
+        if self.stopping:
+            return
+        self.stopping = True
+        for replica in self.replicas.values():
+            replica.detach()
+        self.active = False
+        self.log_file.close()
+        if self.listen_socket is not None:
+            self.listen_socket.close()
+            self.listen_socket = None
+
+    def finish_shutdown(self):
+        for replica in self.replicas.values():
+            if replica.active:
+                replica.finish_shutdown()
+        self.active = False
+        self.log(f"🛑 Stopped monitoring: {self.script_name}")
+        self.status = "stopped"
+        self.signals.status_signal.emit(self.script_name, "stopped")
+        self.log_file.close()
+        if self.listen_socket is not None:
+            self.listen_socket.close()
+            self.listen_socket = None
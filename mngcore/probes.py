@@ -0,0 +1,233 @@
+"""Liveness and readiness probes.
+
+Each script may list probes in its "probes" setting, for example:
+
+    {"type": "tcp", "port": 8080}
+    {"type": "http", "port": 8080, "path": "/health", "kind": "readiness"}
+    {"type": "heartbeat", "path": "/tmp/bot.heartbeat", "max_age": 30}
+    {"type": "output", "max_silence": 120}
+
+Common keys: "kind" ("liveness", the default, or "readiness"), "interval"
+and "timeout" in seconds, "failure_threshold" (consecutive failures before
+acting) and "initial_delay" (grace period after each start). A liveness
+probe that reaches its threshold makes the monitor restart the script; a
+readiness probe only marks it ready or not ready.
+
+All probes run on the supervisor loop from one ProbeScheduler: due probes
+are started as concurrent tasks, each bounded by its own timeout, so a hung
+port never delays the other checks.
+"""
+
+import asyncio
+import os
+import time
+
+
+class Probe:
+    kind = 'liveness'
+    failure_threshold = 3
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.kind = spec.get('kind', self.kind)
+        if self.kind not in ('liveness', 'readiness'):
+            raise ValueError(f"unknown probe kind '{self.kind}'")
+        self.interval = float(spec.get('interval', 10))
+        self.timeout = float(spec.get('timeout', 5))
+        self.failure_threshold = int(spec.get('failure_threshold', self.failure_threshold))
+        self.initial_delay = float(spec.get('initial_delay', 0))
+        self.reset()
+
+    def reset(self, now=None):
+        now = time.monotonic() if now is None else now
+        self.due = now + self.initial_delay
+        self.failures = 0
+        self.ready = False
+        self.task = None
+
+    def record(self, ok):
+        """Updates the counters; returns 'failed', 'ready', 'unready' or None."""
+        if ok:
+            self.failures = 0
+            if self.kind == 'readiness' and not self.ready:
+                self.ready = True
+                return 'ready'
+            return None
+        self.failures += 1
+        if self.failures != self.failure_threshold:
+            return None
+        if self.kind == 'readiness':
+            was_ready, self.ready = self.ready, False
+            return 'unready' if was_ready else None
+        return 'failed'
+
+    async def check(self):
+        """(ok, detail) of one attempt."""
+        raise NotImplementedError
+
+
+class TcpProbe(Probe):
+    def __init__(self, spec):
+        super().__init__(spec)
+        self.host = spec.get('host', '127.0.0.1')
+        self.port = int(spec['port'])
+
+    def __str__(self):
+        return f"TCP {self.host}:{self.port}"
+
+    async def check(self):
+        _, writer = await asyncio.open_connection(self.host, self.port)
+        writer.close()
+        return True, 'connected'
+
+
+class HttpProbe(TcpProbe):
+    def __init__(self, spec):
+        super().__init__(spec)
+        self.path = spec.get('path', '/')
+        self.expect_status = spec.get('expect_status')
+
+    def __str__(self):
+        return f"HTTP {self.host}:{self.port}{self.path}"
+
+    async def check(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(f"GET {self.path} HTTP/1.0\r\nHost: {self.host}\r\n"
+                         f"Connection: close\r\n\r\n".encode('ascii'))
+            await writer.drain()
+            status_line = await reader.readline()
+        finally:
+            writer.close()
+        parts = status_line.split()
+        if len(parts) < 2 or not parts[1].isdigit():
+            return False, 'invalid HTTP response'
+        status = int(parts[1])
+        if self.expect_status is not None:
+            return status == int(self.expect_status), f"HTTP {status}"
+        return 200 <= status < 400, f"HTTP {status}"
+
+
+class HeartbeatProbe(Probe):
+    """The script touches a file; it is healthy while the file is fresh."""
+
+    failure_threshold = 1
+
+    def __init__(self, spec):
+        super().__init__(spec)
+        self.path = spec['path']
+        self.max_age = float(spec.get('max_age', 60))
+
+    def __str__(self):
+        return f"heartbeat {self.path}"
+
+    async def check(self):
+        age = time.time() - os.stat(self.path).st_mtime
+        return age <= self.max_age, f"last beat {age:.0f}s ago"
+
+
+class OutputProbe(Probe):
+    """Watchdog on the script's stdout/stderr: fails after max_silence."""
+
+    failure_threshold = 1
+
+    def __init__(self, spec, last_output):
+        super().__init__(spec)
+        self.max_silence = float(spec.get('max_silence', 300))
+        self.last_output = last_output
+
+    def __str__(self):
+        return "output watchdog"
+
+    async def check(self):
+        silence = time.monotonic() - self.last_output()
+        return silence <= self.max_silence, f"no output for {silence:.0f}s"
+
+
+PROBE_TYPES = {
+    'tcp': TcpProbe,
+    'http': HttpProbe,
+    'heartbeat': HeartbeatProbe,
+}
+
+
+def build_probe(spec, last_output):
+    """Probe for one settings entry; raises ValueError for a bad entry."""
+    probe_type = spec.get('type')
+    try:
+        if probe_type == 'output':
+            return OutputProbe(spec, last_output)
+        if probe_type not in PROBE_TYPES:
+            raise ValueError(f"unknown probe type '{probe_type}'")
+        return PROBE_TYPES[probe_type](spec)
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"invalid {probe_type} probe: {e}") from None
+
+
+class _ProbeSet:
+    __slots__ = ('probes', 'callback')
+
+    def __init__(self, probes, callback):
+        self.probes = probes
+        self.callback = callback
+
+
+class ProbeScheduler:
+    def __init__(self, supervisor, resolution=0.5):
+        self.supervisor = supervisor
+        self.resolution = resolution
+        self.watches = {}
+        self._timer = None
+
+    def watch(self, key, probes, callback):
+        """Runs probes for key; callback(probe, event, detail) on state changes."""
+        self.unwatch(key)
+        if not probes:
+            return
+        now = time.monotonic()
+        for probe in probes:
+            probe.reset(now)
+        self.watches[key] = _ProbeSet(probes, callback)
+        if self._timer is None:
+            self._timer = self.supervisor.call_later(self.resolution, self.tick)
+
+    def unwatch(self, key):
+        watch = self.watches.pop(key, None)
+        if watch is not None:
+            for probe in watch.probes:
+                if probe.task is not None:
+                    probe.task.cancel()
+                    probe.task = None
+
+    def tick(self):
+        self._timer = None
+        now = time.monotonic()
+        for key, watch in self.watches.items():
+            for probe in watch.probes:
+                if probe.task is None and probe.due <= now:
+                    probe.due = now + probe.interval
+                    probe.task = self.supervisor.loop.create_task(self._run(watch, probe))
+        if self.watches:
+            self._timer = self.supervisor.call_later(self.resolution, self.tick)
+
+    async def _run(self, watch, probe):
+        try:
+            ok, detail = await asyncio.wait_for(probe.check(), probe.timeout)
+        except asyncio.TimeoutError:
+            ok, detail = False, f"timed out after {probe.timeout:g}s"
+        except OSError as e:
+            ok, detail = False, e.strerror or str(e)
+        except Exception as e:
+            # A failing check is a failed probe, not the end of probing
+            ok, detail = False, f"{type(e).__name__}: {e}"
+        finally:
+            # unwatch() may already have replaced it
+            if probe.task is asyncio.current_task():
+                probe.task = None
+
+        event = probe.record(ok)
+        if event is not None:
+            try:
+                watch.callback(probe, event, detail)
+            except Exception:
+                pass
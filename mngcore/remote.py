@@ -0,0 +1,270 @@
+"""Front-end side of a supervisor running in its own process.
+
+RemoteFleet offers the part of the Fleet interface a front end uses (add,
+remove, start, stopped, configure and the script signals) on top of the
+control socket. Stats and statuses are read from the shared-memory channel
+with poll(), once per frame. Log and output lines arrive on a subscription
+and go straight into the UpdateBus. Nothing the front end does, or fails
+to do, can delay supervision, and closing it leaves the scripts running.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from .control import request, socket_alive
+from .monitor import format_uptime
+from .shm import StatsReader
+from .signals import MonitorSignals, Signal
+from .store import atomic_write_json, script_config
+
+SPAWN_TIMEOUT = 10
+RECONNECT_DELAY = 1.0
+
+
+class RemoteError(Exception):
+    pass
+
+
+class RemoteMonitor:
+    """Stand-in for the monitor that runs in the supervisor process."""
+
+    def __init__(self, fleet, name):
+        self.fleet = fleet
+        self.script_name = name
+        self.signals = MonitorSignals()
+
+    @property
+    def start_time(self):
+        return self.fleet.start_times.get(self.script_name)
+
+    def is_alive(self):
+        return self.fleet.states.get(self.script_name, 'stopped') != 'stopped'
+
+    def is_running(self):
+        return self.fleet.states.get(self.script_name) == 'running'
+
+    def stop(self):
+        self.fleet.states[self.script_name] = 'stopped'
+        return self.fleet.submit({'op': 'stop', 'names': [self.script_name]})
+
+
+class RemoteFleet:
+    def __init__(self, socket_path, store, bus, owner):
+        self.socket_path = socket_path
+        self.store = store
+        self.bus = bus
+        # owner(fn) runs fn in the front end's thread
+        self.owner = owner
+        self.monitor_created = Signal()
+        self.script_added = Signal()
+        self.script_removed = Signal()
+        self.states = {}
+        self.start_times = {}
+        self.reader = None
+        self.closed = False
+        self.events_socket = None
+        # One worker keeps requests in the order they were made
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mng-remote')
+
+        hello = self.request({'op': 'hello'})
+        if not hello.get('channel'):
+            raise RemoteError("the supervisor has no stats channel")
+        self.reader = StatsReader(hello['channel'])
+        self.pid = hello['pid']
+        self.store.settings = hello['settings']
+        self.store.scripts.clear()
+        for script in self.request({'op': 'scripts'}):
+            self.store.scripts[script['name']] = script
+        self.follower = threading.Thread(target=self.follow, name='mng-remote-events', daemon=True)
+        self.follower.start()
+
+    # Requests
+
+    def request(self, message):
+        response = request(message, self.socket_path)
+        if not response.get('ok'):
+            raise RemoteError(response.get('error', 'request failed'))
+        return response['results']
+
+    def submit(self, message):
+        """Sends a request from the worker thread; returns its future."""
+        return self.executor.submit(self.request, message)
+
+    # The Fleet interface
+
+    def monitor(self, name):
+        monitor = self.store.scripts[name].get('monitor')
+        return monitor if monitor is not None and monitor.is_alive() else None
+
+    def add(self, path, name=None, tags=None):
+        result = self.request({'op': 'add', 'paths': [path], 'name': name, 'tags': tags})[0]
+        if not result['ok']:
+            raise ValueError(result['error'])
+        self.on_added(result['script'])
+        return self.store.scripts[result['name']]
+
+    def remove(self, name):
+        self.submit({'op': 'remove', 'names': [name]})
+        self.on_removed(name)
+
+    def start(self, name, after=None):
+        monitor = RemoteMonitor(self, name)
+        self.monitor_created.emit(monitor)
+        self.store.scripts[name]['monitor'] = monitor
+        self.states[name] = 'starting'
+        message = {'op': 'start', 'names': [name]}
+        if after is None:
+            self.submit(message)
+        else:
+            after.add_done_callback(lambda _: self.submit(message))
+        return monitor
+
+    def stopped(self, name):
+        # The supervisor records it when it stops the script
+        pass
+
+    def configure(self, name, settings=None):
+        settings = settings or script_config(self.store.scripts[name])
+        self.submit({'op': 'configure', 'name': name, 'settings': settings})
+
+    def on_added(self, script):
+        if script['name'] not in self.store.scripts:
+            self.store.scripts[script['name']] = script
+            self.script_added.emit(script['name'])
+
+    def on_removed(self, name):
+        if self.store.scripts.pop(name, None) is not None:
+            self.states.pop(name, None)
+            self.script_removed.emit(name)
+
+    # Stats and events
+
+    def poll(self):
+        """({name: [stats, ...]}, {name: status}) published since the last poll."""
+        if self.closed or self.reader is None:
+            return {}, {}
+        samples, statuses = self.reader.poll()
+        for name, status in statuses.items():
+            self.states[name] = status
+            script_info = self.store.scripts.get(name)
+            # Scripts started by someone else (CLI, another front end)
+            if script_info is not None and status != 'stopped' and script_info.get('monitor') is None:
+                monitor = RemoteMonitor(self, name)
+                self.monitor_created.emit(monitor)
+                script_info['monitor'] = monitor
+        for name, rows in samples.items():
+            if self.states.get(name) == 'running':
+                self.start_times[name] = datetime.now() - timedelta(seconds=rows[-1]['uptime'])
+            for stats in rows:
+                stats['uptime'] = format_uptime(stats['uptime'])
+        return samples, statuses
+
+    def follow(self):
+        """Reads the event subscription, reconnecting if the supervisor restarts."""
+        reconnecting = False
+        while not self.closed:
+            try:
+                if reconnecting:
+                    # Possibly a new supervisor process with its own stats channel
+                    self.reattach()
+                    reconnecting = False
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as events_socket:
+                    events_socket.connect(self.socket_path)
+                    self.events_socket = events_socket
+                    events_socket.sendall(b'{"op": "subscribe"}\n')
+                    with events_socket.makefile('rb') as events:
+                        events.readline()
+                        for line in events:
+                            self.dispatch(json.loads(line))
+            except (OSError, ValueError, RemoteError):
+                pass
+            self.events_socket = None
+            reconnecting = True
+            if not self.closed:
+                time.sleep(RECONNECT_DELAY)
+
+    def reattach(self):
+        """Reads hello and the scripts again and hands them to the front end's thread."""
+        hello = self.request({'op': 'hello'})
+        scripts = self.request({'op': 'scripts'})
+        reader = StatsReader(hello['channel']) if hello.get('channel') else None
+        self.owner(lambda: self.on_reattached(hello, scripts, reader))
+
+    def on_reattached(self, hello, scripts, reader):
+        # poll() runs in this thread, so the old reader is not in use
+        old_reader, self.reader = self.reader, reader
+        if old_reader is not None:
+            old_reader.close()
+        if self.closed:
+            if reader is not None:
+                reader.close()
+            self.reader = None
+            return
+        self.pid = hello['pid']
+        self.store.settings = hello['settings']
+        names = {script['name'] for script in scripts}
+        for name in [name for name in self.store.scripts if name not in names]:
+            self.on_removed(name)
+        for script in scripts:
+            self.on_added(script)
+
+    def dispatch(self, event):
+        kind = event.get('event')
+        if kind == 'log':
+            self.bus.log(event['name'], event['message'])
+        elif kind == 'output':
+            self.bus.output(event['name'], event['stream'], event['lines'])
+        elif kind == 'added':
+            self.owner(lambda: self.on_added(event['script']))
+        elif kind == 'removed':
+            self.owner(lambda: self.on_removed(event['name']))
+
+    def close(self):
+        """Detaches; the supervisor and its scripts keep running."""
+        self.closed = True
+        if self.events_socket is not None:
+            try:
+                self.events_socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self.executor.shutdown(wait=True)
+        if self.reader is not None:
+            self.reader.close()
+
+
+def spawn_supervisor(config_path, socket_path, timeout=SPAWN_TIMEOUT):
+    """Starts a detached daemon for config_path and waits for its control socket."""
+    log_path = os.path.join(os.path.dirname(os.path.abspath(config_path)), 'supervisor.log')
+    entry = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'MNGserver.py')
+    with open(log_path, 'ab') as log:
+        # Own session: the supervisor outlives the front end that started it
+        process = subprocess.Popen([sys.executable, entry, '--daemon', config_path],
+                                   stdin=subprocess.DEVNULL, stdout=log, stderr=log,
+                                   start_new_session=True)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RemoteError(f"the supervisor exited with code {process.returncode}, see {log_path}")
+        if os.path.exists(socket_path) and socket_alive(socket_path):
+            return process.pid
+        time.sleep(0.1)
+    raise RemoteError(f"the supervisor did not open {socket_path} within {timeout}s")
+
+
+def attach(config_path, socket_path, store, bus, owner, spawn=True):
+    """RemoteFleet for the supervisor at socket_path, starting one if needed."""
+    if not (os.path.exists(socket_path) and socket_alive(socket_path)):
+        if not spawn:
+            raise RemoteError(f"no supervisor is listening on {socket_path}")
+        if not os.path.exists(config_path):
+            # The daemon needs a file; an empty fleet is a valid start
+            atomic_write_json(config_path, {'scripts': []})
+        spawn_supervisor(config_path, socket_path)
+    return RemoteFleet(socket_path, store, bus, owner)
@@ -0,0 +1,229 @@
+"""Self-contained HTML statistics reports, for one script or a whole fleet.
+
+The document goes to the file while it is generated, one script at a time,
+so even a fleet report holds no more than one script's history in memory.
+Each chart covers the full retained history (hour, minute and raw levels
+stitched together, see Series.history) reduced to at most max_points points
+per line with LTTB. The charts are drawn by report_chart.js, which is
+embedded in the report, so it opens on hosts without internet access.
+
+CLI: python -m mngcore.report config.json report.html [--script NAME]
+"""
+
+import argparse
+import fnmatch
+import html
+import json
+import os
+import sys
+from datetime import datetime
+
+from .control import DEFAULT_CONTROL_SOCKET, request
+from .decimate import lttb
+from .monitor import format_uptime
+from .store import ConfigStore
+from .timeseries import MetricsStore
+
+MAX_POINTS = 1000
+CHART_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'report_chart.js')
+# Longest time a single history record stands for, when weighting averages
+MAX_RECORD_SECONDS = 3600
+
+STYLE = """
+body { font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5; color: #333; }
+.container { max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px;
+             box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+h1, h2, h3 { color: #2c3e50; }
+.header { text-align: center; margin-bottom: 30px; padding-bottom: 20px; border-bottom: 1px solid #eee; }
+.script { margin-top: 40px; padding-top: 10px; border-top: 1px solid #eee; }
+.stats-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(180px, 1fr)); gap: 20px; margin-bottom: 30px; }
+.stat-card { background: #f8f9fa; padding: 15px; border-radius: 6px; border-left: 4px solid #3498db; }
+.stat-card h3 { margin: 0 0 10px 0; font-size: 16px; }
+.stat-value { font-size: 22px; font-weight: bold; color: #2c3e50; }
+.chart-container { margin: 30px 0; height: 320px; position: relative; }
+table { width: 100%; border-collapse: collapse; margin: 20px 0; }
+th, td { padding: 10px; text-align: left; border-bottom: 1px solid #ddd; }
+th { background-color: #f2f2f2; }
+tr:hover { background-color: #f5f5f5; }
+.note { color: #888; font-size: 12px; }
+"""
+
+
+def weighted(history):
+    """(record, seconds it stands for) pairs; a record lasts until the next one."""
+    for i, row in enumerate(history):
+        if i + 1 < len(history):
+            seconds = history[i + 1][0] - row[0]
+        else:
+            seconds = row[0] - history[i - 1][0] if i else 1
+        yield row, min(max(seconds, 0), MAX_RECORD_SECONDS) or 1
+
+
+def summarize(rows):
+    """Average and peak CPU and memory of history records, time-weighted."""
+    total = cpu = memory = 0.0
+    cpu_peak = memory_peak = 0.0
+    for (_, cpu_avg, cpu_max, memory_avg, memory_max), seconds in weighted(rows):
+        total += seconds
+        cpu += cpu_avg * seconds
+        memory += memory_avg * seconds
+        cpu_peak = max(cpu_peak, cpu_max)
+        memory_peak = max(memory_peak, memory_max)
+    if not total:
+        return None
+    return {'cpu': cpu / total, 'cpu_max': cpu_peak, 'memory': memory / total, 'memory_max': memory_peak}
+
+
+def daily_summaries(history):
+    """(date, summary) per day of history, newest first."""
+    days = {}
+    for row in history:
+        days.setdefault(datetime.fromtimestamp(row[0]).date(), []).append(row)
+    return [(day, summarize(rows)) for day, rows in sorted(days.items(), reverse=True)]
+
+
+def chart_series(history, column, label, color, max_points, dashed=False):
+    points = lttb([(row[0], row[column]) for row in history], max_points)
+    return {'label': label, 'color': color, 'dashed': dashed,
+            't': [int(t) for t, _ in points], 'v': [round(v, 1) for _, v in points]}
+
+
+def format_number(value, suffix=''):
+    return f"{value:.1f}{suffix}" if isinstance(value, (int, float)) else '-'
+
+
+def script_summary(script_info):
+    """Report input from a GUI/fleet script_info: name, status and the last stats."""
+    return dict(script_info.get('stats') or {}, name=script_info['name'], status=script_info.get('status'))
+
+
+def write_report(path, scripts, metrics, title='MNGserver Statistics Report', max_points=MAX_POINTS):
+    """Writes the report for scripts to path.
+
+    scripts is a list of dicts with "name" and optionally the current
+    "status", "cpu", "memory", "restarts" and "uptime" (see script_summary);
+    their history comes from metrics (a MetricsStore).
+    """
+    with open(CHART_SCRIPT, encoding='utf-8') as f:
+        chart_script = f.read()
+    with open(path, 'w', encoding='utf-8') as out:
+        out.write('<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="UTF-8">\n'
+                  '<meta name="viewport" content="width=device-width, initial-scale=1.0">\n'
+                  f'<title>{html.escape(title)}</title>\n<style>{STYLE}</style>\n'
+                  f'<script>\n{chart_script}\n</script>\n</head>\n<body>\n<div class="container">\n'
+                  f'<div class="header">\n<h1>🤖 {html.escape(title)}</h1>\n')
+        if len(scripts) == 1:
+            out.write(f'<h2>Script: {html.escape(scripts[0]["name"])}</h2>\n')
+        out.write(f'<p>Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>\n</div>\n')
+        if len(scripts) > 1:
+            write_fleet_table(out, scripts, metrics)
+        for number, script in enumerate(scripts):
+            write_script(out, number, script, metrics.history(script['name']), max_points)
+        out.write('</div>\n</body>\n</html>\n')
+
+
+def write_fleet_table(out, scripts, metrics):
+    out.write('<h2>Fleet overview</h2>\n<table>\n<thead><tr><th>Script</th><th>Status</th><th>CPU (%)</th>'
+              '<th>Memory (MB)</th><th>Restarts</th><th>Uptime</th><th>Avg / peak CPU (%)</th>'
+              '<th>Avg / peak memory (MB)</th></tr></thead>\n<tbody>\n')
+    for number, script in enumerate(scripts):
+        summary = summarize(metrics.history(script['name'])) or {}
+        out.write(f'<tr><td><a href="#script-{number}">{html.escape(script["name"])}</a></td>'
+                  f'<td>{html.escape(str(script.get("status") or "-").capitalize())}</td>'
+                  f'<td>{format_number(script.get("cpu"))}</td><td>{format_number(script.get("memory"))}</td>'
+                  f'<td>{script.get("restarts", "-")}</td><td>{html.escape(str(script.get("uptime", "-")))}</td>'
+                  f'<td>{format_number(summary.get("cpu"))} / {format_number(summary.get("cpu_max"))}</td>'
+                  f'<td>{format_number(summary.get("memory"))} / {format_number(summary.get("memory_max"))}</td></tr>\n')
+    out.write('</tbody>\n</table>\n')
+
+
+def write_script(out, number, script, history, max_points):
+    name = html.escape(script['name'])
+    cards = [
+        ('Current Status', str(script.get('status') or '-').capitalize()),
+        ('CPU Usage', format_number(script.get('cpu'), '%')),
+        ('Memory Usage', format_number(script.get('memory'), ' MB')),
+        ('Restarts', script.get('restarts', '-')),
+        ('Uptime', script.get('uptime', '-')),
+    ]
+    if history:
+        cards.append(('History since', datetime.fromtimestamp(history[0][0]).strftime('%Y-%m-%d %H:%M')))
+    out.write(f'<div class="script" id="script-{number}">\n<h2>{name}</h2>\n<div class="stats-grid">\n')
+    for label, value in cards:
+        out.write(f'<div class="stat-card"><h3>{label}</h3><div class="stat-value">{html.escape(str(value))}</div></div>\n')
+    out.write('</div>\n')
+
+    # Rollups carry peaks; raw samples are their own peak
+    has_peaks = any(row[2] != row[1] for row in history)
+    charts = (
+        ('cpu', 'CPU Usage Over Time', '%', 100, 1, 2, '#3498db'),
+        ('memory', 'Memory Usage Over Time', 'MB', None, 3, 4, '#e74c3c'),
+    )
+    for key, chart_title, unit, maximum, average, peak, color in charts:
+        series = [chart_series(history, average, 'Average', color, max_points)]
+        if has_peaks:
+            series.append(chart_series(history, peak, 'Peak', '#7f8c8d', max_points, dashed=True))
+        chart_id = f"{key}-{number}"
+        out.write(f'<div class="chart-container"><canvas id="{chart_id}"></canvas></div>\n<script>mngChart("{chart_id}", ')
+        json.dump({'title': chart_title, 'unit': unit, 'max': maximum, 'series': series}, out, separators=(',', ':'))
+        out.write(');</script>\n')
+    if history:
+        shown = min(len(history), max_points)
+        out.write(f'<p class="note">{len(history)} history records, {shown} points per line.</p>\n')
+
+    out.write('<h3>Daily summary</h3>\n<table>\n<thead><tr><th>Date</th><th>Avg CPU (%)</th><th>Peak CPU (%)</th>'
+              '<th>Avg memory (MB)</th><th>Peak memory (MB)</th></tr></thead>\n<tbody>\n')
+    for day, summary in daily_summaries(history):
+        out.write(f'<tr><td>{day.isoformat()}</td><td>{summary["cpu"]:.1f}</td><td>{summary["cpu_max"]:.1f}</td>'
+                  f'<td>{summary["memory"]:.1f}</td><td>{summary["memory_max"]:.1f}</td></tr>\n')
+    out.write('</tbody>\n</table>\n</div>\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m mngcore.report', description='Write an HTML statistics report')
+    parser.add_argument('config', help='MNGserver config file (its settings.metrics_dir holds the history)')
+    parser.add_argument('output', help='HTML file to write')
+    parser.add_argument('--script', action='append', help='script name or glob (repeatable; all by default)')
+    parser.add_argument('--points', type=int, default=MAX_POINTS, help='maximum points per chart line')
+    args = parser.parse_args(argv)
+
+    store = ConfigStore(args.config)
+    try:
+        store.load(enabled_default=True)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Cannot load config {args.config}: {e}", file=sys.stderr)
+        return 1
+    settings = store.settings
+    if not settings.get('metrics_dir'):
+        print("❌ No settings.metrics_dir in the config: the history is only kept in memory", file=sys.stderr)
+        return 1
+
+    names = [name for name in store.scripts
+             if not args.script or any(fnmatch.fnmatchcase(name, pattern) for pattern in args.script)]
+    scripts = {name: {'name': name, 'restarts': store.scripts[name].get('restarts', 0)} for name in names}
+    # Current figures from the running supervisor, if there is one
+    try:
+        response = request({'op': 'status', 'names': names}, settings.get('control_socket') or DEFAULT_CONTROL_SOCKET,
+                           timeout=5)
+        for row in response.get('results', []):
+            row['uptime'] = format_uptime(row['uptime'])
+            scripts[row['name']].update(row)
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    # Read-only: the supervisor may be writing these files right now
+    metrics = MetricsStore(settings['metrics_dir'], readonly=True)
+    try:
+        title = 'MNGserver Fleet Report' if len(scripts) > 1 else 'MNGserver Statistics Report'
+        write_report(args.output, list(scripts.values()), metrics, title, args.points)
+    except OSError as e:
+        print(f"❌ Cannot write {args.output}: {e}", file=sys.stderr)
+        return 1
+    finally:
+        metrics.close()
+    print(f"Report for {len(scripts)} script(s) written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,225 @@
+/* Time-series line charts on <canvas> for MNGserver reports.
+ *
+ * Embedded in every report so it opens without network access.
+ * Usage: mngChart(canvasId, {unit: '%', max: 100, series: [
+ *     {label: 'CPU', color: '#3498db', t: [epoch seconds...], v: [values...], dashed: false}]})
+ */
+(function () {
+    'use strict';
+
+    var PAD = {left: 56, right: 16, top: 28, bottom: 34};
+    var TIME_STEPS = [10, 30, 60, 300, 600, 1800, 3600, 3 * 3600, 6 * 3600, 12 * 3600,
+                      86400, 2 * 86400, 7 * 86400, 14 * 86400, 30 * 86400];
+    var charts = [];
+
+    function niceStep(range, ticks) {
+        var raw = range / Math.max(ticks, 1);
+        var magnitude = Math.pow(10, Math.floor(Math.log(raw) / Math.LN10));
+        var steps = [1, 2, 2.5, 5, 10];
+        for (var i = 0; i < steps.length; i++) {
+            if (steps[i] * magnitude >= raw) {
+                return steps[i] * magnitude;
+            }
+        }
+        return 10 * magnitude;
+    }
+
+    function timeStep(span, ticks) {
+        for (var i = 0; i < TIME_STEPS.length; i++) {
+            if (TIME_STEPS[i] * ticks >= span) {
+                return TIME_STEPS[i];
+            }
+        }
+        return TIME_STEPS[TIME_STEPS.length - 1];
+    }
+
+    function pad2(n) {
+        return n < 10 ? '0' + n : '' + n;
+    }
+
+    function formatTime(t, span) {
+        var d = new Date(t * 1000);
+        var time = pad2(d.getHours()) + ':' + pad2(d.getMinutes());
+        var day = pad2(d.getMonth() + 1) + '-' + pad2(d.getDate());
+        if (span > 3 * 86400) {
+            return day;
+        }
+        if (span > 86400) {
+            return day + ' ' + time;
+        }
+        return span > 600 ? time : time + ':' + pad2(d.getSeconds());
+    }
+
+    function formatValue(v, unit) {
+        var rounded = Math.abs(v) >= 100 || v === Math.round(v);
+        return (rounded ? v.toFixed(0) : v.toFixed(1)) + (unit ? ' ' + unit : '');
+    }
+
+    // Index of the point nearest to t in a sorted array
+    function nearest(times, t) {
+        var lo = 0, hi = times.length - 1;
+        while (lo < hi) {
+            var mid = (lo + hi) >> 1;
+            if (times[mid] < t) {
+                lo = mid + 1;
+            } else {
+                hi = mid;
+            }
+        }
+        if (lo > 0 && Math.abs(times[lo - 1] - t) < Math.abs(times[lo] - t)) {
+            lo -= 1;
+        }
+        return lo;
+    }
+
+    function Chart(canvas, spec) {
+        this.canvas = canvas;
+        this.spec = spec;
+        this.series = (spec.series || []).filter(function (s) { return s.t.length > 0; });
+        var tMin = Infinity, tMax = -Infinity, vMax = 0;
+        this.series.forEach(function (s) {
+            tMin = Math.min(tMin, s.t[0]);
+            tMax = Math.max(tMax, s.t[s.t.length - 1]);
+            for (var i = 0; i < s.v.length; i++) {
+                vMax = Math.max(vMax, s.v[i]);
+            }
+        });
+        this.tMin = tMin;
+        this.tMax = tMax > tMin ? tMax : tMin + 1;
+        // Fixed scale (CPU %) unless the data goes beyond it
+        var top = spec.max && vMax <= spec.max ? spec.max : vMax * 1.1 || 1;
+        this.vStep = niceStep(top, 5);
+        this.vMax = Math.ceil(top / this.vStep) * this.vStep;
+        var self = this;
+        canvas.addEventListener('mousemove', function (event) {
+            var rect = canvas.getBoundingClientRect();
+            self.draw(event.clientX - rect.left);
+        });
+        canvas.addEventListener('mouseleave', function () {
+            self.draw();
+        });
+        this.draw();
+    }
+
+    Chart.prototype.draw = function (hoverX) {
+        var canvas = this.canvas, spec = this.spec;
+        var ratio = window.devicePixelRatio || 1;
+        var width = canvas.parentNode.clientWidth, height = canvas.parentNode.clientHeight;
+        if (canvas.width !== width * ratio || canvas.height !== height * ratio) {
+            canvas.width = width * ratio;
+            canvas.height = height * ratio;
+            canvas.style.width = width + 'px';
+            canvas.style.height = height + 'px';
+        }
+        var ctx = canvas.getContext('2d');
+        ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+        ctx.clearRect(0, 0, width, height);
+        ctx.font = '11px Arial, sans-serif';
+
+        var plotW = width - PAD.left - PAD.right, plotH = height - PAD.top - PAD.bottom;
+        var tMin = this.tMin, tSpan = this.tMax - this.tMin, vMax = this.vMax;
+        function x(t) { return PAD.left + (t - tMin) / tSpan * plotW; }
+        function y(v) { return PAD.top + plotH - v / vMax * plotH; }
+
+        if (spec.title) {
+            ctx.fillStyle = '#2c3e50';
+            ctx.font = 'bold 13px Arial, sans-serif';
+            ctx.fillText(spec.title, PAD.left, 16);
+            ctx.font = '11px Arial, sans-serif';
+        }
+        if (!this.series.length) {
+            ctx.fillStyle = '#999';
+            ctx.fillText('No data', PAD.left + plotW / 2 - 20, PAD.top + plotH / 2);
+            return;
+        }
+
+        // Grid and axes
+        ctx.strokeStyle = '#e5e5e5';
+        ctx.fillStyle = '#666';
+        ctx.lineWidth = 1;
+        ctx.textAlign = 'right';
+        for (var v = 0; v <= vMax + 1e-9; v += this.vStep) {
+            ctx.beginPath();
+            ctx.moveTo(PAD.left, Math.round(y(v)) + 0.5);
+            ctx.lineTo(PAD.left + plotW, Math.round(y(v)) + 0.5);
+            ctx.stroke();
+            ctx.fillText(formatValue(v, spec.unit), PAD.left - 6, y(v) + 4);
+        }
+        ctx.textAlign = 'center';
+        // Ticks on round local times (midnight for day steps)
+        var tStep = timeStep(tSpan, Math.max(2, Math.floor(plotW / 110)));
+        var zone = -new Date(tMin * 1000).getTimezoneOffset() * 60;
+        for (var t = Math.ceil((tMin + zone) / tStep) * tStep - zone; t <= this.tMax; t += tStep) {
+            ctx.beginPath();
+            ctx.moveTo(Math.round(x(t)) + 0.5, PAD.top);
+            ctx.lineTo(Math.round(x(t)) + 0.5, PAD.top + plotH);
+            ctx.stroke();
+            ctx.fillText(formatTime(t, tSpan), x(t), PAD.top + plotH + 16);
+        }
+
+        // Lines
+        this.series.forEach(function (s) {
+            ctx.strokeStyle = s.color;
+            ctx.lineWidth = s.dashed ? 1 : 1.5;
+            ctx.setLineDash(s.dashed ? [4, 3] : []);
+            ctx.beginPath();
+            for (var i = 0; i < s.t.length; i++) {
+                if (i === 0) {
+                    ctx.moveTo(x(s.t[i]), y(s.v[i]));
+                } else {
+                    ctx.lineTo(x(s.t[i]), y(s.v[i]));
+                }
+            }
+            ctx.stroke();
+        });
+        ctx.setLineDash([]);
+
+        // Legend
+        ctx.textAlign = 'left';
+        var legendX = width - PAD.right;
+        for (var k = this.series.length - 1; k >= 0; k--) {
+            var label = this.series[k].label;
+            legendX -= ctx.measureText(label).width + 26;
+            ctx.fillStyle = this.series[k].color;
+            ctx.fillRect(legendX, 9, 12, 3);
+            ctx.fillStyle = '#444';
+            ctx.fillText(label, legendX + 16, 14);
+        }
+
+        if (hoverX === undefined || hoverX < PAD.left || hoverX > PAD.left + plotW) {
+            return;
+        }
+        // Crosshair with the nearest value of each series
+        var hoverT = tMin + (hoverX - PAD.left) / plotW * tSpan;
+        ctx.strokeStyle = '#999';
+        ctx.beginPath();
+        ctx.moveTo(hoverX + 0.5, PAD.top);
+        ctx.lineTo(hoverX + 0.5, PAD.top + plotH);
+        ctx.stroke();
+        var lines = [formatTime(hoverT, Math.min(tSpan, 86400))];
+        this.series.forEach(function (s) {
+            var i = nearest(s.t, hoverT);
+            lines.push(s.label + ': ' + formatValue(s.v[i], spec.unit));
+            ctx.fillStyle = s.color;
+            ctx.beginPath();
+            ctx.arc(x(s.t[i]), y(s.v[i]), 3, 0, 2 * Math.PI);
+            ctx.fill();
+        });
+        var boxW = Math.max.apply(null, lines.map(function (l) { return ctx.measureText(l).width; })) + 12;
+        var boxX = hoverX + boxW + 12 > width ? hoverX - boxW - 8 : hoverX + 8;
+        ctx.fillStyle = 'rgba(44, 62, 80, 0.9)';
+        ctx.fillRect(boxX, PAD.top + 4, boxW, lines.length * 15 + 6);
+        ctx.fillStyle = 'white';
+        lines.forEach(function (l, i) {
+            ctx.fillText(l, boxX + 6, PAD.top + 18 + i * 15);
+        });
+    };
+
+    window.mngChart = function (id, spec) {
+        charts.push(new Chart(document.getElementById(id), spec));
+    };
+
+    window.addEventListener('resize', function () {
+        charts.forEach(function (chart) { chart.draw(); });
+    });
+})();
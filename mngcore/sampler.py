@@ -0,0 +1,251 @@
+"""Central psutil sampler for all supervised processes.
+
+One timer picks every tracked process whose interval is due, and a single
+sampler thread reads their counters, reusing a cached psutil.Process per
+child (so cpu_percent() has a baseline) and reading all counters inside
+oneshot(). The supervisor loop never waits on /proc: it gets the results
+back, publishes a single batched snapshot through snapshot_signal and hands
+every target its own entry.
+
+Stats cover a child's whole process tree. Each target keeps the handles of
+its known descendants and only looks for new ones below the members that
+were scheduled since the previous sample (one that never ran cannot have
+forked; its context switch count tells): on
+Linux by reading /proc/<pid>/task/<tid>/children, elsewhere from one parent
+map built per tick. Members that exit are dropped when sampling fails, and
+orphans stay counted after their parent dies.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+
+from .signals import Signal
+
+MB = 1024 * 1024
+
+TREE_FIELDS = ('cpu', 'memory', 'threads', 'fds', 'read_bytes', 'write_bytes')
+
+HAS_PROC_CHILDREN = os.path.exists(f'/proc/self/task/{os.getpid()}/children')
+
+
+class _Target:
+    __slots__ = ('pid', 'handle', 'interval', 'callback', 'due', 'members', 'switches')
+
+    def __init__(self, pid, handle, interval, callback, due):
+        self.pid = pid
+        self.handle = handle
+        self.interval = interval
+        self.callback = callback
+        self.due = due
+        # Descendant pid -> cached psutil.Process (keeps its cpu baseline)
+        self.members = {}
+        # Pid -> context switches at the last sample, root included
+        self.switches = {}
+
+
+def proc_children(pid):
+    """Direct children of pid from /proc, across all of its threads."""
+    children = []
+    try:
+        for tid in os.listdir(f'/proc/{pid}/task'):
+            try:
+                with open(f'/proc/{pid}/task/{tid}/children') as f:
+                    children.extend(int(child) for child in f.read().split())
+            except OSError:
+                # Thread exited between listdir() and open()
+                pass
+    except OSError:
+        pass
+    return children
+
+
+def parent_map_children():
+    """Children lookup built from one scan of the process table."""
+    children = {}
+    for process in psutil.process_iter(['ppid']):
+        children.setdefault(process.info['ppid'], []).append(process.pid)
+    return lambda pid: children.get(pid, ())
+
+
+def sample_process(handle):
+    """Resource counters of one process, or None if it is gone.
+
+    'switches' (context switches so far) is for the sampler; it is not published.
+    """
+    try:
+        with handle.oneshot():
+            switches = handle.num_ctx_switches()
+            stats = {
+                'cpu': round(handle.cpu_percent(None), 1),
+                'switches': switches.voluntary + switches.involuntary,
+                'memory': round(handle.memory_info().rss / MB, 1),
+                'threads': handle.num_threads(),
+                'fds': handle.num_fds() if hasattr(handle, 'num_fds') else handle.num_handles(),
+                'read_bytes': 0,
+                'write_bytes': 0,
+            }
+            try:
+                io = handle.io_counters()
+                stats['read_bytes'] = io.read_bytes
+                stats['write_bytes'] = io.write_bytes
+            except (AttributeError, psutil.AccessDenied):
+                # Not available on macOS or for other users' processes
+                pass
+        return stats
+    except (psutil.NoSuchProcess, psutil.ZombieProcess):
+        return None
+    except psutil.AccessDenied:
+        return {}
+
+
+class ProcessSampler:
+    def __init__(self, supervisor, resolution=1.0):
+        self.supervisor = supervisor
+        self.resolution = resolution
+        self.targets = {}
+        self.snapshot = {}
+        self.snapshot_time = None
+        self.last_tick_duration = 0.0
+        self.snapshot_signal = Signal()
+        self._timer = None
+        self._sampling = False
+        self._executor = None
+
+    def track(self, key, pid, interval, callback=None):
+        """Samples pid every interval seconds under key; loop thread only."""
+        try:
+            handle = psutil.Process(pid)
+            handle.cpu_percent(None)  # baseline for the first real sample
+        except psutil.Error:
+            return False
+        self.targets[key] = _Target(pid, handle, interval, callback, time.monotonic() + interval)
+        self._schedule()
+        return True
+
+    def untrack(self, key):
+        self.targets.pop(key, None)
+        self.snapshot.pop(key, None)
+
+    def _schedule(self):
+        # One tick at a time: the next is scheduled when the previous one is published
+        if self._timer is None and not self._sampling and self.targets:
+            self._timer = self.supervisor.call_later(self.resolution, self.tick)
+
+    def tick(self):
+        """Hands the due targets to the sampler thread; loop thread only."""
+        self._timer = None
+        now = time.monotonic()
+        due = []
+        for key, target in self.targets.items():
+            if target.due <= now:
+                target.due = now + target.interval
+                due.append((key, target))
+        if not due:
+            self._schedule()
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix='mng-sampler')
+        self._sampling = True
+        future = self.supervisor.loop.run_in_executor(self._executor, self.sample, due)
+        future.add_done_callback(self._publish)
+
+    def sample(self, due):
+        """Reads the counters of (key, target) pairs; runs in the sampler thread."""
+        started = time.monotonic()
+        children_of = proc_children if HAS_PROC_CHILDREN else None
+        results = []
+        for key, target in due:
+            stats = sample_process(target.handle)
+            if stats is not None:
+                active = self._add_tree_stats(target, stats)
+                if active:
+                    if children_of is None:
+                        children_of = parent_map_children()
+                    self._update_tree(target, active, children_of)
+                stats['pid'] = target.pid
+            results.append((key, target, stats))
+        return results, time.monotonic() - started
+
+    def _publish(self, future):
+        self._sampling = False
+        try:
+            results, self.last_tick_duration = future.result()
+        except Exception:
+            results = []
+        batch = {}
+        for key, target, stats in results:
+            # Untracked (or tracked anew) while it was being sampled
+            if self.targets.get(key) is not target:
+                continue
+            if stats is None:
+                self.untrack(key)
+                continue
+            batch[key] = stats
+
+        if batch:
+            self.snapshot.update(batch)
+            self.snapshot_time = time.time()
+            for key, stats in batch.items():
+                target = self.targets[key]
+                if target.callback is not None:
+                    try:
+                        target.callback(stats)
+                    except Exception:
+                        pass
+            self.snapshot_signal.emit(self.snapshot_time, batch)
+        self._schedule()
+
+    def _add_tree_stats(self, target, stats):
+        """Adds the members' counters to stats; returns the pids that ran.
+
+        Only a process that was scheduled since the last sample can have
+        started children, so the tree is searched below those alone (and
+        below everything on the first tick).
+        """
+        active = []
+        switches = {}
+        for pid, sample in self._member_samples(target, stats):
+            count = sample.pop('switches', None)
+            switches[pid] = count
+            if count is None or count != target.switches.get(pid):
+                active.append(pid)
+        target.switches = switches
+
+        stats['processes'] = len(switches)
+        for field in ('cpu', 'memory'):
+            if field in stats:
+                stats[field] = round(stats[field], 1)
+        return active
+
+    def _member_samples(self, target, stats):
+        yield target.pid, stats
+        for pid, handle in list(target.members.items()):
+            member = sample_process(handle)
+            if member is None:
+                del target.members[pid]
+                continue
+            for field in TREE_FIELDS:
+                if field in member and field in stats:
+                    stats[field] += member[field]
+            yield pid, member
+
+    def _update_tree(self, target, active, children_of):
+        """Adds descendants that appeared below the active members."""
+        known = set(target.members)
+        known.add(target.pid)
+        stack = list(active)
+        while stack:
+            for child in children_of(stack.pop()):
+                if child in known:
+                    continue
+                known.add(child)
+                stack.append(child)
+                try:
+                    handle = psutil.Process(child)
+                    handle.cpu_percent(None)
+                except psutil.Error:
+                    continue
+                target.members[child] = handle
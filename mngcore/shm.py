@@ -0,0 +1,248 @@
+"""Shared-memory stats channel from a supervisor process to its front ends.
+
+The supervisor owns a file in /dev/shm (RAM, no disk I/O) divided into one
+slot per script. Each slot holds the script name, its status and a ring of
+the last RING_SIZE stats samples. Readers map the file read-only and poll
+it, so a slow or frozen GUI never holds up the supervisor. They can also
+attach late and still see recent history.
+
+There is a single writer and no lock. A record is complete before the
+slot's head counter moves past it. Readers re-check the head after copying
+records and drop any that were overwritten meanwhile.
+
+When every slot is taken the writer doubles the file in place: existing
+slots keep their offsets, and readers remap once they see the larger slot
+count in the header.
+"""
+
+import mmap
+import os
+import sys
+import time
+from array import array
+
+MAGIC = 0x4D4E4753  # "MNGS"
+VERSION = 1
+
+DEFAULT_SLOTS = 1024
+RING_SIZE = 64
+NAME_BYTES = 128
+
+# used: one past the highest slot ever taken, so readers skip the rest
+HEADER_FIELDS = ('magic', 'version', 'slots', 'ring_size', 'used')
+# generation changes whenever a slot gets a new owner; 0 means unused
+SLOT_FIELDS = ('generation', 'head', 'status', 'status_seq')
+RECORD_FIELDS = ('time', 'cpu', 'memory', 'restarts', 'uptime', 'processes', 'threads',
+                 'fds', 'read_bytes', 'write_bytes', 'replicas')
+STATUSES = ('stopped', 'starting', 'running', 'waiting', 'error')
+
+
+def default_channel_path():
+    directory = '/dev/shm' if os.path.isdir('/dev/shm') else os.path.join(os.path.expanduser('~'), '.mngserver')
+    return os.path.join(directory, f"mngserver-{os.getpid()}.stats")
+
+
+class _Layout:
+    def __init__(self, slots, ring_size):
+        self.slots = slots
+        self.ring_size = ring_size
+        self.header_bytes = len(HEADER_FIELDS) * 8
+        self.record_width = len(RECORD_FIELDS)
+        self.slot_doubles = len(SLOT_FIELDS) + ring_size * self.record_width
+        self.slot_bytes = NAME_BYTES + self.slot_doubles * 8
+        self.size = self.header_bytes + slots * self.slot_bytes
+
+    def slot_offset(self, slot):
+        return self.header_bytes + slot * self.slot_bytes
+
+    def doubles_index(self, slot):
+        """Index of the slot's first double in a 'd' view of the whole file."""
+        return (self.slot_offset(slot) + NAME_BYTES) // 8
+
+
+class StatsChannel:
+    """Writer side, owned by the supervisor process (single-threaded: the loop)."""
+
+    def __init__(self, path=None, slots=DEFAULT_SLOTS, ring_size=RING_SIZE):
+        self.path = path or default_channel_path()
+        self.layout = _Layout(slots, ring_size)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._mmap = self._map(self.layout.size, os.O_CREAT | os.O_TRUNC)
+        self.doubles = memoryview(self._mmap).cast('d')
+        self.doubles[:len(HEADER_FIELDS)] = array('d', (MAGIC, VERSION, slots, ring_size, 0))
+        self.slot_by_name = {}
+        self.generation = 0
+        # Names already reported as left out
+        self.unpublished = set()
+
+    def _map(self, size, flags=0):
+        fd = os.open(self.path, os.O_RDWR | flags, 0o600)
+        try:
+            os.ftruncate(fd, size)
+            return mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+    def _grow(self):
+        """Doubles the slot count; the header is updated once the file is large enough."""
+        layout = _Layout(self.layout.slots * 2, self.layout.ring_size)
+        # The old mapping stays usable if this fails
+        grown = self._map(layout.size)
+        self.doubles.release()
+        self._mmap.close()
+        self._mmap, self.layout = grown, layout
+        self.doubles = memoryview(self._mmap).cast('d')
+        self.doubles[2] = layout.slots
+
+    def slot(self, name):
+        slot = self.slot_by_name.get(name)
+        if slot is None:
+            used = set(self.slot_by_name.values())
+            slot = next((i for i in range(self.layout.slots) if i not in used), None)
+            if slot is None:
+                slot = self.layout.slots
+                try:
+                    self._grow()
+                except (OSError, ValueError) as e:
+                    if name not in self.unpublished:
+                        self.unpublished.add(name)
+                        print(f"⚠️ Stats channel full, {name} is not shown to front ends: {e}",
+                              file=sys.stderr, flush=True)
+                    return None
+            offset = self.layout.slot_offset(slot)
+            encoded = name.encode('utf-8')[:NAME_BYTES - 1]
+            self._mmap[offset:offset + NAME_BYTES] = encoded.ljust(NAME_BYTES, b'\0')
+            base = self.layout.doubles_index(slot)
+            self.doubles[base + 1:base + len(SLOT_FIELDS)] = array('d', (0, 0, 0))
+            # Published last: readers only look at slots with a generation
+            self.generation += 1
+            self.doubles[base] = self.generation
+            self.slot_by_name[name] = slot
+            self.doubles[4] = max(self.doubles[4], slot + 1)
+        return slot
+
+    def publish_stats(self, name, stats):
+        slot = self.slot(name)
+        if slot is None:
+            return
+        base = self.layout.doubles_index(slot)
+        head = int(self.doubles[base + 1])
+        values = [time.time()]
+        for field in RECORD_FIELDS[1:]:
+            value = stats.get(field, 0)
+            if field == 'uptime':
+                value = parse_uptime(value)
+            values.append(float(value or 0))
+        record = base + len(SLOT_FIELDS) + (head % self.layout.ring_size) * self.layout.record_width
+        self.doubles[record:record + self.layout.record_width] = array('d', values)
+        self.doubles[base + 1] = head + 1
+
+    def publish_status(self, name, status):
+        slot = self.slot(name)
+        if slot is None:
+            return
+        base = self.layout.doubles_index(slot)
+        self.doubles[base + 2] = STATUSES.index(status) if status in STATUSES else STATUSES.index('error')
+        self.doubles[base + 3] += 1
+
+    def release(self, name):
+        slot = self.slot_by_name.pop(name, None)
+        if slot is not None:
+            self.doubles[self.layout.doubles_index(slot)] = 0
+
+    def close(self):
+        self.doubles.release()
+        self._mmap.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class StatsReader:
+    """Reader side: polls the channel for new samples and status changes."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.doubles = memoryview(self._mmap).cast('d')
+        magic, version, slots, ring_size, _ = self.doubles[:len(HEADER_FIELDS)]
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not an MNGserver stats channel")
+        self.layout = _Layout(int(slots), int(ring_size))
+        # slot -> [generation, name, head read so far, status_seq seen]
+        self.seen = {}
+
+    def _remap(self, slots):
+        """Follows the writer after it grew the file."""
+        self.doubles.release()
+        self._mmap.close()
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.doubles = memoryview(self._mmap).cast('d')
+        self.layout = _Layout(slots, self.layout.ring_size)
+
+    def poll(self):
+        """({name: [stats, ...]}, {name: status}) that changed since the last poll."""
+        samples = {}
+        statuses = {}
+        slots = int(self.doubles[2])
+        if slots > self.layout.slots:
+            self._remap(slots)
+        width = self.layout.record_width
+        ring_size = self.layout.ring_size
+        # used may already count slots of a growth this poll has not mapped
+        for slot in range(min(int(self.doubles[4]), self.layout.slots)):
+            base = self.layout.doubles_index(slot)
+            generation = self.doubles[base]
+            if not generation:
+                self.seen.pop(slot, None)
+                continue
+            state = self.seen.get(slot)
+            if state is None or state[0] != generation:
+                offset = self.layout.slot_offset(slot)
+                name = bytes(self._mmap[offset:offset + NAME_BYTES]).split(b'\0', 1)[0].decode('utf-8', 'replace')
+                state = self.seen[slot] = [generation, name, 0, -1]
+            name = state[1]
+
+            status_seq = self.doubles[base + 3]
+            if status_seq != state[3]:
+                state[3] = status_seq
+                if status_seq:
+                    statuses[name] = STATUSES[int(self.doubles[base + 2])]
+
+            head = int(self.doubles[base + 1])
+            first = max(state[2], head - ring_size)
+            if head <= first:
+                continue
+            records = []
+            for i in range(first, head):
+                record = base + len(SLOT_FIELDS) + (i % ring_size) * width
+                records.append((i, tuple(self.doubles[record:record + width])))
+            # Whatever the writer lapped while we copied is dropped
+            oldest_valid = int(self.doubles[base + 1]) - ring_size
+            samples[name] = [record_to_stats(values) for i, values in records if i >= oldest_valid]
+            state[2] = head
+        return samples, statuses
+
+    def close(self):
+        self.doubles.release()
+        self._mmap.close()
+
+
+def parse_uptime(value):
+    if isinstance(value, str):
+        hours, minutes, seconds = (int(part) for part in value.split(':'))
+        return hours * 3600 + minutes * 60 + seconds
+    return value
+
+
+def record_to_stats(values):
+    stats = dict(zip(RECORD_FIELDS, values))
+    for field in ('restarts', 'uptime', 'processes', 'threads', 'fds', 'read_bytes', 'write_bytes', 'replicas'):
+        stats[field] = int(stats[field])
+    return stats
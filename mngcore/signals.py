@@ -0,0 +1,36 @@
+"""Minimal Qt-free signals for the supervision core.
+
+Slots run in the emitting thread (the supervisor loop). The GUI connects
+them to its own pyqtSignals, which queue the call onto the Qt thread.
+A slot that raises has its traceback printed, like a pyqtSignal slot, and
+the remaining slots still run.
+"""
+
+import traceback
+
+
+class Signal:
+    def __init__(self):
+        self._slots = []
+
+    def connect(self, slot):
+        self._slots.append(slot)
+
+    def disconnect(self, slot):
+        self._slots.remove(slot)
+
+    def emit(self, *args):
+        for slot in list(self._slots):
+            try:
+                slot(*args)
+            except Exception:
+                traceback.print_exc()
+
+
+class MonitorSignals:
+    def __init__(self):
+        self.log_signal = Signal()
+        self.status_signal = Signal()
+        self.stats_signal = Signal()
+        self.output_signal = Signal()
+        self.restart_signal = Signal()
@@ -0,0 +1,213 @@
+"""Scripts that outlive the supervisor (setting "keep_children").
+
+Each script writes its output to a pair of named pipes in the run directory
+instead of anonymous pipes, and its pid, creation time and pipe paths are
+recorded in state.json there. When the supervisor stops it leaves the
+scripts running; the next one finds them in the state file, checks that each
+pid still belongs to the same process (its creation time) and adopts it:
+output, stats and restart counters continue without a restart.
+
+The child holds its pipes open for reading as well, so its writes never fail
+with SIGPIPE while no supervisor is attached. Output written meanwhile waits
+in the pipe (up to PIPE_BUFFER bytes); beyond that the script blocks on
+write until the next supervisor drains it.
+"""
+
+import json
+import os
+import stat
+import time
+
+import psutil
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: keep_children is not supported there
+    fcntl = None
+
+from .store import atomic_write_json
+
+STATE_FILE = 'state.json'
+PIPE_BUFFER = 1024 * 1024
+F_SETPIPE_SZ = getattr(fcntl, 'F_SETPIPE_SZ', 1031)
+SAVE_DELAY = 0.5
+# The exit status of a process we did not start cannot be read
+UNKNOWN_EXIT_CODE = 255
+
+
+def default_run_dir(config_path):
+    return os.path.splitext(os.path.abspath(config_path))[0] + '.run'
+
+
+def process_matches(pid, create_time):
+    """True if pid is alive and is still the process created at create_time."""
+    try:
+        process = psutil.Process(pid)
+        return abs(process.create_time() - create_time) < 0.01 and process.status() != psutil.STATUS_ZOMBIE
+    except psutil.Error:
+        return False
+
+
+def open_fifos(paths):
+    """Creates the output pipes; returns (reader file objects, child fds)."""
+    readers, writers = [], []
+    try:
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            os.mkfifo(path, 0o600)
+            read_fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+            readers.append(os.fdopen(read_fd, 'rb', buffering=0))
+            # Read-write: the child is a reader of its own pipe too (see above)
+            writers.append(os.open(path, os.O_RDWR))
+            try:
+                fcntl.fcntl(read_fd, F_SETPIPE_SZ, PIPE_BUFFER)
+            except OSError:
+                pass
+    except OSError:
+        close_fifos(readers, writers)
+        raise
+    return readers, writers
+
+
+def reopen_fifos(paths):
+    """Read ends of the pipes of an adopted script (None where one is gone)."""
+    readers = []
+    for path in paths:
+        try:
+            if not stat.S_ISFIFO(os.stat(path).st_mode):
+                raise OSError(f"not a pipe: {path}")
+            readers.append(os.fdopen(os.open(path, os.O_RDONLY | os.O_NONBLOCK), 'rb', buffering=0))
+        except OSError:
+            readers.append(None)
+    return readers
+
+
+def close_fifos(readers=(), writers=()):
+    for reader in readers:
+        if reader is not None:
+            reader.close()
+    for fd in writers:
+        os.close(fd)
+
+
+def remove_fifos(paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class AdoptedProcess:
+    """Stand-in for Popen for a script started by a previous supervisor.
+
+    It is not our child, so it cannot be waited for: poll() checks that the
+    pid still belongs to the process created at create_time.
+    """
+
+    def __init__(self, pid, create_time, group=None):
+        self.pid = pid
+        self.create_time = create_time
+        self.group = group
+        self.returncode = None
+        self.stdout = None
+        self.stderr = None
+
+    def poll(self):
+        if self.returncode is None and not process_matches(self.pid, self.create_time):
+            self.returncode = UNKNOWN_EXIT_CODE
+        return self.returncode
+
+    def send_signal(self, sig):
+        if self.poll() is None:
+            os.kill(self.pid, sig)
+
+
+class ChildState:
+    """The state file of one supervisor: script name -> running process.
+
+    Monitors record their process whenever one starts; writes are batched
+    SAVE_DELAY seconds so a fleet starting at once costs one write.
+    """
+
+    def __init__(self, run_dir, supervisor):
+        self.run_dir = run_dir
+        self.path = os.path.join(run_dir, STATE_FILE)
+        self.supervisor = supervisor
+        self.entries = {}
+        # Entries of live processes not yet taken over by a monitor
+        self.orphans = {}
+        self.save_handle = None
+        self.sequence = 0
+
+    def load(self):
+        """Reads the state file, keeping the processes that still run."""
+        os.makedirs(self.run_dir, mode=0o700, exist_ok=True)
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                entries = json.load(f).get('scripts', {})
+        except (OSError, ValueError, AttributeError):
+            entries = {}
+        self.orphans = {name: entry for name, entry in entries.items()
+                        if process_matches(entry['pid'], entry['create_time'])}
+        self.entries = dict(self.orphans)
+
+        # Pipes of processes that are gone
+        in_use = {os.path.basename(path) for entry in self.orphans.values() for path in entry['fifos']}
+        for filename in os.listdir(self.run_dir):
+            if filename.endswith(('.out', '.err')) and filename not in in_use:
+                remove_fifos([os.path.join(self.run_dir, filename)])
+        return self.orphans
+
+    def fifo_paths(self, name):
+        """Fresh pipe paths for one start of a script (overlap restarts need two)."""
+        self.sequence += 1
+        safe_name = ''.join(c if c.isalnum() or c in '-_.#' else '_' for c in name)
+        base = os.path.join(self.run_dir, f"{safe_name}-{os.getpid()}-{self.sequence}")
+        return (f"{base}.out", f"{base}.err")
+
+    def claim(self, name):
+        """The entry of a still running process of `name`, once."""
+        entry = self.orphans.pop(name, None)
+        if entry is None or not process_matches(entry['pid'], entry['create_time']):
+            return None
+        return entry
+
+    def claimable(self, prefix):
+        return [name for name in self.orphans if name.startswith(prefix)]
+
+    def record(self, name, process, started, restarts):
+        try:
+            create_time = psutil.Process(process.pid).create_time()
+        except psutil.Error:
+            return
+        self.entries[name] = {
+            'pid': process.pid,
+            'create_time': create_time,
+            'group': getattr(process, 'group', None),
+            'fifos': list(getattr(process, 'fifos', None) or ()),
+            'started': started,
+            'restarts': restarts,
+        }
+        self.schedule_save()
+
+    def forget(self, name):
+        if self.entries.pop(name, None) is not None:
+            self.schedule_save()
+
+    def schedule_save(self):
+        if self.save_handle is None:
+            self.save_handle = self.supervisor.call_later(SAVE_DELAY, self.save)
+
+    def save(self):
+        if self.save_handle is not None:
+            self.save_handle.cancel()
+            self.save_handle = None
+        try:
+            atomic_write_json(self.path, {'pid': os.getpid(), 'saved': time.time(), 'scripts': self.entries})
+        except OSError:
+            pass
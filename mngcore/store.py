@@ -0,0 +1,219 @@
+"""Persistent configuration and state of the monitored scripts.
+
+Scripts are kept in one JSON file that is loaded at startup and rewritten
+atomically (temp file + fsync + rename) shortly after every change, so bursts
+of changes cost a single write and a crash never leaves a truncated file.
+
+The scripts are changed by one thread (the GUI thread, or the supervisor loop
+in the daemon). The delayed save takes its snapshot in that thread through
+`owner` and only writes the file from the timer thread.
+"""
+
+import copy
+import json
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import Future
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.expanduser('~'), '.mngserver', 'config.json')
+CONFIG_VERSION = 1
+
+# Live objects and display state owned by the GUI, never written to disk
+RUNTIME_KEYS = ('monitor', 'status', 'stats')
+
+
+def default_script_config(path, name=None):
+    return {
+        'name': name or os.path.basename(path),
+        'path': path,
+        'enabled': False,
+        'restarts': 0,
+        'max_restarts': 5,
+        'check_interval': 10,
+        'telegram_enabled': False,
+        'telegram_token': '',
+        'telegram_chat_id': '',
+        'scheduled_restart_enabled': False,
+        'restart_interval_value': 1,
+        'restart_interval_unit': 'hours',
+        'backoff_initial': 1.0,
+        'backoff_max': 300.0,
+        'stable_uptime': 300,
+        'crash_loop_count': 5,
+        'crash_loop_window': 60,
+        'crash_loop_pause': 600,
+        'memory_limit_mb': 0,
+        'cpu_limit_percent': 0,
+        'max_open_files': 0,
+        'nice': 0,
+        'ionice_class': '',
+        'ionice_level': 4,
+        'cgroup': '',
+        'replicas': 1,
+        'autoscale': False,
+        'replicas_min': 1,
+        'replicas_max': 4,
+        'scale_up_cpu': 80,
+        'scale_down_cpu': 20,
+        'scale_cooldown': 60,
+        'pin_replicas': False,
+        'tags': [],
+        'probes': [],
+        'listen': '',
+        'restart_mode': 'restart',
+        'overlap_grace': 5,
+        'ready_timeout': 60,
+        'drain_timeout': 10,
+    }
+
+
+def script_config(script_info):
+    """The persistent part of a script_info dict."""
+    return {key: value for key, value in dict(script_info).items() if key not in RUNTIME_KEYS}
+
+
+def atomic_write_json(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def loop_owner(loop):
+    """owner() for a ConfigStore whose scripts are changed on an asyncio loop."""
+    def owner(fn):
+        future = Future()
+
+        def job():
+            try:
+                future.set_result(fn())
+            except Exception as e:
+                future.set_exception(e)
+        loop.call_soon_threadsafe(job)
+        return future
+    return owner
+
+
+class ConfigStore:
+    def __init__(self, path=DEFAULT_CONFIG_PATH, save_delay=1.0, owner=None):
+        self.path = path
+        self.save_delay = save_delay
+        # owner(fn) runs fn in the thread that changes the scripts and
+        # returns a concurrent future; None when that is any thread
+        self.owner = owner
+        self.scripts = {}
+        self.settings = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._timer = None
+        # Changes counted, and the count the file on disk reflects
+        self._changes = 0
+        self._saved = 0
+
+    def load(self, enabled_default=False):
+        """Reads the file (if any) and returns the name -> script_info dict.
+
+        A bare list of scripts or of paths is accepted too, which keeps
+        hand-written daemon configs short. Entries without "enabled" get
+        enabled_default.
+        """
+        if not os.path.exists(self.path):
+            return self.scripts
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if isinstance(data, dict):
+            entries = data.get('scripts', [])
+            self.settings = data.get('settings', {})
+        else:
+            entries = data
+
+        for entry in entries:
+            if isinstance(entry, str):
+                entry = {'path': entry}
+            path = os.path.abspath(os.path.expanduser(entry['path']))
+            script_info = default_script_config(path, entry.get('name'))
+            script_info['enabled'] = enabled_default
+            script_info.update(entry)
+            script_info['path'] = path
+            self.scripts[script_info['name']] = script_info
+        return self.scripts
+
+    def add(self, script_info):
+        self.scripts[script_info['name']] = script_info
+        self.mark_dirty()
+
+    def remove(self, name):
+        self.scripts.pop(name, None)
+        self.mark_dirty()
+
+    def mark_dirty(self, *args):
+        # Accepts and ignores signal arguments so it can be connected directly
+        with self._lock:
+            self._changes += 1
+            self._schedule()
+
+    def _schedule(self):
+        # Caller holds self._lock
+        if self._timer is None:
+            self._timer = threading.Timer(self.save_delay, self._save_later)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def snapshot(self):
+        """Deep copy of the persistent state; call it in the owning thread."""
+        scripts = [script_config(script_info) for script_info in list(self.scripts.values())]
+        return copy.deepcopy({'version': CONFIG_VERSION, 'settings': self.settings, 'scripts': scripts})
+
+    def _save_later(self):
+        # Timer thread: snapshot in the owning thread, write from here
+        with self._lock:
+            changes = self._changes
+        try:
+            data = self.snapshot() if self.owner is None else self.owner(self.snapshot).result()
+            self._write(data, changes)
+        except Exception as e:
+            # Still dirty: the next change or flush() writes it
+            print(f"⚠️ Cannot save {self.path}: {e}", file=sys.stderr)
+        with self._lock:
+            self._timer = None
+            if self._changes != changes and self._changes != self._saved:
+                # Changed while it was being saved
+                self._schedule()
+
+    def _write(self, data, changes):
+        with self._write_lock:
+            # A slower, older save must not replace a newer one
+            if changes < self._saved:
+                return
+            atomic_write_json(self.path, data)
+            self._saved = changes
+
+    def save(self):
+        """Writes the file now; call it in the owning thread."""
+        with self._lock:
+            changes = self._changes
+        self._write(self.snapshot(), changes)
+
+    def flush(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            dirty = self._changes != self._saved
+        if dirty:
+            self.save()
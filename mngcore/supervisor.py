@@ -0,0 +1,352 @@
+"""Single event loop that supervises every child process.
+
+Exits are seen through a pidfd per child (Linux 5.3+), so a crash is handled
+the moment the kernel reports it. Where pidfds are unavailable one reaper
+timer polls all children every REAP_INTERVAL seconds. Child output is read
+from the same loop; there is no thread per process.
+
+Every child gets its own session and process group, so stopping a script
+also stops the workers it spawned instead of leaving them orphaned.
+
+With a ChildState (see mngcore.state) children write to named pipes instead,
+and a later supervisor can adopt() the ones a previous one left running.
+"""
+
+import asyncio
+import errno
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import traceback
+
+from .output import OutputStream, default_pump
+from .probes import ProbeScheduler
+from .sampler import ProcessSampler
+from .state import AdoptedProcess, open_fifos, reopen_fifos, close_fifos, remove_fifos
+from .timeseries import MetricsStore
+
+REAP_INTERVAL = 0.05
+SIGKILL = getattr(signal, 'SIGKILL', signal.SIGTERM)
+# How long killed workers may take to disappear before terminate returns
+KILL_GRACE = 1.0
+
+
+class _Watch:
+    __slots__ = ('process', 'on_exit', 'pidfd', 'waiters')
+
+    def __init__(self, process, on_exit):
+        self.process = process
+        self.on_exit = on_exit
+        self.pidfd = None
+        self.waiters = []
+
+
+class Supervisor:
+    def __init__(self, metrics=None, log_index=None):
+        self.loop = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._watches = {}
+        self._polled = set()
+        self._reaper = None
+        self.use_pidfd = hasattr(os, 'pidfd_open')
+        self.use_readers = os.name != 'nt'
+        self.sampler = ProcessSampler(self)
+        self.probes = ProbeScheduler(self)
+        # Script name -> ScriptMonitor, for the exporter and control API
+        self.monitors = {}
+        self.metrics = metrics if metrics is not None else MetricsStore()
+        self.sampler.snapshot_signal.connect(self.metrics.record_snapshot)
+        # ChildState when scripts outlive the supervisor (keep_children)
+        self.state = None
+        # LogIndex the monitors' log files feed, if search is on
+        self.log_index = log_index
+
+    # Loop lifecycle
+
+    def start(self):
+        """Runs the loop in a background thread (GUI mode)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name='mng-supervisor', daemon=True)
+            self._thread.start()
+            self._ready.wait()
+        return self
+
+    def run(self, main=None):
+        """Runs the loop in the calling thread until stop() or main finishes.
+
+        Returns what main returned.
+        """
+        # Selector loop everywhere: add_reader() is needed for pipes and pidfds
+        self.loop = asyncio.SelectorEventLoop()
+        asyncio.set_event_loop(self.loop)
+        self._ready.set()
+        try:
+            if main is not None:
+                return self.loop.run_until_complete(main)
+            else:
+                self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    def stop(self):
+        if self.loop is not None and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+    def stats(self):
+        return {
+            'children': len(self._watches),
+            'polled': len(self._polled),
+            'sampled': len(self.sampler.targets),
+            'sampler_tick': self.sampler.last_tick_duration,
+            'probed': len(self.probes.watches),
+        }
+
+    def in_loop(self):
+        return self._thread is None or threading.current_thread() is self._thread
+
+    def call_soon(self, callback, *args):
+        return self.loop.call_soon_threadsafe(callback, *args)
+
+    def call_later(self, delay, callback, *args):
+        return self.loop.call_later(delay, callback, *args)
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    # Children
+
+    def spawn(self, argv, on_exit, on_lines=None, log_file=None, fifos=None, **popen_kwargs):
+        """Starts a child with piped output; must be called from the loop.
+
+        fifos (stdout and stderr paths) replaces the anonymous pipes with
+        named ones that stay usable after this process exits.
+        """
+        if os.name == 'nt':
+            popen_kwargs.setdefault('creationflags', subprocess.CREATE_NEW_PROCESS_GROUP)
+        else:
+            popen_kwargs.setdefault('start_new_session', True)
+        readers, writers = open_fifos(fifos) if fifos else ((), ())
+        try:
+            process = subprocess.Popen(
+                argv,
+                stdout=writers[0] if fifos else subprocess.PIPE,
+                stderr=writers[1] if fifos else subprocess.PIPE,
+                bufsize=0,
+                **popen_kwargs
+            )
+        except BaseException:
+            close_fifos(readers, writers)
+            remove_fifos(fifos or ())
+            raise
+        close_fifos((), writers)
+        if fifos:
+            process.stdout, process.stderr = readers
+        process.fifos = fifos
+        # The session leader's pid is the group id of the whole tree
+        process.group = process.pid if popen_kwargs.get('start_new_session') else None
+        if on_lines is not None:
+            process.streams = self.attach_output(process, on_lines, log_file)
+        self.watch(process, on_exit)
+        return process
+
+    def adopt(self, entry, on_exit, on_lines=None, log_file=None):
+        """Supervises a process recorded in a ChildState entry; None if it is gone."""
+        process = AdoptedProcess(entry['pid'], entry['create_time'], entry.get('group'))
+        if process.poll() is not None:
+            return None
+        process.fifos = tuple(entry.get('fifos') or ()) or None
+        if process.fifos and on_lines is not None:
+            process.stdout, process.stderr = reopen_fifos(process.fifos)
+            process.streams = self.attach_output(process, on_lines, log_file)
+        self.watch(process, on_exit)
+        return process
+
+    def release(self, process):
+        """Stops watching a child and reading its output but leaves it running."""
+        watch = self._watches.pop(process.pid, None)
+        if watch is not None and watch.pidfd is not None:
+            self.loop.remove_reader(watch.pidfd)
+            os.close(watch.pidfd)
+            watch.pidfd = None
+        self._polled.discard(process.pid)
+        for stream in getattr(process, 'streams', None) or ():
+            if not stream.closed:
+                self.loop.remove_reader(stream.fd)
+                stream.close()
+
+    def attach_output(self, process, on_lines, log_file=None):
+        if not self.use_readers:
+            return default_pump().attach(process, on_lines, log_file)
+
+        streams = []
+        for name in ('stdout', 'stderr'):
+            fileobj = getattr(process, name)
+            if fileobj is None:
+                continue
+            stream = OutputStream(fileobj, name, on_lines, log_file)
+            os.set_blocking(stream.fd, False)
+            self.loop.add_reader(stream.fd, self._on_readable, stream)
+            streams.append(stream)
+        return streams
+
+    def _on_readable(self, stream):
+        if not stream.read():
+            self.loop.remove_reader(stream.fd)
+
+    def watch(self, process, on_exit=None):
+        watch = _Watch(process, on_exit)
+        self._watches[process.pid] = watch
+
+        if self.use_pidfd:
+            try:
+                watch.pidfd = os.pidfd_open(process.pid)
+            except OSError as e:
+                if e.errno in (errno.ENOSYS, errno.EPERM):
+                    # Kernel or sandbox without pidfd support
+                    self.use_pidfd = False
+                # Otherwise (already gone, out of fds) only this child is polled
+
+        if watch.pidfd is not None:
+            self.loop.add_reader(watch.pidfd, self._on_pidfd, watch)
+        else:
+            self._polled.add(process.pid)
+            if self._reaper is None:
+                self._reaper = self.loop.call_later(REAP_INTERVAL, self._reap)
+
+    def _on_pidfd(self, watch):
+        self.loop.remove_reader(watch.pidfd)
+        os.close(watch.pidfd)
+        watch.pidfd = None
+        watch.process.poll()
+        self._exited(watch)
+
+    def _reap(self):
+        self._reaper = None
+        for pid in list(self._polled):
+            watch = self._watches.get(pid)
+            if watch is None:
+                self._polled.discard(pid)
+            elif watch.process.poll() is not None:
+                self._polled.discard(pid)
+                self._exited(watch)
+        if self._polled:
+            self._reaper = self.loop.call_later(REAP_INTERVAL, self._reap)
+
+    def _exited(self, watch):
+        self._watches.pop(watch.process.pid, None)
+        remove_fifos(getattr(watch.process, 'fifos', None) or ())
+        for waiter in watch.waiters:
+            if not waiter.done():
+                waiter.set_result(watch.process.returncode)
+        if watch.on_exit is not None:
+            try:
+                watch.on_exit(watch.process)
+            except Exception:
+                # A failing handler must not go unnoticed: the script would
+                # silently stop being restarted
+                print(f"❌ Exit handler for pid {watch.process.pid} failed:", file=sys.stderr)
+                traceback.print_exc()
+
+    def wait_exit(self, process):
+        """Future resolved with the return code once the child has exited."""
+        future = self.loop.create_future()
+        watch = self._watches.get(process.pid)
+        if watch is not None and watch.process is process:
+            watch.waiters.append(future)
+        else:
+            future.set_result(process.poll())
+        return future
+
+    def signal_tree(self, process, sig):
+        """Signals the child's process group, or the child alone if it has none.
+
+        Returns False when nothing was left to signal.
+        """
+        group = getattr(process, 'group', None)
+        if group is not None:
+            try:
+                os.killpg(group, sig)
+                return True
+            except ProcessLookupError:
+                return False
+            except OSError:
+                pass
+        if process.poll() is not None:
+            return False
+        try:
+            process.send_signal(sig)
+            return True
+        except OSError:
+            return False
+
+    def tree_alive(self, process):
+        group = getattr(process, 'group', None)
+        if group is None:
+            return process.poll() is None
+        try:
+            os.killpg(group, 0)
+            return True
+        except ProcessLookupError:
+            return False
+        except OSError:
+            return process.poll() is None
+
+    async def terminate(self, process, timeout=5):
+        """SIGTERM, then SIGKILL if the tree is still alive after timeout."""
+        await self.terminate_many([process], timeout)
+        return process.poll()
+
+    async def terminate_many(self, processes, timeout=5):
+        """Stops many children and their process trees against one deadline.
+
+        Every tree gets SIGTERM at once and all exits are awaited together;
+        whatever is still alive when timeout expires is killed in one pass.
+        The total time is about timeout however many children there are.
+        """
+        deadline = self.loop.time() + timeout
+        processes = [process for process in processes if self.signal_tree(process, signal.SIGTERM)]
+        if not processes:
+            return
+
+        waiters = [self.wait_exit(process) for process in processes]
+        await asyncio.wait(waiters, timeout=timeout)
+        # Leaders are gone; their workers get the rest of the time
+        while self.loop.time() < deadline and any(self.tree_alive(process) for process in processes):
+            await asyncio.sleep(REAP_INTERVAL)
+
+        processes = [process for process in processes if self.signal_tree(process, SIGKILL)]
+        await asyncio.wait(waiters)
+        deadline = self.loop.time() + KILL_GRACE
+        while self.loop.time() < deadline and any(self.tree_alive(process) for process in processes):
+            await asyncio.sleep(REAP_INTERVAL)
+
+
+def listen_socket(address, backlog=128):
+    """Listening TCP socket for "host:port" or a bare port (all interfaces).
+
+    The supervisor keeps it open across restarts and hands it to each
+    instance of the script, so the port never stops accepting connections.
+    """
+    host, _, port = str(address).rpartition(':')
+    return socket.create_server((host.strip('[]'), int(port)), backlog=backlog,
+                                family=socket.AF_INET6 if ':' in host else socket.AF_INET)
+
+
+_supervisor = None
+_supervisor_lock = threading.Lock()
+
+
+def default_supervisor(**kwargs):
+    """Shared supervisor running in its own thread.
+
+    kwargs are passed to Supervisor() when the first call creates it.
+    """
+    global _supervisor
+    with _supervisor_lock:
+        if _supervisor is None:
+            _supervisor = Supervisor(**kwargs).start()
+        return _supervisor
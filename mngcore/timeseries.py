@@ -0,0 +1,387 @@
+"""Compact per-script metrics history.
+
+Samples are kept in fixed-size rings of doubles at three resolutions: raw
+samples, 1-minute and 1-hour rollups (average and maximum). Rollups are
+computed incrementally as samples arrive, so old data costs a few bytes per
+minute or hour instead of a dict per sample. With the default retention
+(1 h raw, 7 d of minutes, 90 d of hours) one script takes about 0.6 MB.
+
+A series can live in a memory-mapped file, which keeps the history across
+restarts without any explicit save. Other processes (an attached GUI, the
+report command) open those files read-only, so they never reset or resize
+the files the supervisor writes.
+"""
+
+import math
+import mmap
+import os
+import threading
+from array import array
+
+MAGIC = 0x4D4E4754  # "MNGT"
+# 2: open minute/hour buckets stored after the rings
+VERSION = 2
+
+RAW_FIELDS = ('time', 'cpu', 'memory')
+ROLLUP_FIELDS = ('time', 'cpu', 'cpu_max', 'memory', 'memory_max')
+
+# (name, bucket seconds, record layout)
+LEVELS = (
+    ('raw', 0, RAW_FIELDS),
+    ('minute', 60, ROLLUP_FIELDS),
+    ('hour', 3600, ROLLUP_FIELDS),
+)
+DEFAULT_RETENTION = {'raw': 3600, 'minute': 7 * 24 * 60, 'hour': 90 * 24}
+OPEN_WIDTH = 6
+OPEN_SIZE = OPEN_WIDTH * (len(LEVELS) - 1)
+
+
+class Ring:
+    """Fixed-capacity ring of records of `width` doubles.
+
+    The first two doubles of the buffer hold the write position and the
+    number of records, so the ring is self-describing inside a file.
+    """
+
+    HEADER = 2
+
+    def __init__(self, buffer, capacity, width):
+        self.buffer = buffer
+        self.capacity = capacity
+        self.width = width
+
+    @classmethod
+    def size(cls, capacity, width):
+        return cls.HEADER + capacity * width
+
+    def __len__(self):
+        return int(self.buffer[1])
+
+    def append(self, values):
+        head = int(self.buffer[0])
+        base = self.HEADER + head * self.width
+        self.buffer[base:base + self.width] = array('d', values)
+        self.buffer[0] = (head + 1) % self.capacity
+        self.buffer[1] = min(len(self) + 1, self.capacity)
+
+    def _offset(self, i):
+        physical = (int(self.buffer[0]) - len(self) + i) % self.capacity
+        return self.HEADER + physical * self.width
+
+    def time_at(self, i):
+        return self.buffer[self._offset(i)]
+
+    def record(self, i):
+        base = self._offset(i)
+        return tuple(self.buffer[base:base + self.width])
+
+    def bisect(self, t, right=False):
+        """Index of the first record with time >= t (> t if right)."""
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            value = self.time_at(mid)
+            if value < t or right and value == t:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def range(self, start=None, end=None):
+        lo = 0 if start is None else self.bisect(start)
+        hi = len(self) if end is None else self.bisect(end, right=True)
+        return self.records(lo, hi)
+
+    def records(self, lo, hi):
+        """Records lo..hi-1 (logical order), copied in at most two slices."""
+        if hi <= lo:
+            return []
+        first = (int(self.buffer[0]) - len(self) + lo) % self.capacity
+        count = hi - lo
+        values = []
+        for physical, length in ((first, min(count, self.capacity - first)), (0, count - (self.capacity - first))):
+            if length > 0:
+                base = self.HEADER + physical * self.width
+                values.extend(self.buffer[base:base + length * self.width].tolist())
+        return list(zip(*[iter(values)] * self.width))
+
+
+def layout_size(capacities):
+    """Doubles in a series buffer: header, rings, open buckets."""
+    return 2 + len(capacities) + OPEN_SIZE + sum(
+        Ring.size(capacity, len(fields)) for capacity, (_, _, fields) in zip(capacities, LEVELS))
+
+
+class Series:
+    """History of one script: raw samples plus minute and hour rollups.
+
+    The minute and hour buckets still being filled live in the buffer too
+    (after the rings), so a restart continues them instead of losing them.
+    A read-only series maps an existing file with the layout recorded in
+    its header, whatever the local retention settings are.
+    """
+
+    def __init__(self, retention=None, path=None, readonly=False):
+        self.path = path
+        self.readonly = readonly
+        self.identity = None
+        self._lock = threading.Lock()
+        self._mmap = None
+        self._buffer = None
+        self._open = None
+
+        if readonly:
+            buffer, self.capacities = self._map_readonly(path)
+        else:
+            retention = dict(DEFAULT_RETENTION, **(retention or {}))
+            self.capacities = [max(1, int(retention[name])) for name, _, _ in LEVELS]
+            header = [MAGIC, VERSION] + self.capacities
+            total = layout_size(self.capacities)
+            buffer = self._map_file(path, total, header) if path else memoryview(array('d', bytes(total * 8)))
+            buffer[:len(header)] = array('d', header)
+        self._buffer = buffer
+
+        self.rings = []
+        offset = 2 + len(LEVELS)
+        for capacity, (_, _, fields) in zip(self.capacities, LEVELS):
+            size = Ring.size(capacity, len(fields))
+            self.rings.append(Ring(buffer[offset:offset + size], capacity, len(fields)))
+            offset += size
+        # Accumulators of the open minute and hour buckets, OPEN_WIDTH doubles each:
+        # bucket, samples (0: none open), cpu_sum, cpu_max, memory_sum, memory_max
+        self._open = buffer[offset:offset + OPEN_SIZE]
+
+    def _map_file(self, path, total, header):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            current = array('d')
+            current.frombytes(os.pread(fd, len(header) * 8, 0))
+            size = os.fstat(fd).st_size
+            # Version 1 files end where the open buckets begin: extend them in place
+            migrated = size == (total - OPEN_SIZE) * 8 and list(current) == [
+                float(value) for value in [MAGIC, 1] + header[2:]]
+            if migrated:
+                os.ftruncate(fd, total * 8)
+            elif size != total * 8:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, total * 8)
+            self._mmap = mmap.mmap(fd, total * 8)
+        finally:
+            os.close(fd)
+        buffer = memoryview(self._mmap).cast('d')
+        if not migrated and list(buffer[:len(header)]) != [float(value) for value in header]:
+            # New file or a different layout: start from an empty history
+            buffer[:] = array('d', bytes(total * 8))
+        return buffer
+
+    def _map_readonly(self, path):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            header = array('d')
+            header.frombytes(os.pread(fd, (2 + len(LEVELS)) * 8, 0))
+            if len(header) != 2 + len(LEVELS) or header[0] != MAGIC or header[1] != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} metrics file")
+            capacities = [int(value) for value in header[2:]]
+            stat = os.fstat(fd)
+            if stat.st_size != layout_size(capacities) * 8:
+                raise ValueError(f"{path} does not match its header")
+            self._mmap = mmap.mmap(fd, stat.st_size, access=mmap.ACCESS_READ)
+            self.identity = (stat.st_ino, stat.st_size)
+        finally:
+            os.close(fd)
+        return memoryview(self._mmap).cast('d'), capacities
+
+    def append(self, timestamp, cpu, memory):
+        with self._lock:
+            self.rings[0].append((timestamp, cpu, memory))
+            self._roll(1, timestamp, 1, cpu, cpu, memory, memory)
+
+    def _roll(self, level, timestamp, samples, cpu_sum, cpu_max, memory_sum, memory_max):
+        step = LEVELS[level][1]
+        bucket = math.floor(timestamp / step)
+        acc = self._open
+        base = (level - 1) * OPEN_WIDTH
+
+        if acc[base + 1] and acc[base] != bucket:
+            self._close_bucket(level, acc[base:base + OPEN_WIDTH].tolist())
+            acc[base + 1] = 0
+
+        if not acc[base + 1]:
+            acc[base:base + OPEN_WIDTH] = array('d', (bucket, samples, cpu_sum, cpu_max, memory_sum, memory_max))
+        else:
+            acc[base + 1] += samples
+            acc[base + 2] += cpu_sum
+            acc[base + 3] = max(acc[base + 3], cpu_max)
+            acc[base + 4] += memory_sum
+            acc[base + 5] = max(acc[base + 5], memory_max)
+
+    def _close_bucket(self, level, bucket_data):
+        bucket, samples, cpu_sum, cpu_max, memory_sum, memory_max = bucket_data
+        bucket_time = bucket * LEVELS[level][1]
+        self.rings[level].append((bucket_time, cpu_sum / samples, cpu_max,
+                                  memory_sum / samples, memory_max))
+        if level + 1 < len(LEVELS):
+            self._roll(level + 1, bucket_time, samples, cpu_sum, cpu_max, memory_sum, memory_max)
+
+    def level_for(self, start):
+        """Finest level that still holds data from `start` on."""
+        if start is not None:
+            for level, ring in enumerate(self.rings):
+                if len(ring) and ring.time_at(0) <= start:
+                    return level
+        # Whole history, or nothing reaches back that far: oldest data wins
+        oldest = [(ring.time_at(0), level) for level, ring in enumerate(self.rings) if len(ring)]
+        return min(oldest)[1] if oldest else 0
+
+    def query(self, start=None, end=None, level=None):
+        """(time, cpu, memory) rows in [start, end] at the best resolution."""
+        with self._lock:
+            if level is None:
+                level = self.level_for(start)
+            rows = self.rings[level].range(start, end)
+        if level == 0:
+            return rows
+        return [(row[0], row[1], row[3]) for row in rows]
+
+    def rollups(self, level, start=None, end=None):
+        """Full rollup records (time, cpu, cpu_max, memory, memory_max)."""
+        with self._lock:
+            return self.rings[level].range(start, end)
+
+    def history(self, start=None, end=None):
+        """Everything retained in [start, end], oldest first, as rollup records.
+
+        Each level fills in before the next finer one begins: hours up to
+        the first minute, minutes up to the first raw sample, then raw
+        samples (their maximum is the sample itself).
+        """
+        parts = []
+        with self._lock:
+            # Finest first; each coarser level stops where the finer data begins
+            boundary = None
+            for level, ring in enumerate(self.rings):
+                lo = 0 if start is None else ring.bisect(start)
+                hi = len(ring) if end is None else ring.bisect(end, right=True)
+                if boundary is not None:
+                    hi = min(hi, ring.bisect(boundary))
+                rows = ring.records(lo, hi)
+                if level == 0:
+                    rows = [(t, cpu, cpu, memory, memory) for t, cpu, memory in rows]
+                parts.append(rows)
+                if rows:
+                    boundary = rows[0][0]
+        return [row for rows in reversed(parts) for row in rows]
+
+    def latest(self):
+        with self._lock:
+            ring = self.rings[0]
+            return ring.record(len(ring) - 1) if len(ring) else None
+
+    def close(self):
+        with self._lock:
+            # Every view into the mapping has to go before it can be closed
+            for view in [ring.buffer for ring in self.rings] + [self._open, self._buffer]:
+                if view is not None:
+                    view.release()
+            self.rings = []
+            self._open = self._buffer = None
+            if self._mmap is not None:
+                if not self.readonly:
+                    self._mmap.flush()
+                self._mmap.close()
+                self._mmap = None
+
+
+class MetricsStore:
+    """Series per script key, optionally persisted under `directory`.
+
+    A readonly store only reads the files another process writes: nothing
+    is recorded, created or removed.
+    """
+
+    def __init__(self, directory=None, retention=None, readonly=False):
+        self.directory = directory
+        self.retention = retention
+        self.readonly = readonly
+        self.series_by_key = {}
+        self._lock = threading.Lock()
+
+    def path_for(self, key):
+        if not self.directory:
+            return None
+        safe_key = ''.join(c if c.isalnum() or c in '-_.#' else '_' for c in key)
+        return os.path.join(self.directory, f"{safe_key}.tsdb")
+
+    def series(self, key, create=True):
+        if self.readonly:
+            return self._mapped_series(key)
+        with self._lock:
+            series = self.series_by_key.get(key)
+            if series is None:
+                path = self.path_for(key)
+                if not create and not (path and os.path.exists(path)):
+                    return None
+                series = Series(self.retention, path)
+                self.series_by_key[key] = series
+            return series
+
+    def _mapped_series(self, key):
+        # Remapped when the writer has recreated or resized the file
+        path = self.path_for(key)
+        with self._lock:
+            series = self.series_by_key.get(key)
+            try:
+                stat = os.stat(path) if path else None
+            except OSError:
+                stat = None
+            if series is not None and stat is not None and series.identity == (stat.st_ino, stat.st_size):
+                return series
+            if series is not None:
+                series.close()
+                del self.series_by_key[key]
+            if stat is None:
+                return None
+            try:
+                series = Series(path=path, readonly=True)
+            except (OSError, ValueError):
+                return None
+            self.series_by_key[key] = series
+            return series
+
+    def record(self, key, timestamp, cpu, memory):
+        if not self.readonly:
+            self.series(key).append(timestamp, cpu, memory)
+
+    def record_snapshot(self, timestamp, batch):
+        for key, stats in batch.items():
+            if 'cpu' in stats:
+                self.record(key, timestamp, stats['cpu'], stats['memory'])
+
+    def query(self, key, start=None, end=None, level=None):
+        series = self.series(key, create=False)
+        return series.query(start, end, level) if series else []
+
+    def history(self, key, start=None, end=None):
+        series = self.series(key, create=False)
+        return series.history(start, end) if series else []
+
+    def remove(self, key):
+        with self._lock:
+            series = self.series_by_key.pop(key, None)
+        if series:
+            series.close()
+            if series.path and not self.readonly:
+                try:
+                    os.remove(series.path)
+                except OSError:
+                    pass
+
+    def close(self):
+        with self._lock:
+            series_list = list(self.series_by_key.values())
+            self.series_by_key.clear()
+        for series in series_list:
+            series.close()
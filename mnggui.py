@@ -0,0 +1,1807 @@
+import sys
+import os
+import time
+import requests
+import webbrowser
+import json
+from concurrent.futures import Future
+from datetime import datetime
+from collections import deque
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
+                             QHBoxLayout, QPushButton, QTextEdit, QFileDialog, 
+                             QListWidget, QListWidgetItem, QLabel, QMessageBox, QSplitter, 
+                             QPlainTextEdit,
+                             QStatusBar, QAction, QToolBar, QMenu, QTabWidget,
+                             QLineEdit, QGroupBox, QFormLayout, QCheckBox,
+                             QSpinBox, QComboBox, QScrollArea, QFrame, QGridLayout,
+                             QTimeEdit, QDoubleSpinBox, QTableWidget, QTableWidgetItem,
+                             QHeaderView)
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QObject, QTime, QPointF, QDateTime
+from PyQt5.QtGui import QIcon, QFont, QPalette, QColor, QPainter, QTextCursor
+from PyQt5.QtChart import QChart, QChartView, QLineSeries, QValueAxis, QDateTimeAxis
+from mngcore.bus import UpdateBus
+from mngcore.control import ControlServer, DEFAULT_CONTROL_SOCKET
+from mngcore.decimate import lttb
+from mngcore.exporter import MetricsExporter
+from mngcore.fleet import Fleet
+from mngcore.logindex import log_index_from_settings
+from mngcore.report import script_summary, write_report
+from mngcore.monitor import shutdown_monitors
+from mngcore.notify import close_default_dispatcher
+from mngcore.probes import build_probe
+from mngcore.remote import RemoteError, attach
+from mngcore.output import parse_log_line, read_log_tail, iter_log_backwards, script_log_path
+from mngcore.store import ConfigStore, DEFAULT_CONFIG_PATH
+from mngcore.supervisor import default_supervisor
+from mngcore.timeseries import MetricsStore
+
+# English translations only
+translations = {
+    'title': 'MNGserver 🤖',
+    'github': 'GitHub Repository',
+    'add_script': '📁 Add Script',
+    'scripts_list': '📋 Monitored Scripts:',
+    'start_monitoring': '▶️ Start Monitoring',
+    'stop_monitoring': '⏹️ Stop Monitoring',
+    'remove_script': '🗑️ Remove Script',
+    'logs': '📝 Logs',
+    'stats': '📊 Statistics',
+    'settings': '⚙️ Settings',
+    'save_logs': '💾 Save Logs',
+    'clear_logs': '🧹 Clear Logs',
+    'real_time_stats': '📊 Real-time Statistics',
+    'status': 'Status:',
+    'cpu_usage': 'CPU Usage:',
+    'memory_usage': 'Memory Usage:',
+    'restarts': 'Restarts:',
+    'running': '✅ Running',
+    'stopped': '⏹️ Stopped',
+    'basic_settings': 'Basic Settings',
+    'script_path': 'Script Path:',
+    'max_restarts': 'Max Restarts:',
+    'unlimited': 'Unlimited',
+    'check_interval': 'Check Interval:',
+    'telegram_settings': 'Telegram Notifications',
+    'enable_telegram': 'Enable Telegram Notifications',
+    'bot_token': 'Bot Token:',
+    'chat_id': 'Chat ID:',
+    'test_telegram': 'Test Telegram',
+    'save_settings': '💾 Save Settings',
+    'language': 'Language:',
+    'theme': 'Theme:',
+    'light_theme': 'Light',
+    'dark_theme': 'Dark',
+    'cpu_chart': 'CPU Usage (%)',
+    'memory_chart': 'Memory Usage (MB)',
+    'chart_window': 'Window:',
+    'chart_zoom_hint': 'Drag to zoom in, right-click to reset',
+    'system_stats': 'System Statistics',
+    'total_cpu': 'Total CPU:',
+    'total_memory': 'Total Memory:',
+    'script': 'Script:',
+    'telegram_test_success': 'Test message sent successfully!',
+    'telegram_test_error': 'Failed to send test message',
+    'settings_saved': 'Settings saved successfully!',
+    'script_added': 'Script added:',
+    'script_removed': 'Script removed:',
+    'monitoring_started': 'Monitoring started:',
+    'monitoring_stopped': 'Monitoring stopped:',
+    'confirm_remove': 'Are you sure you want to remove this script?',
+    'no_script_selected': 'No script selected',
+    'script_already_exists': 'Script already exists',
+    'script_not_found': 'Script not found',
+    'scheduled_actions': 'Scheduled Actions',
+    'enable_scheduled_restart': 'Enable Scheduled Restart',
+    'restart_every': 'Restart every:',
+    'seconds': 'seconds',
+    'minutes': 'minutes',
+    'hours': 'hours',
+    'export_stats': '📊 Export Statistics',
+    'fleet_report': '📑 Fleet Report',
+    'stats_exported': 'Statistics exported successfully!',
+    'config_load_error': 'Failed to load saved scripts',
+    'restart_policy': 'Restart Policy',
+    'backoff': 'Backoff (first / max):',
+    'stable_uptime': 'Stable after:',
+    'crash_loop': 'Crash loop:',
+    'crash_loop_exits': 'exits within',
+    'crash_loop_pause': 'Crash loop pause:',
+    'resource_limits': 'Resource Limits',
+    'memory_limit': 'Memory limit:',
+    'cpu_limit': 'CPU quota:',
+    'max_open_files': 'Max open files:',
+    'nice': 'Nice:',
+    'ionice': 'I/O priority:',
+    'cgroup': 'cgroup v2 directory:',
+    'off': 'Off',
+    'health_probes': 'Health Probes',
+    'probes_hint': 'JSON list, e.g. [{"type": "http", "port": 8080, "path": "/health"}]',
+    'invalid_probes': 'Invalid health probes',
+    'restart_mode': 'Restart mode:',
+    'listen_address': 'Listen address:',
+    'replica_pool': 'Replicas',
+    'replicas': 'Replicas:',
+    'autoscale': 'Scale with CPU load',
+    'replicas_range': 'Min / max replicas:',
+    'scale_cpu': 'Scale down / up at CPU:',
+    'scale_cooldown': 'Scaling cooldown:',
+    'pin_replicas': 'Pin each replica to its own core',
+    'search_placeholder': 'Search logs, e.g. Traceback or "connection reset"',
+    'search': '🔍 Search',
+    'all_scripts': 'All scripts',
+    'back_to_log': '↩️ Back to Log'
+}
+
+# Chart animations are turned off once more scripts than this are running
+ANIMATED_CHARTS_LIMIT = 10
+
+# Monitor updates are applied to the widgets once per frame
+FRAME_INTERVAL_MS = 50
+
+# Lines kept by a log tab while following new output, the page read from the
+# log file when scrolling back, and the limit while browsing older lines
+LOG_VIEW_LINES = 5000
+LOG_HISTORY_PAGE = 1000
+LOG_HISTORY_LINES = 50000
+
+# Log search: time windows offered and the most lines shown
+SEARCH_WINDOWS = (('15 min', 900), ('1 h', 3600), ('6 h', 6 * 3600), ('24 h', 86400),
+                  ('7 days', 7 * 86400), ('All', None))
+SEARCH_LIMIT = 2000
+
+# Statistics charts: time windows offered, and the most points drawn per line
+CHART_WINDOWS = (('5 min', 300), ('1 h', 3600), ('24 h', 86400), ('7 d', 7 * 86400))
+CHART_POINTS = 300
+# Recent samples kept by the tab for when there is no stored history
+LIVE_SAMPLES = 600
+
+
+def format_log_line(line):
+    """Log file line -> the form shown in the log tab."""
+    parsed = parse_log_line(line)
+    if parsed is None:
+        return line
+    timestamp, stream, text = parsed
+    if stream in ('stdout', 'mngserver'):
+        return f"[{timestamp}] {text}"
+    return f"[{timestamp}] [{stream}] {text}"
+
+class ResourceChart(QChartView):
+    # Seconds; None when the zoom is reset
+    zoom_requested = pyqtSignal(object, object)
+
+    def __init__(self, title, y_floor=1, animated=True):
+        super().__init__()
+        self.chart = QChart()
+        self.chart.setTitle(title)
+        self.chart.legend().hide()
+        self.set_animated(animated)
+        
+        self.series = QLineSeries()
+        self.series.setPen(QColor(42, 130, 218))
+        self.chart.addSeries(self.series)
+        
+        self.axis_x = QDateTimeAxis()
+        self.axis_x.setTickCount(5)
+        self.axis_x.setGridLineVisible(True)
+        
+        self.axis_y = QValueAxis()
+        self.axis_y.setGridLineVisible(True)
+        # Smallest top of the y axis, so an idle script is not drawn as noise
+        self.y_floor = y_floor
+        
+        self.chart.addAxis(self.axis_x, Qt.AlignBottom)
+        self.chart.addAxis(self.axis_y, Qt.AlignLeft)
+        self.series.attachAxis(self.axis_x)
+        self.series.attachAxis(self.axis_y)
+        
+        self.setChart(self.chart)
+        self.setRenderHint(QPainter.Antialiasing)
+        self.setRubberBand(QChartView.HorizontalRubberBand)
+        self.setToolTip(translations['chart_zoom_hint'])
+        self.shown_range = None
+
+    def set_animated(self, animated):
+        self.chart.setAnimationOptions(QChart.SeriesAnimations if animated else QChart.NoAnimation)
+
+    def set_points(self, points, start, end):
+        """Draws (time, value) points over [start, end], scaling the y axis to fit."""
+        self.shown_range = (int(start * 1000), int(end * 1000))
+        self.series.replace([QPointF(t * 1000, value) for t, value in points])
+        self.axis_x.setFormat('hh:mm:ss' if end - start <= 900 else
+                              'hh:mm' if end - start <= 86400 else 'MM-dd hh:mm')
+        self.axis_x.setRange(*(QDateTime.fromMSecsSinceEpoch(ms) for ms in self.shown_range))
+        top = max((value for _, value in points), default=0)
+        self.axis_y.setRange(0, max(top * 1.1, self.y_floor))
+        self.axis_y.applyNiceNumbers()
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.RightButton:
+            # The default would zoom out one step on the decimated data
+            self.zoom_requested.emit(None, None)
+            event.accept()
+            return
+        super().mouseReleaseEvent(event)
+        if event.button() == Qt.LeftButton:
+            # The rubber band zoomed the axis; reload the range at full detail
+            shown = (self.axis_x.min().toMSecsSinceEpoch(), self.axis_x.max().toMSecsSinceEpoch())
+            if self.shown_range and shown != self.shown_range:
+                start, end = shown[0] / 1000, shown[1] / 1000
+                self.zoom_requested.emit(start, max(end, start + 1))
+
+class ScriptLogTab(QWidget):
+    def __init__(self, script_name, parent=None, log_path=None, log_index=None):
+        super().__init__(parent)
+        self.script_name = script_name
+        self.parent = parent
+        self.log_path = log_path
+        self.log_index = log_index
+        # Reader positioned before the oldest line shown, while browsing history
+        self.history_lines = None
+        self.history_exhausted = False
+        self.history_enabled = bool(log_path)
+        self.initUI()
+        if log_path:
+            self.load_history(log_path)
+        
+    def initUI(self):
+        layout = QVBoxLayout(self)
+        
+        log_label = QLabel(f"{translations['logs']} - {self.script_name}")
+        log_label.setStyleSheet("color: white; font-weight: bold; font-size: 14px;")
+        
+        # The document drops its oldest blocks past the limit, so memory stays
+        # bounded however long the script runs
+        self.log_text = QPlainTextEdit()
+        self.log_text.setReadOnly(True)
+        self.log_text.setUndoRedoEnabled(False)
+        self.log_text.setMaximumBlockCount(LOG_VIEW_LINES)
+        self.log_text.verticalScrollBar().valueChanged.connect(self.on_scroll)
+        log_style = """
+            QPlainTextEdit {
+                font-family: 'Courier New';
+                font-size: 11px;
+                background: #454545;
+                color: white;
+                border: 1px solid #555;
+                border-radius: 5px;
+            }
+        """
+        self.log_text.setStyleSheet(log_style)
+        
+        # Search over the log index; results replace the live view until closed
+        search_row = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText(translations['search_placeholder'])
+        self.search_edit.returnPressed.connect(self.run_search)
+        self.search_window = QComboBox()
+        for label, seconds in SEARCH_WINDOWS:
+            self.search_window.addItem(label, seconds)
+        self.search_window.setCurrentIndex(2)
+        self.search_all = QCheckBox(translations['all_scripts'])
+        self.search_btn = QPushButton(translations['search'])
+        self.search_btn.clicked.connect(self.run_search)
+        self.back_btn = QPushButton(translations['back_to_log'])
+        self.back_btn.clicked.connect(self.close_search)
+        self.back_btn.hide()
+        search_row.addWidget(self.search_edit, 1)
+        search_row.addWidget(self.search_window)
+        search_row.addWidget(self.search_all)
+        search_row.addWidget(self.search_btn)
+        search_row.addWidget(self.back_btn)
+        
+        self.search_status = QLabel()
+        self.search_status.setStyleSheet("color: #bbb;")
+        self.search_status.hide()
+        self.search_results = QPlainTextEdit()
+        self.search_results.setReadOnly(True)
+        self.search_results.setUndoRedoEnabled(False)
+        self.search_results.setStyleSheet(log_style)
+        self.search_results.hide()
+        
+        # Log buttons
+        log_buttons = QHBoxLayout()
+        
+        self.save_log_btn = QPushButton(translations['save_logs'])
+        self.save_log_btn.clicked.connect(self.save_logs)
+        self.save_log_btn.setStyleSheet("""
+            QPushButton {
+                padding: 8px;
+                background: #27ae60;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                margin: 2px;
+            }
+            QPushButton:hover {
+                background: #229954;
+            }
+        """)
+        
+        self.clear_log_btn = QPushButton(translations['clear_logs'])
+        self.clear_log_btn.clicked.connect(self.clear_logs)
+        self.clear_log_btn.setStyleSheet("""
+            QPushButton {
+                padding: 8px;
+                background: #9b59b6;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                margin: 2px;
+            }
+            QPushButton:hover {
+                background: #8e44ad;
+            }
+        """)
+        
+        log_buttons.addWidget(self.save_log_btn)
+        log_buttons.addWidget(self.clear_log_btn)
+        log_buttons.addStretch()
+        
+        layout.addWidget(log_label)
+        if self.log_index is not None:
+            layout.addLayout(search_row)
+            layout.addWidget(self.search_status)
+        layout.addWidget(self.log_text)
+        layout.addWidget(self.search_results)
+        layout.addLayout(log_buttons)
+    
+    def add_log(self, message):
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_message = f"[{timestamp}] {message}"
+        # Follows the output only while the view is scrolled to the bottom
+        self.log_text.appendPlainText(log_message)
+    
+    def load_history(self, log_path, max_lines=500):
+        # Tabs are created lazily; show what was logged before that from disk
+        lines = [format_log_line(line) for line in read_log_tail(log_path, max_lines)]
+        if lines:
+            self.log_text.setPlainText('\n'.join(lines))
+            # Scrolls to the end once the widget is laid out
+            self.log_text.moveCursor(QTextCursor.End)
+    
+    def add_entries(self, entries, dropped=0):
+        # One append per frame for everything the monitor logged since the last one
+        text = []
+        if dropped:
+            text.append(f"[{entries[0][0]}] … {dropped} lines skipped (output too fast to display, see log file)")
+        for timestamp, stream, lines in entries:
+            if stream in (None, 'stdout'):
+                prefix = f"[{timestamp}] "
+            else:
+                prefix = f"[{timestamp}] [{stream}] "
+            text.extend(prefix + line for line in lines)
+        self.log_text.appendPlainText('\n'.join(text))
+    
+    def on_scroll(self, value):
+        scroll_bar = self.log_text.verticalScrollBar()
+        if value == scroll_bar.minimum() and scroll_bar.maximum() > 0:
+            QTimer.singleShot(0, self.load_older_lines)
+        elif value == scroll_bar.maximum() and self.history_lines is not None:
+            # Back at the bottom: drop the loaded history again
+            self.history_lines = None
+            self.history_exhausted = False
+            self.log_text.setMaximumBlockCount(LOG_VIEW_LINES)
+    
+    def read_older_lines(self):
+        """Yields file lines older than the first one shown, newest first."""
+        first = self.log_text.document().firstBlock().text()
+        anchor = first[1:20] if first[:1] == '[' and first[20:22] == '] ' else None
+        passed_first = anchor is None
+        for line in iter_log_backwards(self.log_path):
+            display = format_log_line(line)
+            if not passed_first:
+                if display == first:
+                    passed_first = True
+                    continue
+                if line[1:20] >= anchor:
+                    continue
+                passed_first = True
+            yield display
+    
+    def load_older_lines(self):
+        if not self.history_enabled or self.history_exhausted:
+            return
+        document = self.log_text.document()
+        room = LOG_HISTORY_LINES - document.blockCount()
+        if room <= 0:
+            return
+        
+        if self.history_lines is None:
+            self.history_lines = self.read_older_lines()
+        lines = []
+        for line in self.history_lines:
+            lines.append(line)
+            if len(lines) >= min(LOG_HISTORY_PAGE, room):
+                break
+        if not lines:
+            self.history_exhausted = True
+            return
+        lines.reverse()
+        
+        scroll_bar = self.log_text.verticalScrollBar()
+        old_maximum = scroll_bar.maximum()
+        old_value = scroll_bar.value()
+        self.log_text.setMaximumBlockCount(LOG_HISTORY_LINES)
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.Start)
+        cursor.insertText('\n'.join(lines) + '\n')
+        # Keep the line the user was looking at in place
+        scroll_bar.setValue(old_value + scroll_bar.maximum() - old_maximum)
+    
+    def run_search(self):
+        query = self.search_edit.text().strip()
+        if not query:
+            self.close_search()
+            return
+        seconds = self.search_window.currentData()
+        scripts = None if self.search_all.isChecked() else [self.script_name]
+        started = time.perf_counter()
+        try:
+            hits = self.log_index.search(query, since=time.time() - seconds if seconds else None,
+                                         scripts=scripts, limit=SEARCH_LIMIT)
+        except ValueError as e:
+            self.search_status.setText(f"❌ {e}")
+            self.search_status.show()
+            return
+        elapsed = (time.perf_counter() - started) * 1000
+        
+        lines = []
+        for hit in reversed(hits):
+            timestamp = datetime.fromtimestamp(hit.time).strftime("%Y-%m-%d %H:%M:%S")
+            source = f"[{hit.script}] " if scripts is None else ''
+            stream = '' if hit.stream == 'stdout' else f"[{hit.stream}] "
+            lines.append(f"[{timestamp}] {source}{stream}{hit.text}")
+        more = f" (newest {SEARCH_LIMIT} shown)" if len(hits) >= SEARCH_LIMIT else ''
+        self.search_status.setText(f"{len(hits)} line(s) in {elapsed:.0f} ms{more}")
+        self.search_status.show()
+        self.search_results.setPlainText('\n'.join(lines))
+        self.search_results.moveCursor(QTextCursor.End)
+        self.log_text.hide()
+        self.search_results.show()
+        self.back_btn.show()
+    
+    def close_search(self):
+        self.search_results.clear()
+        self.search_results.hide()
+        self.search_status.hide()
+        self.back_btn.hide()
+        self.log_text.show()
+    
+    def clear_logs(self):
+        self.log_text.clear()
+        self.history_lines = None
+        # Cleared on purpose: don't bring the old lines back on scroll
+        self.history_enabled = False
+        if self.parent:
+            self.parent.log("SYSTEM", f"Logs cleared for {self.script_name}")
+    
+    def save_logs(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, f"Save Logs - {self.script_name}", "", "Text Files (*.txt)"
+        )
+        
+        if file_path:
+            # Saves what is shown: the search results while searching
+            view = self.search_results if self.search_results.isVisible() else self.log_text
+            try:
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    f.write(view.toPlainText())
+                if self.parent:
+                    self.parent.log("SYSTEM", f"Logs for {self.script_name} saved to: {file_path}")
+            except Exception as e:
+                if self.parent:
+                    self.parent.log("SYSTEM", f"Error saving logs for {self.script_name}: {e}")
+
+class ScriptStatsTab(QWidget):
+    def __init__(self, script_name, parent=None, animated=True):
+        super().__init__(parent)
+        self.script_name = script_name
+        self.parent = parent
+        self.animated = animated
+        # Seconds shown, and the (start, end) range zoomed into if any
+        self.window = CHART_WINDOWS[0][1]
+        self.zoom = None
+        # Rollup-shaped rows, for when the metrics store has nothing (attached without metrics_dir)
+        self.live = deque(maxlen=LIVE_SAMPLES)
+        self.charts_loaded = 0
+        # Loaded when first shown, so the stored history appears at once
+        self.charts_stale = True
+        self.initUI()
+        
+    def initUI(self):
+        layout = QVBoxLayout(self)
+        
+        stats_label = QLabel(f"{translations['stats']} - {self.script_name}")
+        stats_label.setStyleSheet("color: white; font-weight: bold; font-size: 14px;")
+        
+        window_layout = QHBoxLayout()
+        window_label = QLabel(translations['chart_window'])
+        window_label.setStyleSheet("color: white;")
+        self.window_combo = QComboBox()
+        for label, seconds in CHART_WINDOWS:
+            self.window_combo.addItem(label, seconds)
+        self.window_combo.currentIndexChanged.connect(self.set_window)
+        window_layout.addWidget(window_label)
+        window_layout.addWidget(self.window_combo)
+        window_layout.addStretch()
+        
+        # Create charts
+        charts_layout = QHBoxLayout()
+        
+        self.cpu_chart = ResourceChart(translations['cpu_chart'], 10, self.animated)
+        self.memory_chart = ResourceChart(translations['memory_chart'], 10, self.animated)
+        self.cpu_chart.zoom_requested.connect(self.set_zoom)
+        self.memory_chart.zoom_requested.connect(self.set_zoom)
+        
+        charts_layout.addWidget(self.cpu_chart)
+        charts_layout.addWidget(self.memory_chart)
+        
+        # Current stats
+        stats_group = QGroupBox("Current Statistics")
+        stats_group.setStyleSheet("color: white;")
+        stats_form = QFormLayout()
+        
+        self.status_label = QLabel("Stopped")
+        self.status_label.setStyleSheet("color: #e74c3c;")
+        
+        self.cpu_label = QLabel("0.0%")
+        self.cpu_label.setStyleSheet("color: white;")
+        
+        self.memory_label = QLabel("0.0 MB")
+        self.memory_label.setStyleSheet("color: white;")
+        
+        self.restarts_label = QLabel("0")
+        self.restarts_label.setStyleSheet("color: white;")
+        
+        self.uptime_label = QLabel("00:00:00")
+        self.uptime_label.setStyleSheet("color: white;")
+        
+        self.processes_label = QLabel("1")
+        self.processes_label.setStyleSheet("color: white;")
+        
+        self.threads_label = QLabel("0")
+        self.threads_label.setStyleSheet("color: white;")
+        
+        self.fds_label = QLabel("0")
+        self.fds_label.setStyleSheet("color: white;")
+        
+        self.io_label = QLabel("0.0 / 0.0 MB")
+        self.io_label.setStyleSheet("color: white;")
+        
+        stats_form.addRow(QLabel("Status:"), self.status_label)
+        stats_form.addRow(QLabel("CPU Usage:"), self.cpu_label)
+        stats_form.addRow(QLabel("Memory Usage:"), self.memory_label)
+        stats_form.addRow(QLabel("Restarts:"), self.restarts_label)
+        stats_form.addRow(QLabel("Uptime:"), self.uptime_label)
+        stats_form.addRow(QLabel("Processes:"), self.processes_label)
+        stats_form.addRow(QLabel("Threads:"), self.threads_label)
+        stats_form.addRow(QLabel("Open Files:"), self.fds_label)
+        stats_form.addRow(QLabel("Disk Read / Write:"), self.io_label)
+        stats_group.setLayout(stats_form)
+        
+        # Per-replica breakdown, shown for replica pools only
+        self.replicas_table = QTableWidget(0, 6)
+        self.replicas_table.setHorizontalHeaderLabels(["Replica", "Status", "CPU %", "Memory MB", "Uptime", "Restarts"])
+        self.replicas_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.replicas_table.verticalHeader().hide()
+        self.replicas_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.replicas_table.setMaximumHeight(160)
+        self.replicas_table.hide()
+        
+        # Export button
+        self.export_btn = QPushButton(translations['export_stats'])
+        self.export_btn.clicked.connect(self.export_stats)
+        self.export_btn.setStyleSheet("""
+            QPushButton {
+                padding: 8px;
+                background: #3498db;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                margin: 2px;
+            }
+            QPushButton:hover {
+                background: #2980b9;
+            }
+        """)
+        
+        layout.addWidget(stats_label)
+        layout.addLayout(window_layout)
+        layout.addLayout(charts_layout)
+        layout.addWidget(stats_group)
+        layout.addWidget(self.replicas_table)
+        layout.addWidget(self.export_btn)
+    
+    def update_stats(self, stats):
+        self.cpu_label.setText(f"{stats['cpu']}%")
+        self.memory_label.setText(f"{stats['memory']} MB")
+        self.restarts_label.setText(f"{stats['restarts']}")
+        self.uptime_label.setText(stats.get('uptime', '00:00:00'))
+        self.processes_label.setText(f"{stats.get('processes', 1)}")
+        self.threads_label.setText(f"{stats.get('threads', 0)}")
+        self.fds_label.setText(f"{stats.get('fds', 0)}")
+        read_mb = stats.get('read_bytes', 0) / 1024 / 1024
+        write_mb = stats.get('write_bytes', 0) / 1024 / 1024
+        self.io_label.setText(f"{read_mb:.1f} / {write_mb:.1f} MB")
+        self.update_replicas(stats.get('replica_stats'))
+        
+        # Update charts
+        self.live.append((time.time(), stats['cpu'], stats['cpu'], stats['memory'], stats['memory']))
+        self.update_charts()
+    
+    def update_charts(self):
+        if self.zoom is not None:
+            # A zoomed view stays where the user put it
+            return
+        if not self.isVisible():
+            # Hidden tabs catch up when shown
+            self.charts_stale = True
+            return
+        # One decimated point spans window / CHART_POINTS seconds; nothing visible changes sooner
+        if time.time() - self.charts_loaded >= self.window / CHART_POINTS:
+            self.load_charts()
+    
+    def load_charts(self):
+        self.charts_stale = False
+        self.charts_loaded = time.time()
+        start, end = self.zoom or (self.charts_loaded - self.window, self.charts_loaded)
+        rows = self.parent.metrics.history(self.script_name, start, end) if self.parent else []
+        if not rows:
+            rows = [row for row in self.live if start <= row[0] <= end]
+        # LTTB keeps the spikes while bounding what QtCharts has to draw
+        self.cpu_chart.set_points([(row[0], row[1]) for row in lttb(rows, CHART_POINTS, 0, 1)], start, end)
+        self.memory_chart.set_points([(row[0], row[3]) for row in lttb(rows, CHART_POINTS, 0, 3)], start, end)
+    
+    def set_window(self, index):
+        self.window = self.window_combo.itemData(index)
+        self.zoom = None
+        self.load_charts()
+    
+    def set_zoom(self, start, end):
+        self.zoom = (start, end) if start is not None else None
+        self.load_charts()
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.charts_stale:
+            self.load_charts()
+    
+    def update_replicas(self, replica_stats):
+        if not replica_stats:
+            self.replicas_table.hide()
+            return
+        self.replicas_table.setRowCount(len(replica_stats))
+        for row, (index, replica) in enumerate(replica_stats.items()):
+            core = replica.get('core')
+            values = [f"#{index}" if core is None else f"#{index} (core {core})", replica['status'],
+                      f"{replica['cpu']}", f"{replica['memory']}", replica['uptime'], f"{replica['restarts']}"]
+            for column, value in enumerate(values):
+                self.replicas_table.setItem(row, column, QTableWidgetItem(value))
+        self.replicas_table.show()
+    
+    def set_animated(self, animated):
+        self.animated = animated
+        self.cpu_chart.set_animated(animated)
+        self.memory_chart.set_animated(animated)
+    
+    def update_status(self, status, start_time=None):
+        if status == 'running':
+            self.status_label.setText("Running")
+            self.status_label.setStyleSheet("color: #27ae60;")
+            if start_time:
+                self.start_time = start_time
+        elif status == 'stopped':
+            self.status_label.setText("Stopped")
+            self.status_label.setStyleSheet("color: #e74c3c;")
+            self.start_time = None
+        else:
+            self.status_label.setText(status.capitalize())
+            self.status_label.setStyleSheet("color: #f39c12;")
+    
+    def export_stats(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, f"Export Statistics - {self.script_name}", "", "HTML Files (*.html)"
+        )
+        
+        if file_path:
+            try:
+                self.generate_html_report(file_path)
+                if self.parent:
+                    self.parent.log("SYSTEM", f"Statistics for {self.script_name} exported to: {file_path}")
+                    QMessageBox.information(self, "Success", translations['stats_exported'])
+            except Exception as e:
+                if self.parent:
+                    self.parent.log("SYSTEM", f"Error exporting stats for {self.script_name}: {e}")
+    
+    def generate_html_report(self, file_path):
+        # Streams the full retained history, decimated, with the chart script embedded
+        if self.parent:
+            write_report(file_path, [script_summary(self.parent.monitors[self.script_name])], self.parent.metrics)
+
+class SettingsTab(QWidget):
+    def __init__(self, script_info, parent=None):
+        super().__init__(parent)
+        self.script_info = script_info
+        self.parent = parent
+        self.initUI()
+
+    def initUI(self):
+        layout = QVBoxLayout()
+        
+        # Basic settings
+        basic_group = QGroupBox(translations['basic_settings'])
+        basic_layout = QFormLayout()
+        
+        self.script_path_edit = QLineEdit(self.script_info['path'])
+        self.script_path_edit.setReadOnly(True)
+        self.browse_btn = QPushButton("...")
+        self.browse_btn.clicked.connect(self.browse_script)
+        
+        path_layout = QHBoxLayout()
+        path_layout.addWidget(self.script_path_edit)
+        path_layout.addWidget(self.browse_btn)
+        
+        self.max_restarts_spin = QSpinBox()
+        # 0: never restart; the minimum (-1) is shown as "Unlimited"
+        self.max_restarts_spin.setRange(-1, 100)
+        self.max_restarts_spin.setSpecialValueText(translations['unlimited'])
+        self.max_restarts_spin.setValue(self.script_info.get('max_restarts', 5))
+        
+        self.check_interval_spin = QSpinBox()
+        self.check_interval_spin.setRange(1, 300)
+        self.check_interval_spin.setValue(self.script_info.get('check_interval', 10))
+        self.check_interval_spin.setSuffix("s")
+        
+        basic_layout.addRow(translations['script_path'], path_layout)
+        basic_layout.addRow(translations['max_restarts'], self.max_restarts_spin)
+        basic_layout.addRow(translations['check_interval'], self.check_interval_spin)
+        basic_group.setLayout(basic_layout)
+        
+        # Restart policy: backoff between crashes, reset after a stable run
+        policy_group = QGroupBox(translations['restart_policy'])
+        policy_layout = QFormLayout()
+        
+        self.backoff_initial_spin = QDoubleSpinBox()
+        self.backoff_initial_spin.setRange(0.1, 3600)
+        self.backoff_initial_spin.setValue(self.script_info.get('backoff_initial', 1.0))
+        self.backoff_initial_spin.setSuffix("s")
+        
+        self.backoff_max_spin = QDoubleSpinBox()
+        self.backoff_max_spin.setRange(1, 86400)
+        self.backoff_max_spin.setValue(self.script_info.get('backoff_max', 300.0))
+        self.backoff_max_spin.setSuffix("s")
+        
+        backoff_layout = QHBoxLayout()
+        backoff_layout.addWidget(self.backoff_initial_spin)
+        backoff_layout.addWidget(self.backoff_max_spin)
+        backoff_layout.addStretch()
+        
+        self.stable_uptime_spin = QSpinBox()
+        self.stable_uptime_spin.setRange(1, 86400)
+        self.stable_uptime_spin.setValue(self.script_info.get('stable_uptime', 300))
+        self.stable_uptime_spin.setSuffix("s")
+        
+        self.crash_loop_count_spin = QSpinBox()
+        self.crash_loop_count_spin.setRange(2, 1000)
+        self.crash_loop_count_spin.setValue(self.script_info.get('crash_loop_count', 5))
+        
+        self.crash_loop_window_spin = QSpinBox()
+        self.crash_loop_window_spin.setRange(1, 86400)
+        self.crash_loop_window_spin.setValue(self.script_info.get('crash_loop_window', 60))
+        self.crash_loop_window_spin.setSuffix("s")
+        
+        crash_loop_layout = QHBoxLayout()
+        crash_loop_layout.addWidget(self.crash_loop_count_spin)
+        crash_loop_layout.addWidget(QLabel(translations['crash_loop_exits']))
+        crash_loop_layout.addWidget(self.crash_loop_window_spin)
+        crash_loop_layout.addStretch()
+        
+        self.crash_loop_pause_spin = QSpinBox()
+        self.crash_loop_pause_spin.setRange(1, 86400)
+        self.crash_loop_pause_spin.setValue(self.script_info.get('crash_loop_pause', 600))
+        self.crash_loop_pause_spin.setSuffix("s")
+        
+        policy_layout.addRow(translations['backoff'], backoff_layout)
+        policy_layout.addRow(translations['stable_uptime'], self.stable_uptime_spin)
+        policy_layout.addRow(translations['crash_loop'], crash_loop_layout)
+        policy_layout.addRow(translations['crash_loop_pause'], self.crash_loop_pause_spin)
+        policy_group.setLayout(policy_layout)
+        
+        # Resource limits (0 = no limit)
+        limits_group = QGroupBox(translations['resource_limits'])
+        limits_layout = QFormLayout()
+        
+        self.memory_limit_spin = QSpinBox()
+        self.memory_limit_spin.setRange(0, 1048576)
+        self.memory_limit_spin.setSpecialValueText(translations['off'])
+        self.memory_limit_spin.setValue(self.script_info.get('memory_limit_mb', 0))
+        self.memory_limit_spin.setSuffix(" MB")
+        
+        self.cpu_limit_spin = QSpinBox()
+        self.cpu_limit_spin.setRange(0, 6400)
+        self.cpu_limit_spin.setSpecialValueText(translations['off'])
+        self.cpu_limit_spin.setValue(self.script_info.get('cpu_limit_percent', 0))
+        self.cpu_limit_spin.setSuffix("%")
+        
+        self.max_open_files_spin = QSpinBox()
+        self.max_open_files_spin.setRange(0, 1048576)
+        self.max_open_files_spin.setSpecialValueText(translations['off'])
+        self.max_open_files_spin.setValue(self.script_info.get('max_open_files', 0))
+        
+        self.nice_spin = QSpinBox()
+        self.nice_spin.setRange(-20, 19)
+        self.nice_spin.setValue(self.script_info.get('nice', 0))
+        
+        self.ionice_class_combo = QComboBox()
+        self.ionice_class_combo.addItems(['', 'best-effort', 'idle', 'realtime'])
+        self.ionice_class_combo.setCurrentText(self.script_info.get('ionice_class', ''))
+        self.ionice_level_spin = QSpinBox()
+        self.ionice_level_spin.setRange(0, 7)
+        self.ionice_level_spin.setValue(self.script_info.get('ionice_level', 4))
+        
+        ionice_layout = QHBoxLayout()
+        ionice_layout.addWidget(self.ionice_class_combo)
+        ionice_layout.addWidget(self.ionice_level_spin)
+        ionice_layout.addStretch()
+        
+        self.cgroup_edit = QLineEdit(self.script_info.get('cgroup', ''))
+        self.cgroup_edit.setPlaceholderText("/sys/fs/cgroup/...")
+        
+        limits_layout.addRow(translations['memory_limit'], self.memory_limit_spin)
+        limits_layout.addRow(translations['cpu_limit'], self.cpu_limit_spin)
+        limits_layout.addRow(translations['max_open_files'], self.max_open_files_spin)
+        limits_layout.addRow(translations['nice'], self.nice_spin)
+        limits_layout.addRow(translations['ionice'], ionice_layout)
+        limits_layout.addRow(translations['cgroup'], self.cgroup_edit)
+        limits_group.setLayout(limits_layout)
+        
+        # Replica pool (see mngcore/pool.py)
+        pool_group = QGroupBox(translations['replica_pool'])
+        pool_layout = QFormLayout()
+        
+        self.replicas_spin = QSpinBox()
+        self.replicas_spin.setRange(1, 256)
+        self.replicas_spin.setValue(self.script_info.get('replicas', 1))
+        
+        self.autoscale_check = QCheckBox(translations['autoscale'])
+        self.autoscale_check.setChecked(self.script_info.get('autoscale', False))
+        
+        self.replicas_min_spin = QSpinBox()
+        self.replicas_min_spin.setRange(1, 256)
+        self.replicas_min_spin.setValue(self.script_info.get('replicas_min', 1))
+        self.replicas_max_spin = QSpinBox()
+        self.replicas_max_spin.setRange(1, 256)
+        self.replicas_max_spin.setValue(self.script_info.get('replicas_max', 4))
+        
+        replicas_range_layout = QHBoxLayout()
+        replicas_range_layout.addWidget(self.replicas_min_spin)
+        replicas_range_layout.addWidget(self.replicas_max_spin)
+        replicas_range_layout.addStretch()
+        
+        # Percent of one core, averaged over the replicas
+        self.scale_down_cpu_spin = QSpinBox()
+        self.scale_down_cpu_spin.setRange(0, 100)
+        self.scale_down_cpu_spin.setValue(self.script_info.get('scale_down_cpu', 20))
+        self.scale_down_cpu_spin.setSuffix("%")
+        self.scale_up_cpu_spin = QSpinBox()
+        self.scale_up_cpu_spin.setRange(1, 100)
+        self.scale_up_cpu_spin.setValue(self.script_info.get('scale_up_cpu', 80))
+        self.scale_up_cpu_spin.setSuffix("%")
+        
+        scale_cpu_layout = QHBoxLayout()
+        scale_cpu_layout.addWidget(self.scale_down_cpu_spin)
+        scale_cpu_layout.addWidget(self.scale_up_cpu_spin)
+        scale_cpu_layout.addStretch()
+        
+        self.scale_cooldown_spin = QSpinBox()
+        self.scale_cooldown_spin.setRange(1, 86400)
+        self.scale_cooldown_spin.setValue(self.script_info.get('scale_cooldown', 60))
+        self.scale_cooldown_spin.setSuffix("s")
+        
+        self.pin_replicas_check = QCheckBox(translations['pin_replicas'])
+        self.pin_replicas_check.setChecked(self.script_info.get('pin_replicas', False))
+        
+        pool_layout.addRow(translations['replicas'], self.replicas_spin)
+        pool_layout.addRow(self.autoscale_check)
+        pool_layout.addRow(translations['replicas_range'], replicas_range_layout)
+        pool_layout.addRow(translations['scale_cpu'], scale_cpu_layout)
+        pool_layout.addRow(translations['scale_cooldown'], self.scale_cooldown_spin)
+        pool_layout.addRow(self.pin_replicas_check)
+        pool_group.setLayout(pool_layout)
+        
+        # Health probes, edited as JSON (see mngcore/probes.py)
+        probes_group = QGroupBox(translations['health_probes'])
+        probes_layout = QVBoxLayout()
+        self.probes_edit = QPlainTextEdit()
+        self.probes_edit.setPlaceholderText(translations['probes_hint'])
+        probes = self.script_info.get('probes') or []
+        self.probes_edit.setPlainText(json.dumps(probes, indent=2) if probes else '')
+        self.probes_edit.setMaximumHeight(120)
+        probes_layout.addWidget(self.probes_edit)
+        probes_group.setLayout(probes_layout)
+        
+        # Scheduled actions - УПРОЩЕННАЯ ВЕРСИЯ
+        scheduled_group = QGroupBox(translations['scheduled_actions'])
+        scheduled_layout = QFormLayout()
+        
+        self.scheduled_restart_enable = QCheckBox(translations['enable_scheduled_restart'])
+        self.scheduled_restart_enable.setChecked(self.script_info.get('scheduled_restart_enabled', False))
+        self.scheduled_restart_enable.stateChanged.connect(self.toggle_scheduled_fields)
+        
+        # Поле для числа
+        self.restart_interval_value_spin = QSpinBox()
+        self.restart_interval_value_spin.setRange(1, 1000)
+        self.restart_interval_value_spin.setValue(self.script_info.get('restart_interval_value', 1))
+        
+        # Выпадающий список для единиц измерения
+        self.restart_interval_unit_combo = QComboBox()
+        self.restart_interval_unit_combo.addItems(['seconds', 'minutes', 'hours'])
+        self.restart_interval_unit_combo.setCurrentText(self.script_info.get('restart_interval_unit', 'hours'))
+        
+        # Группируем число и единицы измерения в одну строку
+        interval_layout = QHBoxLayout()
+        interval_layout.addWidget(self.restart_interval_value_spin)
+        interval_layout.addWidget(self.restart_interval_unit_combo)
+        interval_layout.addStretch()
+        
+        # Overlap mode keeps serving while the next instance starts
+        self.restart_mode_combo = QComboBox()
+        self.restart_mode_combo.addItems(['restart', 'overlap'])
+        self.restart_mode_combo.setCurrentText(self.script_info.get('restart_mode', 'restart'))
+        
+        self.listen_edit = QLineEdit(self.script_info.get('listen', ''))
+        self.listen_edit.setPlaceholderText("127.0.0.1:8080")
+        
+        scheduled_layout.addRow(self.scheduled_restart_enable)
+        scheduled_layout.addRow(QLabel(translations['restart_every']), interval_layout)
+        scheduled_layout.addRow(translations['restart_mode'], self.restart_mode_combo)
+        scheduled_layout.addRow(translations['listen_address'], self.listen_edit)
+        scheduled_group.setLayout(scheduled_layout)
+        
+        # Telegram settings
+        telegram_group = QGroupBox(translations['telegram_settings'])
+        telegram_layout = QFormLayout()
+        
+        self.telegram_enable = QCheckBox(translations['enable_telegram'])
+        self.telegram_enable.setChecked(self.script_info.get('telegram_enabled', False))
+        self.telegram_enable.stateChanged.connect(self.toggle_telegram_fields)
+        
+        self.telegram_token_edit = QLineEdit(self.script_info.get('telegram_token', ''))
+        self.telegram_token_edit.setPlaceholderText("bot token")
+        
+        self.telegram_chat_id_edit = QLineEdit(self.script_info.get('telegram_chat_id', ''))
+        self.telegram_chat_id_edit.setPlaceholderText("chat id")
+        
+        self.test_telegram_btn = QPushButton(translations['test_telegram'])
+        self.test_telegram_btn.clicked.connect(self.test_telegram)
+        
+        telegram_layout.addRow(self.telegram_enable)
+        telegram_layout.addRow(translations['bot_token'], self.telegram_token_edit)
+        telegram_layout.addRow(translations['chat_id'], self.telegram_chat_id_edit)
+        telegram_layout.addRow(self.test_telegram_btn)
+        telegram_group.setLayout(telegram_layout)
+        
+        # Save button
+        self.save_btn = QPushButton(translations['save_settings'])
+        self.save_btn.clicked.connect(self.save_settings)
+        self.save_btn.setStyleSheet("""
+            QPushButton {
+                padding: 10px;
+                background: #27ae60;
+                color: white;
+                border: none;
+                border-radius: 5px;
+            }
+            QPushButton:hover {
+                background: #229954;
+            }
+        """)
+        
+        layout.addWidget(basic_group)
+        layout.addWidget(policy_group)
+        layout.addWidget(limits_group)
+        layout.addWidget(pool_group)
+        layout.addWidget(probes_group)
+        layout.addWidget(scheduled_group)
+        layout.addWidget(telegram_group)
+        layout.addStretch()
+        layout.addWidget(self.save_btn)
+        
+        self.setLayout(layout)
+        self.toggle_scheduled_fields()
+        self.toggle_telegram_fields()
+        
+    def toggle_scheduled_fields(self):
+        enabled = self.scheduled_restart_enable.isChecked()
+        self.restart_interval_value_spin.setEnabled(enabled)
+        self.restart_interval_unit_combo.setEnabled(enabled)
+        
+    def toggle_telegram_fields(self):
+        enabled = self.telegram_enable.isChecked()
+        self.telegram_token_edit.setEnabled(enabled)
+        self.telegram_chat_id_edit.setEnabled(enabled)
+        self.test_telegram_btn.setEnabled(enabled)
+        
+    def browse_script(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Select Python script", "", "Python Files (*.py)")
+        if file_path:
+            self.script_path_edit.setText(file_path)
+            
+    def test_telegram(self):
+        if self.telegram_enable.isChecked():
+            token = self.telegram_token_edit.text().strip()
+            chat_id = self.telegram_chat_id_edit.text().strip()
+            
+            if not token or not chat_id:
+                QMessageBox.warning(self, "Error", "Please fill all Telegram fields")
+                return
+                
+            try:
+                url = f"https://api.telegram.org/bot{token}/sendMessage"
+                payload = {
+                    'chat_id': chat_id,
+                    'text': '✅ Test message from MNGserver',
+                    'parse_mode': 'HTML'
+                }
+                response = requests.post(url, data=payload, timeout=10)
+                if response.status_code == 200:
+                    QMessageBox.information(self, "Success", translations['telegram_test_success'])
+                else:
+                    QMessageBox.warning(self, "Error", translations['telegram_test_error'])
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"{translations['telegram_test_error']}: {e}")
+                
+    def parse_probes(self):
+        text = self.probes_edit.toPlainText().strip()
+        probes = json.loads(text) if text else []
+        if not isinstance(probes, list) or not all(isinstance(spec, dict) for spec in probes):
+            raise ValueError("expected a list of objects")
+        for spec in probes:
+            build_probe(spec, time.monotonic)
+        return probes
+    
+    def save_settings(self):
+        try:
+            probes = self.parse_probes()
+        except ValueError as e:
+            QMessageBox.warning(self, "Error", f"{translations['invalid_probes']}: {e}")
+            return
+        
+        self.script_info['path'] = self.script_path_edit.text()
+        self.script_info['probes'] = probes
+        self.script_info['max_restarts'] = self.max_restarts_spin.value()
+        self.script_info['check_interval'] = self.check_interval_spin.value()
+        
+        # Restart policy
+        self.script_info['backoff_initial'] = self.backoff_initial_spin.value()
+        self.script_info['backoff_max'] = self.backoff_max_spin.value()
+        self.script_info['stable_uptime'] = self.stable_uptime_spin.value()
+        self.script_info['crash_loop_count'] = self.crash_loop_count_spin.value()
+        self.script_info['crash_loop_window'] = self.crash_loop_window_spin.value()
+        self.script_info['crash_loop_pause'] = self.crash_loop_pause_spin.value()
+        
+        # Resource limits
+        self.script_info['memory_limit_mb'] = self.memory_limit_spin.value()
+        self.script_info['cpu_limit_percent'] = self.cpu_limit_spin.value()
+        self.script_info['max_open_files'] = self.max_open_files_spin.value()
+        self.script_info['nice'] = self.nice_spin.value()
+        self.script_info['ionice_class'] = self.ionice_class_combo.currentText()
+        self.script_info['ionice_level'] = self.ionice_level_spin.value()
+        self.script_info['cgroup'] = self.cgroup_edit.text().strip()
+        
+        # Replica pool
+        self.script_info['replicas'] = self.replicas_spin.value()
+        self.script_info['autoscale'] = self.autoscale_check.isChecked()
+        self.script_info['replicas_min'] = self.replicas_min_spin.value()
+        self.script_info['replicas_max'] = max(self.replicas_min_spin.value(), self.replicas_max_spin.value())
+        self.script_info['scale_down_cpu'] = self.scale_down_cpu_spin.value()
+        self.script_info['scale_up_cpu'] = self.scale_up_cpu_spin.value()
+        self.script_info['scale_cooldown'] = self.scale_cooldown_spin.value()
+        self.script_info['pin_replicas'] = self.pin_replicas_check.isChecked()
+        
+        # Scheduled actions - УПРОЩЕННАЯ ВЕРСИЯ
+        self.script_info['scheduled_restart_enabled'] = self.scheduled_restart_enable.isChecked()
+        self.script_info['restart_interval_value'] = self.restart_interval_value_spin.value()
+        self.script_info['restart_interval_unit'] = self.restart_interval_unit_combo.currentText()
+        self.script_info['restart_mode'] = self.restart_mode_combo.currentText()
+        self.script_info['listen'] = self.listen_edit.text().strip()
+        
+        # Telegram settings
+        self.script_info['telegram_enabled'] = self.telegram_enable.isChecked()
+        self.script_info['telegram_token'] = self.telegram_token_edit.text().strip()
+        self.script_info['telegram_chat_id'] = self.telegram_chat_id_edit.text().strip()
+        
+        if self.parent and self.script_info['name'] in self.parent.monitors:
+            # Saved by the fleet; a running script restarts with the new settings
+            self.parent.fleet.configure(self.script_info['name'])
+        
+        QMessageBox.information(self, "Success", translations['settings_saved'])
+
+class ServerMonitorGUI(QMainWindow):
+    # Jobs from the control API that must run in the GUI thread
+    owner_call = pyqtSignal(object)
+
+    def __init__(self, config_path=DEFAULT_CONFIG_PATH, attach=False):
+        super().__init__()
+        # attach: supervision runs in a separate daemon process (see mngcore.remote)
+        self.attach = attach
+        self.remote = None
+        # Saves snapshot the scripts in this thread, which changes them
+        self.store = ConfigStore(config_path, owner=self.run_in_gui)
+        self.monitors = self.store.scripts
+        self.current_script = None
+        self.script_tabs = {}  # Хранит вкладки для каждого скрипта
+        self.charts_animated = True
+        self.list_items = {}
+        # Monitors report through the bus; apply_updates drains it each frame
+        self.bus = UpdateBus()
+        self.owner_call.connect(lambda job: job())
+        self.initUI()
+        self.load_scripts()
+        
+    def tr(self, key):
+        return translations.get(key, key)
+
+    def run_in_gui(self, fn):
+        """Runs fn in the GUI thread; returns a concurrent future of its result."""
+        future = Future()
+
+        def job():
+            try:
+                future.set_result(fn())
+            except Exception as e:
+                future.set_exception(e)
+        self.owner_call.emit(job)
+        return future
+
+    def initUI(self):
+        self.setWindowTitle(self.tr('title'))
+        self.setGeometry(100, 100, 1600, 900)
+        
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        
+        main_layout = QHBoxLayout(central_widget)
+        
+        # Left panel
+        left_panel = QWidget()
+        left_panel.setMaximumWidth(300)
+        left_layout = QVBoxLayout(left_panel)
+        
+        # Title with GitHub link
+        title_label = QLabel("MNGserver")
+        title_label.setFont(QFont("Arial", 16, QFont.Bold))
+        title_label.setAlignment(Qt.AlignCenter)
+        title_label.setStyleSheet("padding: 10px; color: white;")
+        
+        github_label = QLabel(f'<a href="https://github.com/Tool-xx/MNGserver" style="color: #3498db;">{self.tr("github")}</a>')
+        github_label.setAlignment(Qt.AlignCenter)
+        github_label.setOpenExternalLinks(True)
+        github_label.linkActivated.connect(webbrowser.open)
+        
+        # Add script button
+        self.add_btn = QPushButton(self.tr('add_script'))
+        self.add_btn.clicked.connect(self.add_script)
+        self.add_btn.setStyleSheet("""
+            QPushButton {
+                padding: 12px;
+                background: #3498db;
+                color: white;
+                border: none;
+                border-radius: 6px;
+                margin: 5px;
+            }
+            QPushButton:hover {
+                background: #2980b9;
+            }
+        """)
+        
+        # One report with every script's history
+        self.report_btn = QPushButton(self.tr('fleet_report'))
+        self.report_btn.clicked.connect(self.export_fleet_report)
+        self.report_btn.setStyleSheet("""
+            QPushButton {
+                padding: 8px;
+                background: #34495e;
+                color: white;
+                border: none;
+                border-radius: 6px;
+                margin: 5px;
+            }
+            QPushButton:hover {
+                background: #2c3e50;
+            }
+        """)
+        
+        # Scripts list
+        scripts_label = QLabel(self.tr('scripts_list'))
+        scripts_label.setStyleSheet("font-weight: bold; margin-top: 10px; color: white;")
+        
+        self.script_list = QListWidget()
+        self.script_list.currentItemChanged.connect(self.on_script_selected)
+        self.script_list.setStyleSheet("""
+            QListWidget {
+                border: 1px solid #555;
+                border-radius: 5px;
+                background: #353535;
+                color: white;
+            }
+            QListWidget::item {
+                padding: 8px;
+                border-bottom: 1px solid #444;
+            }
+            QListWidget::item:selected {
+                background: #2a82da;
+                color: white;
+            }
+        """)
+        
+        left_layout.addWidget(title_label)
+        left_layout.addWidget(github_label)
+        left_layout.addWidget(self.add_btn)
+        left_layout.addWidget(scripts_label)
+        left_layout.addWidget(self.script_list)
+        left_layout.addWidget(self.report_btn)
+        left_layout.addStretch()
+        
+        # Right panel
+        right_panel = QWidget()
+        right_layout = QVBoxLayout(right_panel)
+        
+        # Control buttons
+        self.control_buttons_widget = QWidget()
+        self.control_buttons_layout = QHBoxLayout(self.control_buttons_widget)
+        
+        self.start_btn = QPushButton(self.tr('start_monitoring'))
+        self.start_btn.clicked.connect(self.start_monitoring)
+        self.start_btn.setStyleSheet("""
+            QPushButton {
+                padding: 10px;
+                background: #27ae60;
+                color: white;
+                border: none;
+                border-radius: 5px;
+                margin: 2px;
+            }
+            QPushButton:hover {
+                background: #229954;
+            }
+        """)
+        
+        self.stop_btn = QPushButton(self.tr('stop_monitoring'))
+        self.stop_btn.clicked.connect(self.stop_monitoring)
+        self.stop_btn.setStyleSheet("""
+            QPushButton {
+                padding: 10px;
+                background: #e74c3c;
+                color: white;
+                border: none;
+                border-radius: 5px;
+                margin: 2px;
+            }
+            QPushButton:hover {
+                background: #c0392b;
+            }
+        """)
+        
+        self.remove_btn = QPushButton(self.tr('remove_script'))
+        self.remove_btn.clicked.connect(self.remove_script)
+        self.remove_btn.setStyleSheet("""
+            QPushButton {
+                padding: 10px;
+                background: #95a5a6;
+                color: white;
+                border: none;
+                border-radius: 5px;
+                margin: 2px;
+            }
+            QPushButton:hover {
+                background: #7f8c8d;
+            }
+        """)
+        
+        self.control_buttons_layout.addWidget(self.start_btn)
+        self.control_buttons_layout.addWidget(self.stop_btn)
+        self.control_buttons_layout.addWidget(self.remove_btn)
+        
+        # Main tabs for scripts
+        self.tab_widget = QTabWidget()
+        
+        right_layout.addWidget(self.control_buttons_widget)
+        right_layout.addWidget(self.tab_widget)
+        
+        main_layout.addWidget(left_panel, 1)
+        main_layout.addWidget(right_panel, 3)
+        
+        # Timers
+        self.stats_timer = QTimer()
+        self.stats_timer.timeout.connect(self.update_stats_display)
+        self.stats_timer.start(1000)
+        
+        self.frame_timer = QTimer()
+        self.frame_timer.timeout.connect(self.apply_updates)
+        self.frame_timer.start(FRAME_INTERVAL_MS)
+        
+        self.update_control_buttons()
+        self.apply_dark_theme()
+
+    def apply_dark_theme(self):
+        # Dark theme
+        palette = QPalette()
+        palette.setColor(QPalette.Window, QColor(53, 53, 53))
+        palette.setColor(QPalette.WindowText, Qt.white)
+        palette.setColor(QPalette.Base, QColor(35, 35, 35))
+        palette.setColor(QPalette.AlternateBase, QColor(53, 53, 53))
+        palette.setColor(QPalette.ToolTipBase, Qt.white)
+        palette.setColor(QPalette.ToolTipText, Qt.white)
+        palette.setColor(QPalette.Text, Qt.white)
+        palette.setColor(QPalette.Button, QColor(53, 53, 53))
+        palette.setColor(QPalette.ButtonText, Qt.white)
+        palette.setColor(QPalette.BrightText, Qt.red)
+        palette.setColor(QPalette.Link, QColor(42, 130, 218))
+        palette.setColor(QPalette.Highlight, QColor(42, 130, 218))
+        palette.setColor(QPalette.HighlightedText, Qt.black)
+        
+        self.setStyleSheet("""
+            QMainWindow, QWidget {
+                background: #353535;
+                color: white;
+            }
+            QGroupBox {
+                color: white;
+                font-weight: bold;
+                border: 2px solid #555;
+                border-radius: 5px;
+                margin-top: 10px;
+                background: #454545;
+            }
+            QGroupBox::title {
+                subcontrol-origin: margin;
+                left: 10px;
+                padding: 0 5px 0 5px;
+                color: white;
+            }
+            QTabWidget::pane {
+                border: 1px solid #555;
+                background: #353535;
+            }
+            QTabBar::tab {
+                background: #454545;
+                color: white;
+                padding: 8px 16px;
+                border: 1px solid #555;
+                border-radius: 4px;
+                margin: 2px;
+            }
+            QTabBar::tab:selected {
+                background: #2a82da;
+            }
+            QLabel {
+                color: white;
+            }
+            QLineEdit {
+                background: #454545;
+                color: white;
+                border: 1px solid #555;
+                border-radius: 3px;
+                padding: 5px;
+            }
+            QSpinBox {
+                background: #454545;
+                color: white;
+                border: 1px solid #555;
+                border-radius: 3px;
+                padding: 5px;
+            }
+            QDoubleSpinBox {
+                background: #454545;
+                color: white;
+                border: 1px solid #555;
+                border-radius: 3px;
+                padding: 5px;
+            }
+            QTimeEdit {
+                background: #454545;
+                color: white;
+                border: 1px solid #555;
+                border-radius: 3px;
+                padding: 5px;
+            }
+            QComboBox {
+                background: #454545;
+                color: white;
+                border: 1px solid #555;
+                border-radius: 3px;
+                padding: 5px;
+            }
+            QCheckBox {
+                color: white;
+            }
+            QCheckBox::indicator {
+                width: 16px;
+                height: 16px;
+            }
+            QCheckBox::indicator:unchecked {
+                background: #454545;
+                border: 1px solid #555;
+            }
+            QCheckBox::indicator:checked {
+                background: #2a82da;
+                border: 1px solid #2a82da;
+            }
+        """)
+        
+        QApplication.setPalette(palette)
+
+    def apply_updates(self):
+        if self.remote is not None:
+            # The supervisor process publishes stats and statuses in shared memory;
+            # every sample is applied so the charts have no gaps
+            samples, statuses = self.remote.poll()
+            for script_name, status in statuses.items():
+                self.bus.status(script_name, status)
+            for script_name, rows in samples.items():
+                for stats in rows:
+                    self.update_stats(script_name, stats)
+        diff = self.bus.drain()
+        if not diff:
+            return
+        
+        for script_name, entries in diff.logs.items():
+            if script_name in self.script_tabs:
+                self.script_tabs[script_name]['log_tab'].add_entries(entries, diff.dropped.get(script_name, 0))
+        
+        for script_name, status in diff.statuses.items():
+            self.update_status(script_name, status)
+        
+        for script_name, stats in diff.stats.items():
+            self.update_stats(script_name, stats)
+        
+        if diff.statuses:
+            self.update_control_buttons()
+            self.update_chart_animations()
+
+    def update_chart_animations(self):
+        running = sum(1 for script_info in self.monitors.values() if script_info['status'] == 'running')
+        animated = running <= ANIMATED_CHARTS_LIMIT
+        if animated != self.charts_animated:
+            self.charts_animated = animated
+            for script_tabs in self.script_tabs.values():
+                script_tabs['stats_tab'].set_animated(animated)
+
+    def add_list_item(self, script_name):
+        item = QListWidgetItem(f"🔴 {script_name}")
+        item.setData(Qt.UserRole, script_name)
+        self.list_items[script_name] = item
+        self.script_list.addItem(item)
+    
+    def update_list_item(self, script_name):
+        item = self.list_items.get(script_name)
+        if item is not None:
+            status = self.monitors[script_name]['status']
+            icon = "🟢" if status == 'running' else "🟡" if status == 'waiting' else "🔴"
+            text = f"{icon} {script_name}"
+            if item.text() != text:
+                item.setText(text)
+        
+    def update_control_buttons(self):
+        has_selection = self.current_script is not None
+        
+        self.start_btn.setVisible(has_selection)
+        self.stop_btn.setVisible(has_selection)
+        self.remove_btn.setVisible(has_selection)
+        
+        if has_selection and self.current_script in self.monitors:
+            script_info = self.monitors[self.current_script]
+            # A monitor waiting out its restart backoff can still be stopped
+            is_running = script_info['status'] in ('running', 'waiting')
+            
+            self.start_btn.setVisible(not is_running)
+            self.stop_btn.setVisible(is_running)
+        
+    def on_script_selected(self, current, previous):
+        if current:
+            clean_name = current.data(Qt.UserRole)
+            self.current_script = clean_name
+            
+            # Показываем вкладки для выбранного скрипта
+            self.show_script_tabs(clean_name)
+            self.update_control_buttons()
+            
+    def show_script_tabs(self, script_name):
+        """Показывает вкладки для выбранного скрипта"""
+        # Удаляем все текущие вкладки
+        while self.tab_widget.count() > 0:
+            self.tab_widget.removeTab(0)
+        
+        # Добавляем вкладки выбранного скрипта
+        if script_name in self.monitors:
+            self.create_tabs_for_script(script_name)
+        if script_name in self.script_tabs:
+            script_tabs = self.script_tabs[script_name]
+            self.tab_widget.addTab(script_tabs['widget'], f"{script_name}")
+            
+    def load_scripts(self):
+        try:
+            self.store.load()
+        except (OSError, ValueError, KeyError) as e:
+            QMessageBox.warning(self, "Warning", f"{self.tr('config_load_error')}: {e}")
+        
+        if self.attach or self.store.settings.get('supervisor_process'):
+            self.remote = self.attach_supervisor()
+        
+        # Metrics history is kept by the supervisor core, shared with the daemon;
+        # attached, its files belong to the supervisor process and are only read
+        settings = self.store.settings
+        self.metrics = MetricsStore(settings.get('metrics_dir'), settings.get('metrics_retention'),
+                                    readonly=self.remote is not None)
+        # Fed by the monitors here, or only searched when attached
+        self.log_index = log_index_from_settings(settings)
+        if self.remote is not None:
+            self.fleet = self.remote
+            self.supervisor = self.exporter = self.control = None
+        else:
+            self.start_supervisor(settings)
+        self.fleet.monitor_created.connect(lambda monitor: self.bus.attach(monitor.signals))
+        self.fleet.script_added.connect(self.on_script_added)
+        self.fleet.script_removed.connect(self.on_script_removed)
+        
+        # List items only; tabs are created when a script is first selected
+        for script_info in self.monitors.values():
+            script_info.update({
+                'monitor': None,
+                'status': 'stopped',
+                'stats': {'cpu': 0.0, 'memory': 0.0, 'restarts': script_info.get('restarts', 0), 'uptime': '00:00:00'}
+            })
+        self.script_list.setUpdatesEnabled(False)
+        for script_name in self.monitors:
+            self.add_list_item(script_name)
+        self.script_list.setUpdatesEnabled(True)
+        
+        if self.remote is not None:
+            # Already running in the supervisor process; statuses arrive with the stats
+            return
+        for script_name, script_info in self.monitors.items():
+            if script_info.get('enabled'):
+                self.start_monitoring_for_script(script_name)
+    
+    def attach_supervisor(self):
+        control_socket = self.store.settings.get('control_socket') or DEFAULT_CONTROL_SOCKET
+        try:
+            remote = attach(self.store.path, control_socket, self.store, self.bus, self.run_in_gui)
+        except (OSError, ValueError, RemoteError) as e:
+            QMessageBox.warning(self, "Warning", f"Cannot attach to a supervisor process, supervising in this window: {e}")
+            return None
+        self.statusBar().showMessage(f"Attached to supervisor process {remote.pid}")
+        return remote
+    
+    def start_supervisor(self, settings):
+        self.supervisor = default_supervisor(metrics=self.metrics, log_index=self.log_index)
+        self.exporter = None
+        if settings.get('metrics_listen'):
+            self.exporter = MetricsExporter(self.supervisor)
+            try:
+                self.supervisor.submit(self.exporter.start(settings['metrics_listen'])).result()
+            except (OSError, ValueError) as e:
+                self.exporter = None
+                QMessageBox.warning(self, "Warning", f"Cannot serve metrics on {settings['metrics_listen']}: {e}")
+        
+        # Scripts are added, started and removed through the fleet, which the
+        # control API shares; its signals keep the list and tabs in sync
+        self.fleet = Fleet(self.store, self.supervisor, owner=self.run_in_gui)
+        self.control = None
+        control_socket = settings.get('control_socket', DEFAULT_CONTROL_SOCKET)
+        if control_socket:
+            self.control = ControlServer(self.fleet)
+            try:
+                self.supervisor.submit(self.control.start(control_socket)).result()
+            except OSError as e:
+                # Usually a daemon already owns the socket; the GUI works without it
+                self.control = None
+                self.statusBar().showMessage(f"Control socket unavailable: {e}")
+    
+    def export_fleet_report(self):
+        if not self.monitors:
+            QMessageBox.warning(self, "Warning", self.tr('no_script_selected'))
+            return
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Fleet Report", "", "HTML Files (*.html)")
+        if not file_path:
+            return
+        try:
+            write_report(file_path, [script_summary(script_info) for script_info in self.monitors.values()],
+                         self.metrics, title='MNGserver Fleet Report')
+            self.log("SYSTEM", f"Fleet report for {len(self.monitors)} script(s) exported to: {file_path}")
+            QMessageBox.information(self, "Success", self.tr('stats_exported'))
+        except OSError as e:
+            self.log("SYSTEM", f"Error exporting fleet report: {e}")
+    
+    def add_script(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Select Python script", "", "Python Files (*.py)"
+        )
+        
+        if file_path:
+            script_name = os.path.basename(file_path)
+            try:
+                self.fleet.add(file_path, script_name)
+            except ValueError:
+                QMessageBox.warning(self, "Warning", self.tr('script_already_exists'))
+                return
+            
+            # Создаем вкладки для нового скрипта
+            self.create_tabs_for_script(script_name)
+            self.log(script_name, f"{self.tr('script_added')} {script_name}")
+    
+    def on_script_added(self, script_name):
+        script_info = self.monitors[script_name]
+        script_info.update({
+            'monitor': None,
+            'status': 'stopped',
+            'stats': {'cpu': 0.0, 'memory': 0.0, 'restarts': script_info.get('restarts', 0), 'uptime': '00:00:00'}
+        })
+        self.add_list_item(script_name)
+    
+    def on_script_removed(self, script_name):
+        # Удаляем вкладки скрипта
+        if script_name in self.script_tabs:
+            self.script_tabs[script_name]['widget'].setParent(None)
+            del self.script_tabs[script_name]
+        
+        item = self.list_items.pop(script_name, None)
+        if item is not None:
+            self.script_list.takeItem(self.script_list.row(item))
+        
+        if script_name == self.current_script:
+            self.current_script = None
+            # Очищаем вкладки
+            while self.tab_widget.count() > 0:
+                self.tab_widget.removeTab(0)
+            self.update_control_buttons()
+    
+    def create_tabs_for_script(self, script_name):
+        """Создает вкладки для конкретного скрипта"""
+        if script_name not in self.script_tabs:
+            # Создаем виджет с вкладками для этого скрипта
+            script_tab_widget = QTabWidget()
+            
+            # Вкладка логов
+            log_tab = ScriptLogTab(script_name, self, script_log_path(self.monitors[script_name]), self.log_index)
+            
+            # Вкладка статистики
+            stats_tab = ScriptStatsTab(script_name, self, self.charts_animated)
+            
+            # Вкладка настроек
+            settings_tab = SettingsTab(self.monitors[script_name], self)
+            
+            script_tab_widget.addTab(log_tab, translations['logs'])
+            script_tab_widget.addTab(stats_tab, translations['stats'])
+            # The settings form is taller than small windows
+            settings_scroll = QScrollArea()
+            settings_scroll.setWidgetResizable(True)
+            settings_scroll.setFrameShape(QFrame.NoFrame)
+            settings_scroll.setWidget(settings_tab)
+            script_tab_widget.addTab(settings_scroll, translations['settings'])
+            
+            self.script_tabs[script_name] = {
+                'widget': script_tab_widget,
+                'log_tab': log_tab,
+                'stats_tab': stats_tab,
+                'settings_tab': settings_tab
+            }
+    
+    def remove_script(self):
+        if not self.current_script:
+            QMessageBox.warning(self, "Warning", self.tr('no_script_selected'))
+            return
+            
+        reply = QMessageBox.question(
+            self, "Confirmation", 
+            self.tr('confirm_remove'),
+            QMessageBox.Yes | QMessageBox.No
+        )
+        
+        if reply == QMessageBox.Yes:
+            script_name = self.current_script
+            if script_name in self.monitors:
+                monitor = self.monitors[script_name]['monitor']
+                if monitor and monitor.is_alive():
+                    monitor.stop()
+                # Tabs and the list item go in on_script_removed
+                self.fleet.remove(script_name)
+            else:
+                self.on_script_removed(script_name)
+    
+    def start_monitoring(self):
+        if not self.current_script:
+            QMessageBox.warning(self, "Warning", self.tr('no_script_selected'))
+            return
+            
+        self.start_monitoring_for_script(self.current_script)
+    
+    def start_monitoring_for_script(self, script_name, after=None):
+        if script_name in self.monitors:
+            script_info = self.monitors[script_name]
+            
+            if script_info['monitor'] is None or not script_info['monitor'].is_alive():
+                self.fleet.start(script_name, after)
+                script_info['status'] = 'starting'
+                self.log(script_name, f"{self.tr('monitoring_started')} {script_name}")
+    
+    def stop_monitoring(self):
+        if not self.current_script:
+            QMessageBox.warning(self, "Warning", self.tr('no_script_selected'))
+            return
+            
+        script_info = self.monitors[self.current_script]
+        
+        if script_info['monitor'] and script_info['monitor'].is_alive():
+            script_info['monitor'].stop()
+            script_info['status'] = 'stopped'
+            self.fleet.stopped(self.current_script)
+            self.log(self.current_script, f"{self.tr('monitoring_stopped')} {self.current_script}")
+    
+    def update_status(self, script_name, status):
+        if script_name in self.monitors:
+            self.monitors[script_name]['status'] = status
+            self.update_list_item(script_name)
+            
+            # Обновляем статус во вкладке статистики
+            if script_name in self.script_tabs:
+                start_time = None
+                if status == 'running' and self.monitors[script_name]['monitor']:
+                    start_time = self.monitors[script_name]['monitor'].start_time
+                self.script_tabs[script_name]['stats_tab'].update_status(status, start_time)
+    
+    def update_stats(self, script_name, stats):
+        if script_name in self.monitors:
+            self.monitors[script_name]['stats'] = stats
+            self.monitors[script_name]['restarts'] = stats['restarts']
+            
+            # Обновляем статистику во вкладке
+            if script_name in self.script_tabs:
+                self.script_tabs[script_name]['stats_tab'].update_stats(stats)
+    
+    def update_stats_display(self):
+        # Можно добавить обновление системной статистики если нужно
+        pass
+    
+    def log(self, script_name, message):
+        # Добавляем лог в соответствующую вкладку скрипта
+        if script_name in self.script_tabs:
+            self.script_tabs[script_name]['log_tab'].add_log(message)
+    
+    def closeEvent(self, event):
+        if self.remote is not None:
+            # Only detach: the supervisor process keeps the scripts running
+            self.remote.close()
+            self.metrics.close()
+            if self.log_index is not None:
+                self.log_index.close()
+            event.accept()
+            return
+        if self.control is not None:
+            self.supervisor.submit(self.control.close()).result()
+        # Stop all monitors at once; the whole fleet shares one 3 s deadline
+        monitors = [script_info['monitor'] for script_info in self.monitors.values()
+                    if script_info['monitor'] and script_info['monitor'].is_alive()]
+        if monitors:
+            self.supervisor.submit(shutdown_monitors(monitors, timeout=3)).result()
+        self.store.flush()
+        self.metrics.close()
+        if self.log_index is not None:
+            self.log_index.close()
+        close_default_dispatcher(timeout=3)
+        event.accept()
+
+def main(config_path=DEFAULT_CONFIG_PATH, attach=False):
+    app = QApplication(sys.argv)
+    app.setStyle('Fusion')
+    
+    window = ServerMonitorGUI(config_path, attach)
+    window.show()
+    
+    sys.exit(app.exec_())
+
+if __name__ == '__main__':
+    main()
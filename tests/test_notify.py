@@ -0,0 +1,170 @@
+"""TelegramDispatcher against a local stub of the Bot API."""
+
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mngcore.notify import TelegramDispatcher
+
+
+class StubTelegram(ThreadingHTTPServer):
+    """Records sendMessage calls and answers with queued (status, body) replies, then 200."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.requests = []
+        self.replies = []
+        # Cleared to hold requests until the test sets it
+        self.gate = threading.Event()
+        self.gate.set()
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def stop(self):
+        self.gate.set()
+        self.shutdown()
+        self.server_close()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        form = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode()).items()}
+        self.server.requests.append((time.monotonic(), self.path, form))
+        self.server.gate.wait(10)
+        status, body = self.server.replies.pop(0) if self.server.replies else (200, {'ok': True})
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TelegramDispatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.server = StubTelegram()
+        self.dispatchers = []
+
+    def tearDown(self):
+        for dispatcher in self.dispatchers:
+            dispatcher.close(timeout=2)
+        self.server.stop()
+
+    def dispatcher(self, **kwargs):
+        options = {'coalesce_window': 0.2, 'min_interval': 0, 'backoff_base': 0.05, 'timeout': 5}
+        options.update(kwargs)
+        dispatcher = TelegramDispatcher(api_url=self.server.url, **options)
+        dispatcher.start()
+        self.dispatchers.append(dispatcher)
+        return dispatcher
+
+    def test_burst_is_coalesced_into_one_digest(self):
+        dispatcher = self.dispatcher()
+        for i in range(50):
+            self.assertTrue(dispatcher.notify('TOKEN', '42', f"crash {i}"))
+        dispatcher.close(timeout=5)
+
+        self.assertEqual(len(self.server.requests), 1)
+        _, path, form = self.server.requests[0]
+        self.assertEqual(path, '/botTOKEN/sendMessage')
+        self.assertEqual(form['chat_id'], '42')
+        self.assertIn('50 events', form['text'])
+        self.assertIn('crash 0', form['text'])
+        self.assertIn('crash 49', form['text'])
+        self.assertEqual(dispatcher.sent, 1)
+
+    def test_steady_stream_is_cut_at_coalesce_max(self):
+        dispatcher = self.dispatcher(coalesce_window=0.3, coalesce_max=0.6)
+        # Never quiet for the window, so only the cap ends a digest
+        for i in range(15):
+            dispatcher.notify('TOKEN', '42', f"event {i}")
+            time.sleep(0.1)
+        dispatcher.close(timeout=5)
+
+        self.assertGreaterEqual(len(self.server.requests), 2)
+        self.assertLess(len(self.server.requests), 6)
+        self.assertEqual(sum(form['text'].count('event ') for _, _, form in self.server.requests), 15)
+
+    def test_chats_get_separate_digests(self):
+        dispatcher = self.dispatcher()
+        dispatcher.notify('TOKEN', '1', 'a')
+        dispatcher.notify('TOKEN', '2', 'b')
+        dispatcher.notify('TOKEN', '1', 'c')
+        dispatcher.close(timeout=5)
+
+        texts = {form['chat_id']: form['text'] for _, _, form in self.server.requests}
+        self.assertEqual(set(texts), {'1', '2'})
+        self.assertIn('2 events', texts['1'])
+
+    def test_rate_limit_waits_retry_after(self):
+        self.server.replies = [(429, {'ok': False, 'parameters': {'retry_after': 0.5}})]
+        # A backoff this long would fail the timing check if retry_after were ignored
+        dispatcher = self.dispatcher(coalesce_window=0, backoff_base=30)
+        dispatcher.notify('TOKEN', '42', 'hello')
+        dispatcher.close(timeout=10)
+
+        self.assertEqual(len(self.server.requests), 2)
+        waited = self.server.requests[1][0] - self.server.requests[0][0]
+        self.assertGreaterEqual(waited, 0.45)
+        self.assertLess(waited, 5)
+        self.assertEqual((dispatcher.sent, dispatcher.failed), (1, 0))
+
+    def test_server_errors_are_retried(self):
+        self.server.replies = [(500, {'ok': False}), (502, {'ok': False})]
+        dispatcher = self.dispatcher(coalesce_window=0)
+        dispatcher.notify('TOKEN', '42', 'hello')
+        dispatcher.close(timeout=10)
+
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual((dispatcher.sent, dispatcher.failed), (1, 0))
+
+    def test_client_errors_are_not_retried(self):
+        self.server.replies = [(400, {'ok': False, 'description': 'chat not found'})]
+        dispatcher = self.dispatcher(coalesce_window=0)
+        dispatcher.notify('TOKEN', '42', 'hello')
+        dispatcher.close(timeout=5)
+
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual((dispatcher.sent, dispatcher.failed), (0, 1))
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        self.server.gate.clear()
+        dispatcher = self.dispatcher(coalesce_window=0, max_queue=5)
+        dispatcher.notify('TOKEN', '42', 'first')
+        # The dispatcher is now stuck in the held request
+        deadline = time.monotonic() + 5
+        while not self.server.requests and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(self.server.requests), 1)
+
+        started = time.monotonic()
+        accepted = [dispatcher.notify('TOKEN', '42', f"event {i}") for i in range(20)]
+        elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(accepted.count(True), 5)
+        self.assertEqual(dispatcher.dropped, 15)
+        self.server.gate.set()
+        dispatcher.close(timeout=5)
+        self.assertEqual(dispatcher.sent, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()